@@ -21,6 +21,10 @@ class PokerAnalytics:
         if not results or 'player_stats' not in results or 'strategies' not in results:
             return pd.DataFrame({'Error': ['Invalid input data']})
 
+        # Array-backed statistics: build the columns straight from the block
+        if results.get('stats_block') is not None:
+            return PokerAnalytics._dataframe_from_block(results)
+
         data = []
         for i, stats in enumerate(results["player_stats"]):
             if not stats:  # Skip empty player stats
@@ -42,11 +46,42 @@ class PokerAnalytics:
                 'Avg Profit': total_profit / max(1, hands_played),
                 'Bluff Success': bluffs_successful / max(1, bluffs_attempted),
                 'Wins': hands_won,  # Added for GUI compatibility
-                'Std Dev': 0  # Placeholder for GUI compatibility
+                'Std Dev': stats.get('profit_std', 0)  # Per-hand profit standard deviation
             })
         
         return pd.DataFrame(data) if data else pd.DataFrame({'Error': ['No valid player data']})
 
+    @staticmethod
+    def _dataframe_from_block(results: Dict) -> pd.DataFrame:
+        """
+        Build the player DataFrame from a PlayerStatsBlock without per-player dicts
+
+        Args:
+            - results (Dict): Simulation results holding a 'stats_block'.
+
+        Returns:
+            - pd.DataFrame: same columns as create_dataframe.
+        """
+        block = results['stats_block']
+        columns = block.columns()
+        hands_played = columns['hands_played']
+        hands_won = columns['hands_won']
+        total_profit = columns['total_profit']
+        strategies = list(results['strategies'])
+        strategies += ['Unknown'] * (len(block) - len(strategies))
+
+        return pd.DataFrame({
+            'Strategy': strategies[:len(block)],
+            'Hands Played': hands_played,
+            'Hands Won': hands_won,
+            'Win Rate': hands_won / np.maximum(1, hands_played),
+            'Total Profit': total_profit,
+            'Avg Profit': total_profit / np.maximum(1, hands_played),
+            'Bluff Success': columns['bluffs_successful'] / np.maximum(1, columns['bluffs_attempted']),
+            'Wins': hands_won,  # Added for GUI compatibility
+            'Std Dev': [stats.get('profit_std', 0) for stats in results['player_stats']]
+        }, copy=False)
+
     @staticmethod
     def generate_summary_statistics(df: pd.DataFrame) -> pd.DataFrame:
         """
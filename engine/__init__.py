@@ -0,0 +1,49 @@
+from .hand_evaluator import (
+    evaluate,
+    evaluate_cards,
+    evaluate_batch,
+    evaluate_boards,
+    hand_category,
+    hand_categories,
+    load_tables,
+    HandState,
+    CATEGORY_NAMES,
+    NUM_STRENGTHS,
+)
+from .executor import ExecutionBackend, BACKENDS
+from .monte_carlo import EquityTally, simulate_equity, run_equity, enumerate_equity
+from .cache import ResultCache, canonical_key, canonical_seed, EQUITY_CACHE, STRENGTH_CACHE, FEATURES_CACHE, BOARD_CACHE
+from .preflop import hand_class, preflop_equity, preflop_rank, build_preflop_table, load_preflop_table
+from .statistics import RunningStats
+
+__all__ = [
+    'evaluate',
+    'evaluate_cards',
+    'evaluate_batch',
+    'evaluate_boards',
+    'hand_category',
+    'hand_categories',
+    'load_tables',
+    'HandState',
+    'CATEGORY_NAMES',
+    'NUM_STRENGTHS',
+    'ExecutionBackend',
+    'BACKENDS',
+    'EquityTally',
+    'simulate_equity',
+    'run_equity',
+    'enumerate_equity',
+    'ResultCache',
+    'canonical_key',
+    'canonical_seed',
+    'EQUITY_CACHE',
+    'STRENGTH_CACHE',
+    'FEATURES_CACHE',
+    'BOARD_CACHE',
+    'hand_class',
+    'preflop_equity',
+    'preflop_rank',
+    'build_preflop_table',
+    'load_preflop_table',
+    'RunningStats',
+]
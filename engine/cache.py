@@ -0,0 +1,278 @@
+"""
+Suit-isomorphism canonicalization and bounded result caches.
+
+Relabelling the four suits consistently across every player's hand and the
+board changes neither equities nor hand strengths, so such deals can share
+a cache entry. canonical_key sorts the suits by the ranks they hold in each
+card group and renames them in that order, which maps every member of an
+isomorphism class to the same key in a single pass.
+
+canonical_seed turns such a key into a seed that is stable across
+processes, so sampled results stored under it are reproducible.
+
+ResultCache is a bounded LRU or LFU mapping with hit, miss and eviction
+counters that can be saved to disk and reloaded in a later session.
+"""
+import atexit
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+CACHE_POLICIES = ("lru", "lfu")
+
+_MISSING = object()
+
+
+def canonical_key(hole_ids: Sequence[Sequence[int]], board_ids: Sequence[int]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Map a deal to a key shared by every suit permutation of it
+
+    Players keep their order and the board is treated as a set.
+
+    Args:
+        - hole_ids [Sequence{Sequence{int}}]: hole card ids of each player
+        - board_ids [Sequence{int}]: community card ids
+
+    Returns:
+        - Tuple: sorted card ids of each player, then of the board, after
+          renaming the suits canonically
+    """
+    groups = [*hole_ids, board_ids]
+    signatures = [tuple(tuple(sorted(card >> 2 for card in group if card & 3 == suit)) for group in groups)
+                  for suit in range(4)]
+    relabel = [0] * 4
+    for new_suit, suit in enumerate(sorted(range(4), key=signatures.__getitem__)):
+        relabel[suit] = new_suit
+    return tuple(tuple(sorted((card & ~3) | relabel[card & 3] for card in group)) for group in groups)
+
+
+def canonical_seed(canonical: Tuple[Tuple[int, ...], ...]) -> int:
+    """
+    Derive a random seed from a canonical deal
+
+    Unlike hash(), which is salted per interpreter for strings, the seed is
+    the same in every process and session.
+
+    Args:
+        - canonical [Tuple]: key returned by canonical_key
+
+    Returns:
+        - int: 63-bit seed
+    """
+    # Card ids are below 52, so 52 separates the groups unambiguously
+    digest = hashlib.blake2b(bytes(card for group in canonical for card in (*group, 52)), digest_size=8).digest()
+    return int.from_bytes(digest, "little") >> 1
+
+
+class ResultCache:
+    """
+    Bounded thread-safe cache with LRU or LFU eviction
+
+    Args:
+        - maxsize [int]: maximum number of entries
+        - policy [str]: 'lru' evicts the least recently used entry,
+          'lfu' the least frequently used one (oldest first on ties)
+        - path [str]: file the entries are loaded from and saved to (no persistence if None)
+    """
+
+    def __init__(self, maxsize: int = 1024, policy: str = "lru", path: Optional[str] = None):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy} (expected one of {', '.join(CACHE_POLICIES)})")
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._values: Dict[Hashable, Any] = OrderedDict()
+        # LFU bookkeeping: use count of each key and keys of each count, oldest first
+        self._counts: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, OrderedDict] = defaultdict(OrderedDict)
+        self._min_count = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look a key up, counting a hit or a miss
+
+        Args:
+            - key [Hashable]: cache key
+            - default [Any]: returned on a miss
+
+        Returns:
+            - Any: cached value or default
+        """
+        with self._lock:
+            value = self._values.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._touch(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting an entry if the cache is full
+
+        Args:
+            - key [Hashable]: cache key
+            - value [Any]: value to store
+        """
+        with self._lock:
+            if key in self._values:
+                self._values[key] = value
+                self._touch(key)
+                return
+            if len(self._values) >= self.maxsize:
+                self._evict()
+            self._values[key] = value
+            if self.policy == "lfu":
+                self._counts[key] = 1
+                self._buckets[1][key] = None
+                self._min_count = 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value of a key, computing and storing it on a miss
+
+        Args:
+            - key [Hashable]: cache key
+            - compute [Callable]: builds the value (called without the lock held)
+
+        Returns:
+            - Any: cached or freshly computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._values.clear()
+            self._counts.clear()
+            self._buckets.clear()
+            self._min_count = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        """Counters and occupancy of the cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._values),
+            "maxsize": self.maxsize
+        }
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write the entries to disk, least valuable first
+
+        Args:
+            - path [str]: destination (the cache's own path if None)
+        """
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError("No path to save the cache to")
+        with self._lock:
+            if self.policy == "lfu":
+                entries = [(key, self._values[key], count)
+                           for count in sorted(self._buckets) for key in self._buckets[count]]
+            else:
+                entries = [(key, value, 1) for key, value in self._values.items()]
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated cache
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"policy": self.policy, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """
+        Add the entries saved in a file
+
+        Unreadable files are ignored, so a stale cache never stops a session.
+
+        Args:
+            - path [str]: file written by save
+        """
+        try:
+            with open(path, "rb") as f:
+                entries = pickle.load(f)["entries"]
+        except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError, AttributeError, ImportError):
+            return
+        for key, value, count in entries:
+            self.put(key, value)
+            if self.policy == "lfu" and count > 1:
+                with self._lock:
+                    self._move(key, count)
+
+    def _touch(self, key: Hashable) -> None:
+        if self.policy == "lru":
+            self._values.move_to_end(key)
+        else:
+            self._move(key, self._counts[key] + 1)
+
+    def _move(self, key: Hashable, count: int) -> None:
+        old_count = self._counts[key]
+        self._counts[key] = count
+        self._buckets[count][key] = None
+        bucket = self._buckets[old_count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[old_count]
+            if self._min_count == old_count:
+                self._min_count = count if count == old_count + 1 else min(self._buckets)
+
+    def _evict(self) -> None:
+        if self.policy == "lru":
+            self._values.popitem(last=False)
+        else:
+            bucket = self._buckets[self._min_count]
+            key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._buckets[self._min_count]
+            del self._counts[key]
+            del self._values[key]
+        self.evictions += 1
+
+
+# Monte Carlo tallies of PokerGame.monte_carlo_probability, saved at exit when
+# $POKER_EQUITY_CACHE names a file
+EQUITY_CACHE = ResultCache(maxsize=1024, policy="lru", path=os.environ.get("POKER_EQUITY_CACHE"))
+
+# Heuristic hand strengths of the strategies
+STRENGTH_CACHE = ResultCache(maxsize=65536, policy="lfu")
+
+# Single-pass hand features (strategies.hand_features) of the strategies
+FEATURES_CACHE = ResultCache(maxsize=65536, policy="lfu")
+
+# Board analyses (strategies.hand_features.BoardContext) shared by the hands on a board
+BOARD_CACHE = ResultCache(maxsize=4096, policy="lru")
+
+
+def _save_equity_cache() -> None:
+    if EQUITY_CACHE.path is not None:
+        try:
+            EQUITY_CACHE.save()
+        except OSError:
+            pass
+
+
+atexit.register(_save_equity_cache)
@@ -0,0 +1,251 @@
+"""
+Pluggable execution backends for simulation work.
+
+Work is split into shards described only by integers (typically a master
+seed, a shard index and a number of simulations). A shard function takes a
+read-only context plus one shard and returns a small partial aggregate that
+the caller merges. The context is sent to each process worker once, through
+the pool initializer, so individual tasks never carry game objects.
+"""
+import math
+import random
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+BACKENDS = ("serial", "thread", "process")
+
+# Wall time a shard should take when its size is tuned automatically
+TARGET_SHARD_SECONDS = 0.25
+
+# Minimum number of shards per worker, so a slow worker cannot hold up the run
+SHARDS_PER_WORKER = 4
+
+Shard = Tuple[int, ...]
+
+# Stream namespaces below a seed key, so that each consumer of randomness
+# (deck, strategies, tie-breaks) draws from its own independent generator
+DECK_STREAM = 0
+STRATEGY_STREAM = 1
+TIE_BREAK_STREAM = 2
+
+_WORKER_CONTEXT: Any = None
+
+
+def _init_worker(context: Any) -> None:
+    """Store the shared context in a process worker"""
+    global _WORKER_CONTEXT
+    _WORKER_CONTEXT = context
+
+
+def _run_in_worker(fn: Callable[[Any, Shard], Any], shard: Shard) -> Any:
+    """Run a shard function against the context stored by _init_worker"""
+    return fn(_WORKER_CONTEXT, shard)
+
+
+class ExecutionBackend:
+    """
+    Runs shard functions serially, on a thread pool or on a process pool
+
+    Args:
+        - kind [str]: 'serial', 'thread' or 'process'
+        - max_workers [int]: number of threads or processes
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 1):
+        if kind not in BACKENDS:
+            raise ValueError(f"Unknown backend: {kind} (expected one of {', '.join(BACKENDS)})")
+        self.kind = kind
+        self.max_workers = max(1, int(max_workers))
+
+    def map(self, fn: Callable[[Any, Shard], Any], context: Any, shards: Iterable[Shard]) -> Iterator[Any]:
+        """
+        Run ``fn(context, shard)`` for every shard
+
+        Args:
+            - fn [Callable]: module-level shard function (must be picklable for processes)
+            - context [Any]: read-only data shared by every shard
+            - shards [Iterable{Shard}]: integer tuples describing the work
+
+        Returns:
+            - Iterator: shard results, in shard order
+        """
+        shards = list(shards)
+        if len(shards) <= 1:
+            return (fn(context, shard) for shard in shards)
+        return self._map_once(fn, context, shards)
+
+    def _map_once(self, fn: Callable[[Any, Shard], Any], context: Any, shards: List[Shard]) -> Iterator[Any]:
+        with self.pool(fn, context) as run:
+            yield from run(shards)
+
+    @contextmanager
+    def pool(self, fn: Callable[[Any, Shard], Any], context: Any) -> Iterator[Callable[[List[Shard]], Iterator[Any]]]:
+        """
+        Keep one pool alive for several batches of the same shard function
+
+        Args:
+            - fn [Callable]: module-level shard function (must be picklable for processes)
+            - context [Any]: read-only data shared by every shard
+
+        Returns:
+            - Iterator: context manager yielding ``run(shards) -> results``
+        """
+        if self.kind == "serial" or self.max_workers == 1:
+            yield lambda shards: (fn(context, shard) for shard in shards)
+        elif self.kind == "thread":
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                yield lambda shards: executor.map(partial(fn, context), shards)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(context,)) as executor:
+                yield lambda shards: executor.map(partial(_run_in_worker, fn), shards)
+
+
+def run_shards(backend: ExecutionBackend, fn: Callable[[Any, Shard], Any], context: Any,
+               shards: List[Shard], merge: Callable[[Any], None],
+               should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Run shards on a backend and merge their results
+
+    Without ``should_stop`` every shard is submitted at once. With it, the
+    shards run in batches that double in size (starting at one shard per
+    worker), ``should_stop()`` is checked after each merged shard and the
+    run ends at the first shard where it returns True. Since the check
+    happens shard by shard in order, a seeded run stops at the same shard
+    whatever the number of workers.
+
+    Args:
+        - backend [ExecutionBackend]: where to run the shards
+        - fn [Callable]: module-level shard function
+        - context [Any]: read-only data shared by every shard
+        - shards [List{Shard}]: work to run, in order
+        - merge [Callable]: called with each shard result, in shard order
+        - should_stop [Callable]: early-stopping test
+
+    Returns:
+        - int: number of shards that were merged
+    """
+    with backend.pool(fn, context) as run:
+        if should_stop is None:
+            for result in run(shards):
+                merge(result)
+            return len(shards)
+
+        done, batch_size = 0, backend.max_workers
+        while done < len(shards):
+            for result in run(shards[done:done + batch_size]):
+                merge(result)
+                done += 1
+                if should_stop():
+                    return done
+            batch_size *= 2
+        return done
+
+
+def new_master_seed() -> int:
+    """Draw a fresh 128-bit master seed from the OS entropy pool"""
+    return int(np.random.SeedSequence().entropy)
+
+
+def derive_rng(master_seed: int, *key: int) -> np.random.Generator:
+    """
+    Get the random generator addressed by a master seed and an integer path
+
+    Different paths give statistically independent streams, and the same
+    path always gives the same stream, whichever thread or process asks.
+
+    Args:
+        - master_seed [int]: seed of the whole run
+        - key [int]: path below the master seed (e.g. shard index, stream, player)
+
+    Returns:
+        - np.random.Generator: stream of that path
+    """
+    return np.random.default_rng(np.random.SeedSequence(master_seed, spawn_key=key))
+
+
+def python_random(generator: np.random.Generator) -> random.Random:
+    """
+    Seed a standard library generator from a NumPy stream
+
+    Scalar draws in tight Python loops (such as dealing single cards) are
+    cheaper on random.Random, while the seed still comes from the stream.
+
+    Args:
+        - generator [np.random.Generator]: parent stream
+
+    Returns:
+        - random.Random: generator owned by the caller
+    """
+    return random.Random(int(generator.integers(2 ** 63)))
+
+
+def shard_rng(master_seed: int, shard_index: int) -> np.random.Generator:
+    """
+    Get the random generator of one shard
+
+    The stream depends only on the master seed and the shard index, so a
+    shard produces the same draws whichever worker runs it.
+
+    Args:
+        - master_seed [int]: seed of the whole run
+        - shard_index [int]: position of the shard in the run
+
+    Returns:
+        - np.random.Generator: independent stream for the shard
+    """
+    return derive_rng(master_seed, shard_index)
+
+
+def make_shards(master_seed: int, num_simulations: int, shard_size: int) -> List[Shard]:
+    """
+    Split a run into seed-addressed shards
+
+    Args:
+        - master_seed [int]: seed of the whole run
+        - num_simulations [int]: total simulations
+        - shard_size [int]: simulations per shard (the last one may be smaller)
+
+    Returns:
+        - List{Shard}: (master_seed, shard_index, num_simulations) tuples
+    """
+    shard_size = max(1, shard_size)
+    return [(master_seed, index, min(shard_size, num_simulations - start))
+            for index, start in enumerate(range(0, num_simulations, shard_size))]
+
+
+def calibrate_shard_size(probe: Callable[[int], Any], num_simulations: int, max_workers: int,
+                         probe_size: int, max_size: Optional[int] = None) -> int:
+    """
+    Pick a shard size from a quick timed run
+
+    The probe is timed on ``probe_size`` simulations and the shard size is
+    set so that one shard takes about TARGET_SHARD_SECONDS, while still
+    giving every worker at least SHARDS_PER_WORKER shards.
+
+    Args:
+        - probe [Callable]: runs the given number of simulations in-process
+        - num_simulations [int]: total simulations of the run
+        - max_workers [int]: number of workers sharing the run
+        - probe_size [int]: simulations in the timed run
+        - max_size [int]: upper bound on the shard size
+
+    Returns:
+        - int: simulations per shard
+    """
+    if num_simulations <= probe_size:
+        return max(1, num_simulations)
+    start = time.perf_counter()
+    probe(probe_size)
+    seconds_per_simulation = (time.perf_counter() - start) / probe_size
+
+    size = int(TARGET_SHARD_SECONDS / seconds_per_simulation) if seconds_per_simulation > 0 else num_simulations
+    size = min(size, math.ceil(num_simulations / (SHARDS_PER_WORKER * max_workers)))
+    if max_size is not None:
+        size = min(size, max_size)
+    return max(probe_size, size)
@@ -0,0 +1,391 @@
+"""
+Table-driven hand evaluator.
+
+Every card contributes an additive key: the low bits hold a per-rank key
+chosen so that the sum over any multiset of up to seven ranks is unique,
+and the high bits hold one 3-bit counter per suit. Evaluating a hand is
+therefore a sum of card keys followed by at most two table lookups:
+
+    - FLUSH_SUIT maps the packed suit counters to the suit holding five or
+      more cards (or -1)
+    - the flush table maps the 13-bit rank mask of that suit to a strength
+    - otherwise the rank table maps the rank-key sum to a strength
+
+Strengths are dense integers between 1 (7-5-4-3-2 offsuit) and 7462 (royal
+flush), so comparing two hands is a single integer comparison. The tables
+are generated once, saved next to this module (or in $POKER_TABLES_DIR)
+and memory-mapped on later loads.
+"""
+import bisect
+import itertools
+import os
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from models.Card import Card
+
+# Per-rank keys (deuce to ace): every multiset of at most seven ranks with
+# at most four cards per rank has a distinct sum
+RANK_KEYS: Tuple[int, ...] = (
+    1, 5, 24, 112, 521, 2247, 9244, 30823, 103066, 250154, 667453, 1526359, 3453520
+)
+SUIT_SHIFT = 25
+RANK_KEY_MASK = (1 << SUIT_SHIFT) - 1
+
+CARD_KEYS: Tuple[int, ...] = tuple(
+    RANK_KEYS[card_id >> 2] + (1 << (SUIT_SHIFT + 3 * (card_id & 3)))
+    for card_id in range(52)
+)
+
+# Suit holding five or more cards for every packed suit-counter value
+FLUSH_SUIT: Tuple[int, ...] = tuple(
+    next((suit for suit in range(4) if (packed >> (3 * suit)) & 7 >= 5), -1)
+    for packed in range(1 << 12)
+)
+
+# Hand categories, numbered like the legacy calculate_hand_score tuples
+HIGH_CARD = 1
+PAIR = 2
+TWO_PAIR = 3
+THREE_OF_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_KIND = 8
+STRAIGHT_FLUSH = 9
+
+CATEGORY_NAMES = {
+    HIGH_CARD: "High Card",
+    PAIR: "Pair",
+    TWO_PAIR: "Two Pair",
+    THREE_OF_KIND: "Three of a Kind",
+    STRAIGHT: "Straight",
+    FLUSH: "Flush",
+    FULL_HOUSE: "Full House",
+    FOUR_OF_KIND: "Four of a Kind",
+    STRAIGHT_FLUSH: "Straight Flush",
+}
+
+# Number of distinct 5-card hand classes in each category, weakest first
+_CATEGORY_SIZES = (1277, 2860, 858, 858, 10, 1277, 156, 156, 10)
+NUM_STRENGTHS = sum(_CATEGORY_SIZES)
+CATEGORY_THRESHOLDS: Tuple[int, ...] = tuple(itertools.accumulate(_CATEGORY_SIZES))
+
+TABLES_VERSION = 1
+TABLES_DIR = os.environ.get(
+    "POKER_TABLES_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+)
+
+_STRAIGHT_MASKS = [(0b11111 << low, low + 4) for low in range(8, -1, -1)] + [(0b1000000001111, 3)]
+
+
+def _straight_high(rank_mask: int) -> int:
+    """Return the top rank of the best straight in a rank mask, or -1"""
+    for pattern, high in _STRAIGHT_MASKS:
+        if rank_mask & pattern == pattern:
+            return high
+    return -1
+
+
+def _top_ranks(rank_mask: int, count: int) -> List[int]:
+    """Return the highest ``count`` ranks set in a rank mask"""
+    ranks = []
+    for rank in range(12, -1, -1):
+        if rank_mask >> rank & 1:
+            ranks.append(rank)
+            if len(ranks) == count:
+                break
+    return ranks
+
+
+def _flush_value(rank_mask: int) -> Tuple[int, ...]:
+    """Best 5-card value of a single-suit rank mask with five or more ranks"""
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return (STRAIGHT_FLUSH, high)
+    return (FLUSH, *_top_ranks(rank_mask, 5))
+
+
+def _rank_value(counts: Sequence[int]) -> Tuple[int, ...]:
+    """Best 5-card value, ignoring suits, of a rank-count vector"""
+    by_count = {4: [], 3: [], 2: [], 1: []}
+    rank_mask = 0
+    for rank in range(12, -1, -1):
+        if counts[rank]:
+            by_count[counts[rank]].append(rank)
+            rank_mask |= 1 << rank
+
+    def kickers(exclude, count):
+        return _top_ranks(rank_mask & ~sum(1 << rank for rank in exclude), count)
+
+    if by_count[4]:
+        quad = by_count[4][0]
+        return (FOUR_OF_KIND, quad, *kickers([quad], 1))
+    if by_count[3] and len(by_count[3]) + len(by_count[2]) >= 2:
+        trips = by_count[3][0]
+        pair = max(by_count[3][1:] + by_count[2])
+        return (FULL_HOUSE, trips, pair)
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return (STRAIGHT, high)
+    if by_count[3]:
+        trips = by_count[3][0]
+        return (THREE_OF_KIND, trips, *kickers([trips], 2))
+    if len(by_count[2]) >= 2:
+        pairs = by_count[2][:2]
+        return (TWO_PAIR, *pairs, *kickers(pairs, 1))
+    if by_count[2]:
+        pair = by_count[2][0]
+        return (PAIR, pair, *kickers([pair], 3))
+    return (HIGH_CARD, *_top_ranks(rank_mask, 5))
+
+
+def _rank_multisets(size: int) -> Iterable[Tuple[int, ...]]:
+    """Yield every rank-count vector of ``size`` cards with at most four per rank"""
+    for combo in itertools.combinations_with_replacement(range(13), size):
+        counts = [0] * 13
+        for rank in combo:
+            counts[rank] += 1
+        if max(counts) <= 4:
+            yield counts
+
+
+def build_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate the rank and flush lookup tables from scratch
+
+    Returns:
+        - rank_table [np.ndarray]: uint16 strengths indexed by rank-key sum
+        - flush_table [np.ndarray]: uint16 strengths indexed by 13-bit rank mask
+    """
+    rank_values = {}
+    for size in (5, 6, 7):
+        for counts in _rank_multisets(size):
+            key = sum(RANK_KEYS[rank] * count for rank, count in enumerate(counts))
+            rank_values[key] = _rank_value(counts)
+
+    flush_values = {}
+    for rank_mask in range(1 << 13):
+        if bin(rank_mask).count("1") >= 5:
+            flush_values[rank_mask] = _flush_value(rank_mask)
+
+    ordered = sorted(set(rank_values.values()) | set(flush_values.values()))
+    if len(ordered) != NUM_STRENGTHS:
+        raise RuntimeError(f"Expected {NUM_STRENGTHS} hand classes, found {len(ordered)}")
+    strength_of = {value: strength for strength, value in enumerate(ordered, start=1)}
+
+    rank_table = np.zeros(max(rank_values) + 1, dtype=np.uint16)
+    for key, value in rank_values.items():
+        rank_table[key] = strength_of[value]
+    flush_table = np.zeros(1 << 13, dtype=np.uint16)
+    for rank_mask, value in flush_values.items():
+        flush_table[rank_mask] = strength_of[value]
+    return rank_table, flush_table
+
+
+def _table_paths(directory: str) -> Tuple[str, str]:
+    return (os.path.join(directory, f"rank_table_v{TABLES_VERSION}.npy"),
+            os.path.join(directory, f"flush_table_v{TABLES_VERSION}.npy"))
+
+
+def load_tables(directory: str = TABLES_DIR) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load the lookup tables, generating and saving them on first use
+
+    Args:
+        - directory [str]: folder holding the persisted tables
+
+    Returns:
+        - rank_table [np.ndarray]: memory-mapped rank table
+        - flush_table [np.ndarray]: memory-mapped flush table
+    """
+    rank_path, flush_path = _table_paths(directory)
+    try:
+        return np.load(rank_path, mmap_mode="r"), np.load(flush_path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    rank_table, flush_table = build_tables()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write to temporary files first so concurrent loaders never see partial tables
+        for path, table in ((rank_path, rank_table), (flush_path, flush_table)):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, table)
+            os.replace(tmp_path, path)
+        return np.load(rank_path, mmap_mode="r"), np.load(flush_path, mmap_mode="r")
+    except OSError:
+        # Read-only install: keep the freshly built tables in memory
+        return rank_table, flush_table
+
+
+RANK_TABLE, FLUSH_TABLE = load_tables()
+_FLUSH_LIST: List[int] = FLUSH_TABLE.tolist()
+_CARD_KEYS_ARRAY = np.array(CARD_KEYS, dtype=np.int64)
+_FLUSH_SUIT_ARRAY = np.array(FLUSH_SUIT, dtype=np.int8)
+_THRESHOLDS_ARRAY = np.array(CATEGORY_THRESHOLDS, dtype=np.int64)
+
+
+def evaluate(card_ids: Sequence[int]) -> int:
+    """
+    Evaluate a set of 5, 6 or 7 cards given as integer ids
+
+    Args:
+        - card_ids [Sequence{int}]: card ids between 0 and 51
+
+    Returns:
+        - strength [int]: between 1 and 7462, higher is better
+    """
+    key = 0
+    for card_id in card_ids:
+        key += CARD_KEYS[card_id]
+    suit = FLUSH_SUIT[key >> SUIT_SHIFT]
+    if suit < 0:
+        return RANK_TABLE.item(key & RANK_KEY_MASK)
+    rank_mask = 0
+    for card_id in card_ids:
+        if card_id & 3 == suit:
+            rank_mask |= 1 << (card_id >> 2)
+    return _FLUSH_LIST[rank_mask]
+
+
+def evaluate_cards(cards: Iterable[Card]) -> int:
+    """
+    Evaluate a set of 5, 6 or 7 Card objects
+
+    Args:
+        - cards [Iterable{Card}]: cards to evaluate
+
+    Returns:
+        - strength [int]: between 1 and 7462, higher is better
+    """
+    return evaluate([card.id for card in cards])
+
+
+class HandState:
+    """
+    Evaluator state of a growing set of cards, updated in place
+
+    Holds the additive key (rank-key sum and packed suit counters) and one
+    rank bitmask per suit, so adding a card is a constant-time update and
+    reading the strength is the same one or two table lookups as evaluate.
+    Dealing the turn or river to a player only adds that card.
+
+    Args:
+        - card_ids [Iterable{int}]: initial card ids
+    """
+    __slots__ = ("key", "suit_masks", "num_cards")
+
+    def __init__(self, card_ids: Iterable[int] = ()):
+        self.key = 0
+        self.suit_masks = [0, 0, 0, 0]
+        self.num_cards = 0
+        self.add_all(card_ids)
+
+    def add(self, card_id: int) -> None:
+        """Add one card"""
+        self.key += CARD_KEYS[card_id]
+        self.suit_masks[card_id & 3] |= 1 << (card_id >> 2)
+        self.num_cards += 1
+
+    def add_all(self, card_ids: Iterable[int]) -> None:
+        """Add several cards"""
+        for card_id in card_ids:
+            self.add(card_id)
+
+    def strength(self) -> int:
+        """
+        Strength of the cards held, equal to evaluate of the same cards
+
+        Returns:
+            - strength [int]: between 1 and 7462, higher is better
+        """
+        if not 5 <= self.num_cards <= 7:
+            raise ValueError(f"A hand needs 5 to 7 cards to be evaluated, got {self.num_cards}")
+        suit = FLUSH_SUIT[self.key >> SUIT_SHIFT]
+        if suit < 0:
+            return RANK_TABLE.item(self.key & RANK_KEY_MASK)
+        return _FLUSH_LIST[self.suit_masks[suit]]
+
+
+def hand_category(strength: int) -> int:
+    """
+    Get the hand category of a strength
+
+    Args:
+        - strength [int]: value returned by evaluate
+
+    Returns:
+        - category [int]: HIGH_CARD (1) to STRAIGHT_FLUSH (9)
+    """
+    return bisect.bisect_left(CATEGORY_THRESHOLDS, strength) + 1
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Evaluate many hands at once using only array operations
+
+    Args:
+        - cards [np.ndarray]: integer card ids of shape (N, k) with 5 <= k <= 7
+
+    Returns:
+        - strengths [np.ndarray]: uint16 array of shape (N,), higher is better
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    keys = _CARD_KEYS_ARRAY[cards].sum(axis=1)
+    strengths = RANK_TABLE[keys & RANK_KEY_MASK]
+    flush_suits = _FLUSH_SUIT_ARRAY[keys >> SUIT_SHIFT]
+    flush_rows = np.flatnonzero(flush_suits >= 0)
+    if flush_rows.size:
+        strengths[flush_rows] = _flush_strengths(cards[flush_rows], flush_suits[flush_rows])
+    return strengths
+
+
+def evaluate_boards(holes: np.ndarray, boards: np.ndarray) -> np.ndarray:
+    """
+    Evaluate every player's hole cards against its own board
+
+    The board keys are summed once per board and shared by all players,
+    which is cheaper than building and evaluating full 7-card rows.
+
+    Args:
+        - holes [np.ndarray]: hole card ids of shape (N, P, h)
+        - boards [np.ndarray]: community card ids of shape (N, b) with 5 <= h + b <= 7
+
+    Returns:
+        - strengths [np.ndarray]: uint16 array of shape (N, P), higher is better
+    """
+    holes = np.asarray(holes, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    keys = _CARD_KEYS_ARRAY[holes].sum(axis=2) + _CARD_KEYS_ARRAY[boards].sum(axis=1)[:, None]
+    strengths = RANK_TABLE[keys & RANK_KEY_MASK]
+    flush_suits = _FLUSH_SUIT_ARRAY[keys >> SUIT_SHIFT]
+    board_rows, players = np.nonzero(flush_suits >= 0)
+    if board_rows.size:
+        flush_cards = np.concatenate([holes[board_rows, players], boards[board_rows]], axis=1)
+        strengths[board_rows, players] = _flush_strengths(flush_cards, flush_suits[board_rows, players])
+    return strengths
+
+
+def _flush_strengths(cards: np.ndarray, suits: np.ndarray) -> np.ndarray:
+    """Look up the flush table for hands known to hold five cards of ``suits``"""
+    in_suit = (cards & 3) == suits[:, None]
+    # Ranks within one suit are distinct, so summing the bits is an OR
+    rank_masks = np.where(in_suit, 1 << (cards >> 2), 0).sum(axis=1)
+    return FLUSH_TABLE[rank_masks]
+
+
+def hand_categories(strengths: np.ndarray) -> np.ndarray:
+    """
+    Vectorized hand_category
+
+    Args:
+        - strengths [np.ndarray]: values returned by evaluate_batch
+
+    Returns:
+        - categories [np.ndarray]: HIGH_CARD (1) to STRAIGHT_FLUSH (9) per hand
+    """
+    return np.searchsorted(_THRESHOLDS_ARRAY, strengths, side="left") + 1
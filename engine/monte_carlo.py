@@ -0,0 +1,463 @@
+"""
+Vectorized Monte Carlo equity engine.
+
+Instead of dealing one board per Python call, a whole chunk of run-outs is
+drawn at once with a vectorized partial Fisher-Yates shuffle over the live
+cards, every player's hand is scored with one evaluate_boards call and pots
+are settled with split-pot accounting. Memory is bounded by the chunk size,
+not by the number of simulations.
+
+When every hole card is known and the remaining boards are fewer than the
+simulation budget (990 at most on the flop, 45 on the turn), run_equity walks
+every board instead and returns exact results.
+"""
+import itertools
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import stats
+
+from engine.executor import (
+    ExecutionBackend, Shard, calibrate_shard_size, make_shards, new_master_seed, run_shards, shard_rng
+)
+from engine.hand_evaluator import evaluate_boards
+from engine.statistics import RunningStats
+
+# Number of run-outs drawn and scored together
+DEFAULT_CHUNK_SIZE = 65536
+
+# Run-outs simulated to time the engine before picking a shard size
+CALIBRATION_SIZE = 4096
+
+# Run-outs per shard of seeded adaptive runs, small enough to stop close to the target
+ADAPTIVE_SHARD_SIZE = 4096
+
+# Every player puts this much in the pot in each simulated hand
+DEFAULT_STAKE = 10
+
+
+@dataclass
+class EquityTally:
+    """
+    Aggregated outcome of a number of simulated run-outs
+
+    Attributes:
+        - num_simulations [int]: run-outs played
+        - wins [np.ndarray]: pots won outright by each player
+        - ties [np.ndarray]: pots split by each player
+        - equity [np.ndarray]: pot share won by each player (ties count fractionally)
+        - profit [RunningStats]: streaming statistics of each player's profit per hand
+        - exact [bool]: True when every possible run-out was enumerated once
+    """
+    num_simulations: int
+    wins: np.ndarray
+    ties: np.ndarray
+    equity: np.ndarray
+    profit: RunningStats
+    exact: bool = False
+
+    @classmethod
+    def empty(cls, num_players: int) -> 'EquityTally':
+        """Create a tally with no simulations"""
+        return cls(
+            num_simulations=0,
+            wins=np.zeros(num_players, dtype=np.int64),
+            ties=np.zeros(num_players, dtype=np.int64),
+            equity=np.zeros(num_players, dtype=np.float64),
+            profit=RunningStats(num_players)
+        )
+
+    def merge(self, other: 'EquityTally') -> 'EquityTally':
+        """
+        Add another tally into this one
+
+        Args:
+            - other [EquityTally]: tally over the same players
+
+        Returns:
+            - EquityTally: self, for chaining
+        """
+        self.num_simulations += other.num_simulations
+        self.wins += other.wins
+        self.ties += other.ties
+        self.equity += other.equity
+        self.profit.merge(other.profit)
+        return self
+
+
+def live_cards(dead_ids: Sequence[int]) -> np.ndarray:
+    """
+    Get the ids of the cards that are still in the deck
+
+    Args:
+        - dead_ids [Sequence{int}]: ids of the cards already dealt
+
+    Returns:
+        - live [np.ndarray]: remaining card ids, ascending
+    """
+    alive = np.ones(52, dtype=bool)
+    alive[list(dead_ids)] = False
+    return np.flatnonzero(alive).astype(np.int8)
+
+
+def deal_runouts(live: np.ndarray, num_cards: int, num_simulations: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw ``num_cards`` distinct live cards for each of many simulations
+
+    Runs a partial Fisher-Yates shuffle on every row at once, so only
+    ``num_cards`` swap steps are made regardless of the deck size.
+
+    Args:
+        - live [np.ndarray]: card ids that can be dealt
+        - num_cards [int]: cards needed per simulation
+        - num_simulations [int]: number of simulations
+        - rng [np.random.Generator]: random source
+
+    Returns:
+        - cards [np.ndarray]: int64 card ids of shape (num_simulations, num_cards)
+    """
+    decks = np.tile(live, (num_simulations, 1))
+    rows = np.arange(num_simulations)
+    for position in range(num_cards):
+        picks = rng.integers(position, len(live), size=num_simulations)
+        picked = decks[rows, picks]
+        decks[rows, picks] = decks[:, position]
+        decks[:, position] = picked
+    return decks[:, :num_cards].astype(np.int64)
+
+
+def settle_pots(strengths: np.ndarray, stake: int = DEFAULT_STAKE) -> EquityTally:
+    """
+    Split each simulated pot between the players holding the best hand
+
+    Args:
+        - strengths [np.ndarray]: hand strengths of shape (N, P)
+        - stake [int]: amount each player puts in the pot
+
+    Returns:
+        - EquityTally: outcome of the N hands
+    """
+    num_simulations, num_players = strengths.shape
+    is_best = strengths == strengths.max(axis=1, keepdims=True)
+    num_best = is_best.sum(axis=1, keepdims=True)
+    share = is_best / num_best
+    return EquityTally(
+        num_simulations=num_simulations,
+        wins=(is_best & (num_best == 1)).sum(axis=0),
+        ties=(is_best & (num_best > 1)).sum(axis=0),
+        equity=share.sum(axis=0),
+        profit=RunningStats(num_players).add_batch(share * (stake * num_players) - stake)
+    )
+
+
+def simulate_equity(hole_ids: List[List[int]], board_ids: List[int], num_simulations: int,
+                    rng: Optional[np.random.Generator] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    stake: int = DEFAULT_STAKE) -> EquityTally:
+    """
+    Estimate every player's equity by simulating random run-outs
+
+    Players with fewer than two known hole cards get random ones in each
+    simulation, and the board is completed to five cards.
+
+    Args:
+        - hole_ids [List{List{int}}]: known hole card ids of each player
+        - board_ids [List{int}]: known community card ids
+        - num_simulations [int]: number of run-outs to simulate
+        - rng [np.random.Generator]: random source (a fresh one if None)
+        - chunk_size [int]: maximum run-outs held in memory at once
+        - stake [int]: amount each player puts in the pot
+
+    Returns:
+        - EquityTally: aggregated outcome of all run-outs
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    num_players = len(hole_ids)
+    known_holes = np.full((num_players, 2), -1, dtype=np.int64)
+    for player, hand in enumerate(hole_ids):
+        known_holes[player, :len(hand)] = hand
+    missing_holes = np.flatnonzero(known_holes.reshape(-1) < 0)
+    missing_board = 5 - len(board_ids)
+
+    live = live_cards([card for hand in hole_ids for card in hand] + list(board_ids))
+    tally = EquityTally.empty(num_players)
+    for start in range(0, num_simulations, chunk_size):
+        size = min(chunk_size, num_simulations - start)
+        drawn = deal_runouts(live, len(missing_holes) + missing_board, size, rng)
+
+        holes = np.tile(known_holes.reshape(1, -1), (size, 1))
+        holes[:, missing_holes] = drawn[:, :len(missing_holes)]
+        boards = np.empty((size, 5), dtype=np.int64)
+        boards[:, :len(board_ids)] = board_ids
+        boards[:, len(board_ids):] = drawn[:, len(missing_holes):]
+
+        strengths = evaluate_boards(holes.reshape(size, num_players, 2), boards)
+        tally.merge(settle_pots(strengths, stake))
+    return tally
+
+
+def equity_shard(context: Tuple, shard: Shard) -> EquityTally:
+    """
+    Shard function simulating one seed-addressed block of run-outs
+
+    Args:
+        - context [Tuple]: (hole_ids, board_ids, chunk_size, stake)
+        - shard [Shard]: (master_seed, shard_index, num_simulations)
+
+    Returns:
+        - EquityTally: partial aggregate of the shard
+    """
+    hole_ids, board_ids, chunk_size, stake = context
+    master_seed, shard_index, num_simulations = shard
+    return simulate_equity(hole_ids, board_ids, num_simulations, shard_rng(master_seed, shard_index),
+                           chunk_size, stake)
+
+
+def count_runouts(hole_ids: List[List[int]], board_ids: List[int]) -> Optional[int]:
+    """
+    Count the distinct boards that complete a deal
+
+    Args:
+        - hole_ids [List{List{int}}]: known hole card ids of each player
+        - board_ids [List{int}]: known community card ids
+
+    Returns:
+        - int: number of boards, or None if some hole cards are unknown
+    """
+    if any(len(hand) < 2 for hand in hole_ids):
+        return None
+    num_dead = sum(len(hand) for hand in hole_ids) + len(board_ids)
+    return math.comb(52 - num_dead, 5 - len(board_ids))
+
+
+def unrank_combination(num_items: int, size: int, index: int) -> List[int]:
+    """
+    Get the positions of one combination without walking the ones before it
+
+    Args:
+        - num_items [int]: items to choose from
+        - size [int]: items per combination
+        - index [int]: rank of the combination in itertools.combinations order
+
+    Returns:
+        - List{int}: ascending positions of the chosen items
+    """
+    positions = []
+    item = 0
+    for remaining in range(size, 0, -1):
+        # Skip every combination whose next item is smaller
+        block = math.comb(num_items - item - 1, remaining - 1)
+        while index >= block:
+            index -= block
+            item += 1
+            block = math.comb(num_items - item - 1, remaining - 1)
+        positions.append(item)
+        item += 1
+    return positions
+
+
+def combinations_from(items: Sequence[int], size: int, start: int) -> Iterator[Tuple[int, ...]]:
+    """
+    Iterate itertools.combinations(items, size) from the combination of rank start
+
+    Args:
+        - items [Sequence{int}]: items to choose from
+        - size [int]: items per combination
+        - start [int]: rank of the first combination
+
+    Returns:
+        - Iterator{Tuple{int}}: combinations in itertools.combinations order
+    """
+    num_items = len(items)
+    positions = unrank_combination(num_items, size, start)
+    while True:
+        yield tuple(items[position] for position in positions)
+        # Advance the rightmost position that is not at its last value
+        i = size - 1
+        while i >= 0 and positions[i] == i + num_items - size:
+            i -= 1
+        if i < 0:
+            return
+        positions[i] += 1
+        for j in range(i + 1, size):
+            positions[j] = positions[j - 1] + 1
+
+
+def enumeration_shard(context: Tuple, shard: Shard) -> EquityTally:
+    """
+    Shard function settling one block of enumerated boards
+
+    Args:
+        - context [Tuple]: (hole_ids, board_ids, stake)
+        - shard [Shard]: (first_board, num_boards) in itertools.combinations order
+
+    Returns:
+        - EquityTally: partial aggregate of the block
+    """
+    hole_ids, board_ids, stake = context
+    start, num_boards = shard
+    missing_board = 5 - len(board_ids)
+    live = live_cards([card for hand in hole_ids for card in hand] + list(board_ids)).tolist()
+
+    # Start at the shard's first board directly, so every shard costs only its own boards
+    combinations = itertools.islice(combinations_from(live, missing_board, start), num_boards)
+    boards = np.empty((num_boards, 5), dtype=np.int64)
+    boards[:, :len(board_ids)] = board_ids
+    boards[:, len(board_ids):] = np.fromiter(
+        itertools.chain.from_iterable(combinations), dtype=np.int64, count=num_boards * missing_board
+    ).reshape(num_boards, missing_board)
+
+    holes = np.broadcast_to(np.array(hole_ids, dtype=np.int64), (num_boards, len(hole_ids), 2))
+    return settle_pots(evaluate_boards(holes, boards), stake)
+
+
+def enumerate_equity(hole_ids: List[List[int]], board_ids: List[int],
+                     backend: Optional[ExecutionBackend] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, stake: int = DEFAULT_STAKE) -> EquityTally:
+    """
+    Compute every player's exact equity by settling every possible board
+
+    Args:
+        - hole_ids [List{List{int}}]: hole card ids of each player (all known)
+        - board_ids [List{int}]: known community card ids
+        - backend [ExecutionBackend]: where to run the blocks (serial if None)
+        - chunk_size [int]: boards settled per block
+        - stake [int]: amount each player puts in the pot
+
+    Returns:
+        - EquityTally: exact aggregate, one simulation per board
+    """
+    num_boards = count_runouts(hole_ids, board_ids)
+    if num_boards is None:
+        raise ValueError("Exact enumeration needs every player's hole cards")
+    backend = backend if backend is not None else ExecutionBackend("serial")
+    context = ([list(hand) for hand in hole_ids], list(board_ids), stake)
+    shards = [(start, min(chunk_size, num_boards - start)) for start in range(0, num_boards, chunk_size)]
+
+    tally = EquityTally.empty(len(hole_ids))
+    run_shards(backend, enumeration_shard, context, shards, tally.merge)
+    tally.exact = True
+    return tally
+
+
+def win_half_widths(tally: EquityTally, confidence: float = 0.95) -> np.ndarray:
+    """
+    Half-width of each player's binomial win-probability interval
+
+    Args:
+        - tally [EquityTally]: aggregate so far
+        - confidence [float]: confidence level
+
+    Returns:
+        - np.ndarray: half-widths as probabilities (inf before any simulation)
+    """
+    num_simulations = tally.num_simulations
+    if tally.exact:
+        return np.zeros(len(tally.equity))
+    if num_simulations == 0:
+        return np.full(len(tally.equity), np.inf)
+    low, high = stats.binom.interval(confidence, num_simulations, tally.equity / num_simulations)
+    return (high - low) / (2 * num_simulations)
+
+
+def make_stopping_rule(tally: EquityTally, target_half_width: Optional[float] = None,
+                       time_budget: Optional[float] = None,
+                       confidence: float = 0.95) -> Optional[Callable[[], bool]]:
+    """
+    Build the early-stopping test of an adaptive run
+
+    Args:
+        - tally [EquityTally]: aggregate that the run keeps merging into
+        - target_half_width [float]: stop once every win-probability interval is this tight
+        - time_budget [float]: stop once this many seconds have passed
+        - confidence [float]: confidence level of the intervals
+
+    Returns:
+        - Callable: test for run_shards, or None when neither limit is set
+    """
+    if target_half_width is None and time_budget is None:
+        return None
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    def should_stop() -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return True
+        return target_half_width is not None and bool(
+            (win_half_widths(tally, confidence) <= target_half_width).all()
+        )
+
+    return should_stop
+
+
+def run_equity(hole_ids: List[List[int]], board_ids: List[int], num_simulations: int,
+               backend: Optional[ExecutionBackend] = None, seed: Optional[int] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, stake: int = DEFAULT_STAKE,
+               shard_size: Optional[int] = None, target_half_width: Optional[float] = None,
+               time_budget: Optional[float] = None, exhaustive: Optional[bool] = None) -> EquityTally:
+    """
+    Run simulate_equity in seed-addressed shards on an execution backend
+
+    The shard size does not depend on the number of workers, so a seeded run
+    gives the same result on every backend. When it is not given, seeded runs
+    use a fixed size and unseeded runs tune it with a calibration run.
+
+    With a target half-width or a time budget the run is adaptive:
+    ``num_simulations`` becomes an upper bound, shards of at most
+    ADAPTIVE_SHARD_SIZE run-outs (no calibration run) are played in growing
+    batches and the run stops as soon as the limits are met.
+
+    By default the boards are enumerated exactly instead (see
+    enumerate_equity) when every hole card is known and there are no more
+    boards than ``num_simulations``; in an adaptive run, only when they are
+    no more than one adaptive shard, so the limits are never overrun.
+
+    Args:
+        - hole_ids [List{List{int}}]: known hole card ids of each player
+        - board_ids [List{int}]: known community card ids
+        - num_simulations [int]: number of run-outs to simulate (maximum if adaptive)
+        - backend [ExecutionBackend]: where to run the shards (serial if None)
+        - seed [int]: master seed (a random one if None)
+        - chunk_size [int]: maximum run-outs held in memory at once by a shard
+        - stake [int]: amount each player puts in the pot
+        - shard_size [int]: run-outs per shard (automatic if None)
+        - target_half_width [float]: stop once every 95% win interval is this tight
+        - time_budget [float]: stop after this many seconds
+        - exhaustive [bool]: force (True) or forbid (False) exact enumeration (automatic if None)
+
+    Returns:
+        - EquityTally: merged aggregate; num_simulations holds the run-outs actually used
+    """
+    backend = backend if backend is not None else ExecutionBackend("serial")
+    adaptive = target_half_width is not None or time_budget is not None
+    if exhaustive is None:
+        num_boards = count_runouts(hole_ids, board_ids)
+        limit = min(num_simulations, ADAPTIVE_SHARD_SIZE) if adaptive else num_simulations
+        exhaustive = num_boards is not None and num_boards <= limit
+    if exhaustive:
+        return enumerate_equity(hole_ids, board_ids, backend, chunk_size, stake)
+
+    # The clock of the time budget starts before any work, shard sizing included
+    tally = EquityTally.empty(len(hole_ids))
+    should_stop = make_stopping_rule(tally, target_half_width, time_budget)
+
+    context = ([list(hand) for hand in hole_ids], list(board_ids), chunk_size, stake)
+    if shard_size is None:
+        if adaptive:
+            # Small shards, so the limits are checked often
+            shard_size = min(chunk_size, ADAPTIVE_SHARD_SIZE)
+        elif seed is None:
+            shard_size = calibrate_shard_size(
+                lambda size: equity_shard(context, (new_master_seed(), 0, size)),
+                num_simulations, backend.max_workers, probe_size=CALIBRATION_SIZE
+            )
+        else:
+            shard_size = chunk_size
+    seed = seed if seed is not None else new_master_seed()
+
+    run_shards(backend, equity_shard, context, make_shards(seed, num_simulations, shard_size), tally.merge,
+               should_stop)
+    return tally
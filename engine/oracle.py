@@ -0,0 +1,212 @@
+"""
+Equity oracle answering within a per-query latency budget.
+
+A decision-time equity estimate has to be cheap, so the oracle tries a
+chain of sources, fastest first, and stops at the first one that fits in
+the time left:
+
+    - "preflop": the precomputed 169-class table (a single array read)
+    - "exact": heads-up enumeration of every remaining board and opponent
+      hand, when its estimated cost fits the budget (turn and river)
+    - "monte_carlo": vectorized run-outs in chunks sized to the time left,
+      until the sample cap is reached or the next chunk would overrun the
+      deadline; at least one small chunk runs whenever time is left
+
+Exact answers are memoized in EQUITY_CACHE under the suit-canonical deal,
+so a repeated spot costs one lookup. Budget-cut Monte Carlo estimates are
+not stored, so a noisy early answer never stands in for later queries.
+When no source can answer in time the query returns None and the caller
+applies its own fallback.
+"""
+import itertools
+import math
+import time
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.cache import EQUITY_CACHE, canonical_key
+from engine.hand_evaluator import evaluate_boards
+from engine.monte_carlo import live_cards, simulate_equity
+from engine.preflop import MAX_PLAYERS, preflop_equity
+
+ORACLE_TIERS = ("preflop", "exact", "monte_carlo")
+
+# Default time allowed to one query, in seconds
+DEFAULT_LATENCY_BUDGET = 0.002
+
+# Default cap on the Monte Carlo run-outs of one query
+DEFAULT_MAX_SAMPLES = 2000
+
+# Run-outs simulated between two deadline checks, at most
+MC_CHUNK_SIZE = 256
+
+# Smallest chunk worth simulating; the first chunk of a query never goes below it
+MC_MIN_CHUNK_SIZE = 32
+
+# Initial guess of the time of one Monte Carlo run-out, refined by measurement
+MC_SAMPLE_SECONDS = 2e-6
+
+# Approximate cost of one enumerated (board, opponent hand) pair, in seconds
+EXACT_SECONDS_PER_ROW = 3e-7
+
+
+def count_heads_up_rows(hole_ids: Sequence[int], board_ids: Sequence[int]) -> int:
+    """
+    Count the (board, opponent hand) pairs enumerated by heads_up_equity
+
+    Args:
+        - hole_ids [Sequence{int}]: the player's two hole card ids
+        - board_ids [Sequence{int}]: known community card ids
+
+    Returns:
+        - int: number of pairs
+    """
+    num_live = 52 - len(hole_ids) - len(board_ids)
+    missing = 5 - len(board_ids)
+    return math.comb(num_live, missing) * math.comb(num_live - missing, 2)
+
+
+def heads_up_equity(hole_ids: Sequence[int], board_ids: Sequence[int]) -> float:
+    """
+    Exact equity of two hole cards against one random hand
+
+    Every completion of the board is paired with every opponent hand that
+    does not share a card with it, and all of them are scored at once.
+
+    Args:
+        - hole_ids [Sequence{int}]: the player's two hole card ids
+        - board_ids [Sequence{int}]: known community card ids
+
+    Returns:
+        - float: share of the pot won on average (ties count half)
+    """
+    live = live_cards(list(hole_ids) + list(board_ids)).astype(np.int64)
+    missing = 5 - len(board_ids)
+    runouts = np.array(list(itertools.combinations(live.tolist(), missing)), dtype=np.int64).reshape(
+        math.comb(len(live), missing), missing
+    )
+    pairs = np.array(list(itertools.combinations(live.tolist(), 2)), dtype=np.int64)
+
+    boards = np.empty((len(runouts), 5), dtype=np.int64)
+    boards[:, :len(board_ids)] = board_ids
+    boards[:, len(board_ids):] = runouts
+    mine = evaluate_boards(np.broadcast_to(np.array(hole_ids, dtype=np.int64), (len(runouts), 1, 2)), boards)[:, 0]
+
+    clashes = (pairs[None, :, :, None] == runouts[:, None, None, :]).any(axis=(2, 3))
+    runout_rows, pair_rows = np.nonzero(~clashes)
+    theirs = evaluate_boards(pairs[pair_rows][:, None, :], boards[runout_rows])[:, 0]
+    ours = mine[runout_rows]
+    return float(np.mean((ours > theirs) + 0.5 * (ours == theirs)))
+
+
+class EquityOracle:
+    """
+    Equity of hole cards against random opponents, within a time budget
+
+    Args:
+        - num_opponents [int]: random hands the player is up against
+        - latency_budget [float]: seconds allowed to one query (no limit if
+          None: Monte Carlo then always runs max_samples, so seeded queries
+          are reproducible)
+        - max_samples [int]: Monte Carlo run-outs per query at most
+        - tiers [Sequence{str}]: sources to try, in order (see ORACLE_TIERS)
+        - rng [np.random.Generator]: random source of the Monte Carlo tier
+        - use_cache [bool]: reuse and store answers in EQUITY_CACHE
+    """
+
+    def __init__(self, num_opponents: int = 1, latency_budget: Optional[float] = DEFAULT_LATENCY_BUDGET,
+                 max_samples: int = DEFAULT_MAX_SAMPLES, tiers: Sequence[str] = ORACLE_TIERS,
+                 rng: Optional[np.random.Generator] = None, use_cache: bool = True):
+        unknown = [tier for tier in tiers if tier not in ORACLE_TIERS]
+        if unknown:
+            raise ValueError(f"Unknown oracle tier: {unknown[0]} (expected one of {', '.join(ORACLE_TIERS)})")
+        self.num_opponents = num_opponents
+        self.latency_budget = latency_budget
+        self.max_samples = max_samples
+        self.tiers = tuple(tiers)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.use_cache = use_cache
+        self._sample_seconds = MC_SAMPLE_SECONDS
+
+    def query(self, hole_ids: Sequence[int], board_ids: Sequence[int],
+              num_opponents: Optional[int] = None) -> Optional[Tuple[float, str]]:
+        """
+        Estimate the equity of hole cards on a board
+
+        Args:
+            - hole_ids [Sequence{int}]: the player's two hole card ids
+            - board_ids [Sequence{int}]: known community card ids
+            - num_opponents [int]: random hands the player is up against
+              (the oracle's num_opponents if None)
+
+        Returns:
+            - Tuple{float, str}: (equity, source), where source is 'cache' or
+              the tier that answered, or None if no tier fit in the budget
+        """
+        deadline = time.perf_counter() + self.latency_budget if self.latency_budget is not None else math.inf
+        num_opponents = num_opponents if num_opponents is not None else self.num_opponents
+        key = None
+        if self.use_cache:
+            key = ("oracle_exact", canonical_key([list(hole_ids)], list(board_ids)), num_opponents)
+            equity = EQUITY_CACHE.get(key)
+            if equity is not None:
+                return equity, "cache"
+
+        for tier in self.tiers:
+            if time.perf_counter() >= deadline:
+                break
+            if tier == "preflop":
+                equity = self._preflop(hole_ids, board_ids, num_opponents)
+            elif tier == "exact":
+                equity = self._exact(hole_ids, board_ids, num_opponents, deadline)
+            else:
+                equity = self._monte_carlo(hole_ids, board_ids, num_opponents, deadline)
+            if equity is not None:
+                # Only exact answers are stored: they do not depend on the budget
+                if key is not None and tier == "exact":
+                    EQUITY_CACHE.put(key, equity)
+                return equity, tier
+        return None
+
+    def _preflop(self, hole_ids: Sequence[int], board_ids: Sequence[int], num_opponents: int) -> Optional[float]:
+        if board_ids or num_opponents + 1 > MAX_PLAYERS:
+            return None
+        return preflop_equity(hole_ids, num_opponents + 1)
+
+    def _exact(self, hole_ids: Sequence[int], board_ids: Sequence[int], num_opponents: int,
+               deadline: float) -> Optional[float]:
+        if num_opponents != 1 or len(board_ids) < 4:
+            return None
+        cost = count_heads_up_rows(hole_ids, board_ids) * EXACT_SECONDS_PER_ROW
+        if time.perf_counter() + cost > deadline:
+            return None
+        return heads_up_equity(hole_ids, board_ids)
+
+    def _monte_carlo(self, hole_ids: Sequence[int], board_ids: Sequence[int], num_opponents: int,
+                     deadline: float) -> Optional[float]:
+        players = [list(hole_ids)] + [[] for _ in range(num_opponents)]
+        equity = 0.0
+        samples = 0
+        while samples < self.max_samples:
+            start = time.perf_counter()
+            remaining = deadline - start
+            if remaining <= 0:
+                break
+            # Size the chunk to the time left; the first one runs even if the estimate says it is too slow
+            fitting = remaining / self._sample_seconds
+            size = int(min(MC_CHUNK_SIZE, self.max_samples - samples, fitting))
+            if size < MC_MIN_CHUNK_SIZE:
+                if samples:
+                    break
+                size = min(MC_MIN_CHUNK_SIZE, self.max_samples)
+            tally = simulate_equity(players, list(board_ids), size, self.rng)
+            equity += float(tally.equity[0])
+            samples += size
+            # Smoothed time per run-out, capped so that one slow chunk (cold
+            # start, GC pause) cannot make a minimum chunk look over budget
+            measured = (time.perf_counter() - start) / size
+            self._sample_seconds = 0.5 * self._sample_seconds + 0.5 * measured
+            if self.latency_budget is not None:
+                self._sample_seconds = min(self._sample_seconds, self.latency_budget / MC_MIN_CHUNK_SIZE)
+        return equity / samples if samples else None
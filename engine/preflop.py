@@ -0,0 +1,257 @@
+"""
+Precomputed preflop equity of the 169 starting-hand classes.
+
+Up to suit symmetry there are only 169 distinct starting hands: 13 pairs,
+78 suited and 78 offsuit combinations. Their equity against 1 to 8 random
+opponents is simulated once by an offline builder, saved next to the
+evaluator tables as a versioned .npy file and memory-mapped on the first
+query, so a preflop lookup is a class computation plus one array read.
+
+Build the table with:
+
+    python -m engine.preflop --simulations 50000 --backend process --workers 8
+"""
+import argparse
+import os
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.executor import BACKENDS, ExecutionBackend, Shard, new_master_seed, run_shards, shard_rng
+from engine.hand_evaluator import TABLES_DIR
+from engine.monte_carlo import DEFAULT_CHUNK_SIZE, simulate_equity
+
+RANK_CHARS = "23456789TJQKA"
+
+NUM_CLASSES = 169
+MIN_PLAYERS = 2
+MAX_PLAYERS = 9
+
+PREFLOP_VERSION = 1
+
+# Run-outs simulated per (class, table size) entry by default
+DEFAULT_PREFLOP_SIMULATIONS = 50000
+
+_NOT_LOADED = object()
+_PREFLOP_TABLE = _NOT_LOADED
+# (lowest, highest) equity of each table size, computed when the table loads
+_PREFLOP_BOUNDS: List[Tuple[float, float]] = []
+
+
+def hand_class(card_ids: Sequence[int]) -> int:
+    """
+    Get the starting-hand class of two hole cards
+
+    Classes index a 13x13 grid: row * 13 + column, where the row is the
+    higher rank for suited hands and pairs and the lower rank for offsuit
+    hands.
+
+    Args:
+        - card_ids [Sequence{int}]: the two hole card ids
+
+    Returns:
+        - int: class between 0 and 168
+    """
+    first, second = card_ids
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if (first & 3) == (second & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(index: int) -> str:
+    """Short name of a starting-hand class, e.g. 'AKs', 'T9o' or '77'"""
+    row, column = divmod(index, 13)
+    if row == column:
+        return RANK_CHARS[row] * 2
+    if row > column:
+        return f"{RANK_CHARS[row]}{RANK_CHARS[column]}s"
+    return f"{RANK_CHARS[column]}{RANK_CHARS[row]}o"
+
+
+def class_representative(index: int) -> List[int]:
+    """
+    Get one pair of hole card ids belonging to a starting-hand class
+
+    Args:
+        - index [int]: starting-hand class
+
+    Returns:
+        - List{int}: two card ids
+    """
+    row, column = divmod(index, 13)
+    if row > column:
+        return [row * 4, column * 4]
+    return [row * 4, column * 4 + 1]
+
+
+def preflop_shard(context: Tuple, shard: Shard) -> Tuple[int, int, float]:
+    """
+    Shard function simulating one entry of the preflop table
+
+    Args:
+        - context [Tuple]: (num_simulations, chunk_size)
+        - shard [Shard]: (master_seed, shard_index, num_players, class_index)
+
+    Returns:
+        - Tuple{int, int, float}: (num_players, class_index, equity)
+    """
+    num_simulations, chunk_size = context
+    master_seed, shard_index, num_players, index = shard
+    hole_ids = [class_representative(index)] + [[] for _ in range(num_players - 1)]
+    tally = simulate_equity(hole_ids, [], num_simulations, shard_rng(master_seed, shard_index), chunk_size)
+    return num_players, index, float(tally.equity[0] / num_simulations)
+
+
+def build_preflop_table(num_simulations: int = DEFAULT_PREFLOP_SIMULATIONS,
+                        backend: Optional[ExecutionBackend] = None, seed: Optional[int] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Simulate the equity of every starting-hand class against random opponents
+
+    Every (table size, class) entry is an independent seed-addressed shard,
+    so the build spreads over any execution backend.
+
+    Args:
+        - num_simulations [int]: run-outs per entry
+        - backend [ExecutionBackend]: where to run the entries (serial if None)
+        - seed [int]: master seed (a random one if None)
+        - chunk_size [int]: maximum run-outs held in memory at once
+
+    Returns:
+        - table [np.ndarray]: float32 array of shape (MAX_PLAYERS + 1, 169)
+          indexed by number of players and class (rows below MIN_PLAYERS are NaN)
+    """
+    backend = backend if backend is not None else ExecutionBackend("serial")
+    seed = seed if seed is not None else new_master_seed()
+    entries = [(num_players, index) for num_players in range(MIN_PLAYERS, MAX_PLAYERS + 1)
+               for index in range(NUM_CLASSES)]
+    shards = [(seed, shard_index, num_players, index)
+              for shard_index, (num_players, index) in enumerate(entries)]
+
+    table = np.full((MAX_PLAYERS + 1, NUM_CLASSES), np.nan, dtype=np.float32)
+
+    def store(result: Tuple[int, int, float]) -> None:
+        num_players, index, equity = result
+        table[num_players, index] = equity
+
+    run_shards(backend, preflop_shard, (num_simulations, chunk_size), shards, store)
+    return table
+
+
+def _preflop_path(directory: str) -> str:
+    return os.path.join(directory, f"preflop_equity_v{PREFLOP_VERSION}.npy")
+
+
+def save_preflop_table(table: np.ndarray, directory: str = TABLES_DIR) -> str:
+    """
+    Persist a preflop table where load_preflop_table finds it
+
+    Args:
+        - table [np.ndarray]: table from build_preflop_table
+        - directory [str]: folder holding the persisted tables
+
+    Returns:
+        - str: path of the written file
+    """
+    global _PREFLOP_TABLE
+    path = _preflop_path(directory)
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file first so concurrent loaders never see a partial table
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.asarray(table, dtype=np.float32))
+    os.replace(tmp_path, path)
+    _PREFLOP_TABLE = _NOT_LOADED
+    return path
+
+
+def load_preflop_table(directory: str = TABLES_DIR) -> Optional[np.ndarray]:
+    """
+    Memory-map the persisted preflop table
+
+    Args:
+        - directory [str]: folder holding the persisted tables
+
+    Returns:
+        - np.ndarray: table of shape (MAX_PLAYERS + 1, 169), or None if it was never built
+    """
+    try:
+        table = np.load(_preflop_path(directory), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return table if table.shape == (MAX_PLAYERS + 1, NUM_CLASSES) else None
+
+
+def _load_global_table() -> None:
+    """Load the table queried by preflop_equity, with the bounds of every row"""
+    global _PREFLOP_TABLE, _PREFLOP_BOUNDS
+    table = load_preflop_table()
+    _PREFLOP_BOUNDS = [] if table is None else [
+        (float(row.min()), float(row.max())) if num_players >= MIN_PLAYERS else (np.nan, np.nan)
+        for num_players, row in enumerate(table)
+    ]
+    _PREFLOP_TABLE = table
+
+
+def preflop_equity(card_ids: Sequence[int], num_players: int = 2) -> Optional[float]:
+    """
+    Look up the equity of two hole cards against random opponents
+
+    Args:
+        - card_ids [Sequence{int}]: the two hole card ids
+        - num_players [int]: players at the table, between 2 and 9
+
+    Returns:
+        - float: probability-weighted share of the pot, or None if the table
+          was never built or the table size is not covered
+    """
+    if _PREFLOP_TABLE is _NOT_LOADED:
+        _load_global_table()
+    if _PREFLOP_TABLE is None or not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+        return None
+    return _PREFLOP_TABLE.item(num_players, hand_class(card_ids))
+
+
+def preflop_rank(card_ids: Sequence[int], num_players: int = 2) -> Optional[float]:
+    """
+    Place two hole cards between the weakest and the strongest starting hand
+
+    Equity ranges differ with the table size (heads-up roughly 0.3 to 0.85),
+    so callers with thresholds on another scale rescale this position
+    instead of the raw equity.
+
+    Args:
+        - card_ids [Sequence{int}]: the two hole card ids
+        - num_players [int]: players at the table, between 2 and 9
+
+    Returns:
+        - float: 0 for the weakest class and 1 for the strongest, or None if
+          the table was never built or the table size is not covered
+    """
+    equity = preflop_equity(card_ids, num_players)
+    if equity is None:
+        return None
+    low, high = _PREFLOP_BOUNDS[num_players]
+    return (equity - low) / (high - low) if high > low else 0.5
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build and save the preflop table from the command line"""
+    parser = argparse.ArgumentParser(description="Build the preflop equity table of the 169 starting hands")
+    parser.add_argument("--simulations", type=int, default=DEFAULT_PREFLOP_SIMULATIONS,
+                        help="run-outs per (table size, hand class) entry")
+    parser.add_argument("--backend", choices=BACKENDS, default="process")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    table = build_preflop_table(args.simulations, ExecutionBackend(args.backend, args.workers), args.seed)
+    path = save_preflop_table(table)
+    print(f"Preflop table written to {path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
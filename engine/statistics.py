@@ -0,0 +1,110 @@
+"""
+Streaming statistics with exact parallel merges.
+
+RunningStats keeps, for each of a fixed number of columns (one per player),
+the count, mean, sum of squared deviations (M2), minimum and maximum of the
+values seen so far. Blocks of observations are folded in with Welford's
+update generalised to batches (Chan et al.), and two accumulators built on
+different threads or processes merge to exactly the statistics of their
+union. Memory stays O(columns) however many values are added.
+"""
+from typing import List, Tuple
+
+import numpy as np
+from scipy import stats
+
+
+class RunningStats:
+    """
+    Per-column running count, mean, M2, min and max
+
+    Args:
+        - num_columns [int]: number of independent columns (e.g. players)
+    """
+
+    def __init__(self, num_columns: int):
+        self.count = 0
+        self.mean = np.zeros(num_columns, dtype=np.float64)
+        self.m2 = np.zeros(num_columns, dtype=np.float64)
+        self.min = np.full(num_columns, np.inf)
+        self.max = np.full(num_columns, -np.inf)
+
+    def add_batch(self, values: np.ndarray) -> 'RunningStats':
+        """
+        Fold a block of observations in
+
+        Args:
+            - values [np.ndarray]: array of shape (N, num_columns)
+
+        Returns:
+            - RunningStats: self, for chaining
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return self
+        batch = RunningStats(values.shape[1])
+        batch.count = len(values)
+        batch.mean = values.mean(axis=0)
+        batch.m2 = ((values - batch.mean) ** 2).sum(axis=0)
+        batch.min = values.min(axis=0)
+        batch.max = values.max(axis=0)
+        return self.merge(batch)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        Combine another accumulator into this one
+
+        Args:
+            - other [RunningStats]: accumulator over the same columns
+
+        Returns:
+            - RunningStats: self, for chaining
+        """
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / total)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.count = total
+        return self
+
+    @property
+    def total(self) -> np.ndarray:
+        """Sum of the values of each column"""
+        return self.mean * self.count
+
+    def variance(self, ddof: int = 1) -> np.ndarray:
+        """
+        Variance of each column
+
+        Args:
+            - ddof [int]: delta degrees of freedom (1 for the sample variance)
+
+        Returns:
+            - np.ndarray: variances, zero while there are too few values
+        """
+        if self.count <= ddof:
+            return np.zeros_like(self.m2)
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Standard deviation of each column"""
+        return np.sqrt(self.variance(ddof))
+
+    def confidence_intervals(self, confidence: float = 0.95) -> List[Tuple[float, float]]:
+        """
+        Student-t confidence interval of the mean of each column
+
+        Args:
+            - confidence [float]: confidence level
+
+        Returns:
+            - List{Tuple{float, float}}: (low, high) bounds per column
+        """
+        if self.count < 2:
+            return [(float(mean), float(mean)) for mean in self.mean]
+        half_width = stats.t.ppf((1 + confidence) / 2, self.count - 1) * self.std() / np.sqrt(self.count)
+        return [(float(mean - half), float(mean + half)) for mean, half in zip(self.mean, half_width)]
@@ -1,18 +1,127 @@
-from dataclasses import dataclass
-from typing import Literal
+from typing import Iterable, List, Literal, Tuple
 
 SuitType = Literal['Hearts', 'Diamonds', 'Clubs', 'Spades']
 ValueType = Literal['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 
+SUITS: Tuple[str, ...] = ('Hearts', 'Diamonds', 'Clubs', 'Spades')
+VALUES: Tuple[str, ...] = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+
+
 class Card:
-    def __init__(self, suit, value):
-        self.suit = suit
-        self.value = value
-    
+    """
+    Immutable playing card encoded as an integer between 0 and 51.
+
+    The integer id is ``rank * 4 + suit_id`` where rank goes from 0 (deuce)
+    to 12 (ace). Only 52 instances ever exist: ``Card('Hearts', 'A')`` always
+    returns the same object, so cards can be compared by id, hashed and
+    shared freely between decks, hands and threads.
+
+    Attributes:
+        - id [int]: card index between 0 and 51
+        - rank [int]: 0 (deuce) to 12 (ace)
+        - suit_id [int]: 0 (Hearts) to 3 (Spades)
+        - mask [int]: 1 << id, used to build 52-bit card sets
+        - rank_mask [int]: 1 << rank, used to build 13-bit rank sets
+        - suit [str]: suit name, kept for display
+        - value [str]: value name, kept for display
+    """
+    __slots__ = ('id', 'rank', 'suit_id', 'mask', 'rank_mask', 'suit', 'value')
+
+    def __new__(cls, suit: SuitType, value: ValueType):
+        try:
+            return _CARDS_BY_NAME[(suit, str(value))]
+        except KeyError:
+            raise ValueError(f"Invalid card: {value} of {suit}") from None
+
+    @classmethod
+    def from_id(cls, card_id: int) -> 'Card':
+        """
+        Get the interned card for an integer id
+
+        Args:
+            - card_id [int]: card index between 0 and 51
+
+        Returns:
+            - card [Card]: the shared instance for that id
+        """
+        return FULL_DECK[card_id]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card instances are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Card instances are immutable")
+
+    def __reduce__(self):
+        return (Card.from_id, (self.id,))
+
+    def __int__(self):
+        return self.id
+
+    def __index__(self):
+        return self.id
+
     def __str__(self):
         return f"{self.value} of {self.suit}"
-    
+
+    def __repr__(self):
+        return f"Card({self.suit!r}, {self.value!r})"
+
     def __eq__(self, other):
         if isinstance(other, Card):
-            return self.suit == other.suit and self.value == self.value
-        return False
\ No newline at end of file
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return self.id
+
+
+def _build_card(card_id: int) -> Card:
+    """Create one of the 52 interned cards, bypassing the flyweight lookup"""
+    card = object.__new__(Card)
+    rank, suit_id = divmod(card_id, 4)
+    fields = {
+        'id': card_id,
+        'rank': rank,
+        'suit_id': suit_id,
+        'mask': 1 << card_id,
+        'rank_mask': 1 << rank,
+        'suit': SUITS[suit_id],
+        'value': VALUES[rank],
+    }
+    for name, field_value in fields.items():
+        object.__setattr__(card, name, field_value)
+    return card
+
+
+FULL_DECK: Tuple[Card, ...] = tuple(_build_card(card_id) for card_id in range(52))
+_CARDS_BY_NAME = {(card.suit, card.value): card for card in FULL_DECK}
+
+
+def cards_to_ids(cards: Iterable[Card]) -> List[int]:
+    """
+    Convert cards to their integer ids
+
+    Args:
+        - cards [Iterable{Card}]: cards to convert
+
+    Returns:
+        - ids [List{int}]: card ids in the same order
+    """
+    return [card.id for card in cards]
+
+
+def cards_mask(cards: Iterable[Card]) -> int:
+    """
+    Build a 52-bit set with one bit per card
+
+    Args:
+        - cards [Iterable{Card}]: cards to include
+
+    Returns:
+        - mask [int]: bitwise OR of the card masks
+    """
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
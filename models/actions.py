@@ -0,0 +1,4 @@
+# Integer codes of the betting actions in array-based engines (a check is a call of nothing)
+FOLD, CALL, RAISE = 0, 1, 2
+
+ACTION_CODES = {"fold": FOLD, "check": CALL, "call": CALL, "raise": RAISE}
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -24,50 +24,171 @@ class BettingAction:
         self.amount = amount
 
 
+# Raises allowed per street before further raises are treated as calls
+MAX_RAISES_PER_STREET = 4
+
+
+@dataclass
+class BettingState:
+    """
+    Copy of the chips and betting flags of a hand in progress
+
+    Taken by BettingSystem.snapshot and put back by BettingSystem.restore.
+    The betting history is not part of it.
+
+    Attributes:
+        - stacks (List[int]): chips left to each player
+        - current_pot (int): chips in the pot
+        - current_bet (int): bet to match on the street
+        - min_raise (int): smallest raise allowed
+        - current_street (int): BettingRound value of the street
+        - raises_this_street (int): raises made on the street
+        - player_bets (List[int]): chips each player bet on the street
+        - contributions (List[int]): chips each player put in during the hand
+        - folded_players (List[bool]): whether each player folded
+        - all_in_players (List[bool]): whether each player is all-in
+        - raise_streets (List[List[int]]): streets on which each player raised
+    """
+    stacks: List[int]
+    current_pot: int
+    current_bet: int
+    min_raise: int
+    current_street: int
+    raises_this_street: int
+    player_bets: List[int]
+    contributions: List[int]
+    folded_players: List[bool]
+    all_in_players: List[bool]
+    raise_streets: List[List[int]]
+
+
 class BettingSystem:
     def __init__(self, num_players: int, players: List[Player],  initial_stack: int = 1000):
         self.num_players = num_players
+        self.players = players
+        self.initial_stack = initial_stack
         self.small_blind = 5
         self.big_blind = 10
         self.min_raise = self.big_blind
         self.current_pot = 0
         self.current_bet = 0
+        self.current_street = BettingRound.PREFLOP.value
+        self.raises_this_street = 0
         for player in players:
             player.stack = initial_stack
         self.player_bets = [0] * num_players
+        self.contributions = [0] * num_players
         self.betting_history = {}
         self.folded_players = [False] * num_players
+        self.all_in_players = [False] * num_players
+        self.raise_streets = [[] for _ in range(num_players)]
 
-    def start_new_round(self, players: List[Player]):
-        """Start a new betting round"""
+    def start_new_round(self, players: Optional[List[Player]] = None):
+        """
+        Start a new hand: refill the stacks, clear the bets and post the blinds
+
+        Args:
+            - players (List[Player]): players of the hand (the current ones if None)
+        """
+        if players is not None:
+            self.players = players
+        for player in self.players:
+            player.stack = self.initial_stack
         self.current_pot = 0
-        self.current_bet = 0
-        self.player_bets = [0] * self.num_players
+        self.contributions = [0] * self.num_players
         self.folded_players = [False] * self.num_players
+        self.all_in_players = [False] * self.num_players
+        self.raise_streets = [[] for _ in range(self.num_players)]
         self.betting_history = {}
+        self.start_street(BettingRound.PREFLOP)
         self.post_blinds()
 
-    def post_blinds(self, players: List[Player]):
+    def start_street(self, street: BettingRound):
+        """
+        Start the betting of a street: bets are cleared, the pot is kept
+
+        Args:
+            - street (BettingRound): street being played
+        """
+        self.current_street = street.value
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self.raises_this_street = 0
+        self.player_bets = [0] * self.num_players
+        self.betting_history.setdefault(self.current_street, {})
+
+    def post_blinds(self, players: Optional[List[Player]] = None):
         """Post small and big blinds"""
-        # Small blind
-        players[0].stack -= self.small_blind
-        self.player_bets[0] = self.small_blind
-        self.current_pot += self.small_blind
-
-        # Big blind
-        players[1].stack -= self.big_blind
-        self.player_bets[1] = self.big_blind
-        self.current_pot += self.big_blind
+        if players is not None:
+            self.players = players
+        self._commit(0, self.small_blind)
+        self._commit(1 % self.num_players, self.big_blind)
         self.current_bet = self.big_blind
 
-    def handle_action(self, player: Player, player_idx: int, action: str, amount: int = 0) -> bool:
+    def snapshot(self) -> BettingState:
+        """
+        Copy the state of the hand, so it can be played on and put back
+
+        Returns:
+            - BettingState: independent copy of the chips and betting flags
+        """
+        return BettingState(
+            stacks=[player.stack for player in self.players],
+            current_pot=self.current_pot,
+            current_bet=self.current_bet,
+            min_raise=self.min_raise,
+            current_street=self.current_street,
+            raises_this_street=self.raises_this_street,
+            player_bets=self.player_bets[:],
+            contributions=self.contributions[:],
+            folded_players=self.folded_players[:],
+            all_in_players=self.all_in_players[:],
+            raise_streets=[streets[:] for streets in self.raise_streets]
+        )
+
+    def restore(self, state: BettingState):
+        """
+        Put back a state taken by snapshot (the state itself is not shared)
+
+        The betting history restarts empty on the snapshot's street.
+
+        Args:
+            - state (BettingState): state to restore
+        """
+        for player, stack in zip(self.players, state.stacks):
+            player.stack = stack
+        self.current_pot = state.current_pot
+        self.current_bet = state.current_bet
+        self.min_raise = state.min_raise
+        self.current_street = state.current_street
+        self.raises_this_street = state.raises_this_street
+        self.player_bets = state.player_bets[:]
+        self.contributions = state.contributions[:]
+        self.folded_players = state.folded_players[:]
+        self.all_in_players = state.all_in_players[:]
+        self.raise_streets = [streets[:] for streets in state.raise_streets]
+        self.betting_history = {self.current_street: {}}
+
+    def _commit(self, player_idx: int, amount: int) -> int:
+        """Move chips from a player's stack to the pot, going all-in if short"""
+        player = self.players[player_idx]
+        amount = min(amount, player.stack)
+        player.stack -= amount
+        self.player_bets[player_idx] += amount
+        self.contributions[player_idx] += amount
+        self.current_pot += amount
+        if player.stack == 0:
+            self.all_in_players[player_idx] = True
+        return amount
+
+    def handle_action(self, player_idx: int, action: str, amount: int = 0) -> bool:
         """
         Handle a player's betting action
 
         Args:
-            - player_id (int): ID of the player
-            - action (str): Action taken by the player ('fold', 'call', 'raise')
-            - amount (int): Amount to raise (only used if action is 'raise')
+            - player_idx (int): index of the player
+            - action (str): Action taken by the player ('fold', 'check', 'call', 'raise')
+            - amount (int): Amount to raise on top of the current bet (only used if action is 'raise')
 
         Returns:
             - bool: True if action was successful, False otherwise
@@ -75,41 +196,186 @@ class BettingSystem:
         if action not in ['fold', 'call', 'raise', 'check']:
             return False
 
-        # Initialize round history if not exists
-        current_round = len(self.betting_history)
-        if current_round not in self.betting_history:
-            self.betting_history[current_round] = {}
+        round_history = self.betting_history.setdefault(self.current_street, {})
+        to_call = self.current_bet - self.player_bets[player_idx]
 
         if action == 'fold':
-            self.folded_players[player_id] = True
-            self.betting_history[current_round][player_id] = {'action': 'fold', 'amount': 0}
+            self.folded_players[player_idx] = True
+            round_history[player_idx] = {'action': 'fold', 'amount': 0}
             return True
         elif action == 'check':
-            # Can only check if no bet has been made or player has already matched the current bet
-            if self.current_bet > 0 and self.player_bets[player_id] < self.current_bet:
+            # Can only check if the player has already matched the current bet
+            if to_call > 0:
                 return False
-            self.betting_history[current_round][player_id] = {'action': 'check', 'amount': 0}
+            round_history[player_idx] = {'action': 'check', 'amount': 0}
             return True
         elif action == 'call':
-            call_amount = self.current_bet - self.player_bets[player_idx]
-            if call_amount > player.stack:
-                return False
-            player.stack -= call_amount
-            self.player_bets[player_idx] += call_amount
-            self.current_pot += call_amount
-            self.betting_history[current_round][player_id] = {'action': 'call', 'amount': call_amount}
+            # A player who cannot cover the bet calls all-in
+            call_amount = self._commit(player_idx, to_call)
+            round_history[player_idx] = {'action': 'call', 'amount': call_amount}
             return True
         elif action == 'raise':
-            if amount < self.min_raise or amount > player.stack:
+            if not self.can_raise(player_idx, amount):
                 return False
-            player.stack -= amount
-            self.player_bets[player_idx] += amount
-            self.current_pot += amount
-            self.current_bet = self.player_bets[player_id]
+            self._commit(player_idx, to_call + amount)
+            self.current_bet = self.player_bets[player_idx]
             self.min_raise = amount
-            self.betting_history[current_round][player_id] = {'action': 'raise', 'amount': amount}
+            self.raises_this_street += 1
+            self.raise_streets[player_idx].append(self.current_street)
+            round_history[player_idx] = {'action': 'raise', 'amount': amount}
             return True
 
+    def can_raise(self, player_idx: int, amount: int) -> bool:
+        """
+        Check if a player may raise by an amount
+
+        Args:
+            - player_idx (int): index of the player
+            - amount (int): raise on top of the current bet
+
+        Returns:
+            - bool: True if the raise is at least the minimum raise, the street's
+              raise cap is not reached and the player's stack covers it
+        """
+        return (amount >= self.min_raise and self.raises_this_street < MAX_RAISES_PER_STREET
+                and self.get_amount_to_call(player_idx) + amount <= self.players[player_idx].stack)
+
+    def side_pots(self) -> List[Tuple[int, List[int]]]:
+        """
+        Split the pot by contribution level
+
+        Every contribution level forms a pot shared by the live players who
+        reached it. Chips only folded players put in at a level join the pot
+        of the level below.
+
+        Returns:
+            - List[Tuple[int, List[int]]]: (amount, eligible players) of each pot, main pot first
+        """
+        pots = []
+        previous_level = 0
+        for level in sorted(set(c for c in self.contributions if c > 0)):
+            contributors = [i for i in range(self.num_players) if self.contributions[i] >= level]
+            amount = (level - previous_level) * len(contributors)
+            previous_level = level
+            eligible = [i for i in contributors if not self.folded_players[i]]
+            if eligible:
+                pots.append((amount, eligible))
+            elif pots:
+                pots[-1] = (pots[-1][0] + amount, pots[-1][1])
+            else:
+                pots.append((amount, self.get_live_players()))
+        return pots
+
+    def settle(self, strengths: Sequence[Optional[int]]) -> List[int]:
+        """
+        Award the pot, side pot by side pot, to the best live hands
+
+        Ties split a pot evenly (odd chips go to the earliest seats).
+
+        Args:
+            - strengths (Sequence[Optional[int]]): hand strength of each player,
+              higher is better (ignored for folded players)
+
+        Returns:
+            - List[int]: chips paid to each player
+        """
+        payouts = [0] * self.num_players
+        for amount, eligible in self.side_pots():
+            winners = eligible
+            if len(eligible) > 1:
+                best = max(strengths[i] for i in eligible)
+                winners = [i for i in eligible if strengths[i] == best]
+            share, odd_chips = divmod(amount, len(winners))
+            for rank, i in enumerate(winners):
+                payouts[i] += share + (1 if rank < odd_chips else 0)
+        return self._pay(payouts)
+
+    def settle_by_equity(self, equities: Callable[[List[int]], Sequence[float]]) -> List[float]:
+        """
+        Award every pot in proportion to the eligible players' equity
+
+        Used when no decision is left in the hand: paying the expected value
+        instead of dealing the board removes the run-out variance.
+
+        Args:
+            - equities (Callable): maps the eligible players of a pot to their
+              share of it (summing to 1)
+
+        Returns:
+            - List[float]: chips paid to each player
+        """
+        payouts = [0.0] * self.num_players
+        for amount, eligible in self.side_pots():
+            shares = equities(eligible) if len(eligible) > 1 else [1.0]
+            for i, share in zip(eligible, shares):
+                payouts[i] += amount * share
+        return self._pay(payouts)
+
+    def _pay(self, payouts: List) -> List:
+        """Add the payouts to the stacks and empty the pot"""
+        for i, payout in enumerate(payouts):
+            self.players[i].stack += payout
+        self.current_pot = 0
+        return payouts
+
+    def is_action_closed(self) -> bool:
+        """
+        Check if no betting decision is left in the hand
+
+        True when at most one live player can still act and that player has
+        already matched the current bet, e.g. everyone else is all-in.
+
+        Returns:
+            - bool: True if the remaining streets need no decisions
+        """
+        active = [i for i in self.get_live_players() if not self.all_in_players[i]]
+        return len(active) == 0 or (len(active) == 1 and self.get_amount_to_call(active[0]) <= 0)
+
+    def is_active(self, player_idx: int) -> bool:
+        """
+        Check if a player can still act (neither folded nor all-in)
+
+        Args:
+            - player_idx (int): index of the player
+
+        Returns:
+            - bool: True if the player still has decisions to make
+        """
+        return not self.folded_players[player_idx] and not self.all_in_players[player_idx]
+
+    def get_live_players(self) -> List[int]:
+        """
+        Get the players who have not folded
+
+        Returns:
+            - List[int]: indices of the live players
+        """
+        return [i for i in range(self.num_players) if not self.folded_players[i]]
+
+    def get_player_stack(self, player_idx: int) -> int:
+        """
+        Get a player's remaining stack
+
+        Args:
+            - player_idx (int): index of the player
+
+        Returns:
+            - int: Remaining stack of the player
+        """
+        return self.players[player_idx].stack
+
+    def get_amount_to_call(self, player_idx: int) -> int:
+        """
+        Get the chips a player must add to match the current bet
+
+        Args:
+            - player_idx (int): index of the player
+
+        Returns:
+            - int: Amount to call
+        """
+        return self.current_bet - self.player_bets[player_idx]
+
     def get_pot_size(self) -> int:
         """
         Get current pot size
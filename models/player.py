@@ -3,12 +3,9 @@ from typing import Dict, List
 from strategies.BasePokerStrategy import BasePokerStrategy
 from models.Card import Card
 
-@dataclass
-class Player:
-    strategy: BasePokerStrategy
-    player_hands: List[Card]
-    stack: int
-    stats: Dict = field(default_factory=lambda: {
+def new_player_stats() -> Dict:
+    """Create an empty statistics dictionary"""
+    return {
         "hands_dealt": 0,
         "hands_played": 0,
         "hands_won": 0,
@@ -20,7 +17,15 @@ class Player:
             "middle": {"played": 0, "won": 0},
             "late": {"played": 0, "won": 0}
         }
-    })
+    }
+
+
+@dataclass
+class Player:
+    strategy: BasePokerStrategy
+    player_hands: List[Card]
+    stack: int
+    stats: Dict = field(default_factory=new_player_stats)
     
     @property
     def strategy_name(self) -> str:
@@ -0,0 +1,185 @@
+from collections.abc import Mapping
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+POSITIONS = ("early", "middle", "late")
+
+# Column layout of a statistics block: one row per player, one column per counter
+STAT_FIELDS = (
+    "hands_dealt",
+    "hands_played",
+    "hands_won",
+    "total_profit",
+    "bluffs_attempted",
+    "bluffs_successful",
+    "early_played",
+    "early_won",
+    "middle_played",
+    "middle_won",
+    "late_played",
+    "late_won",
+)
+FIELD_INDEX = {name: index for index, name in enumerate(STAT_FIELDS)}
+
+_COUNTER_KEYS = ("hands_dealt", "hands_played", "hands_won", "bluffs_attempted", "bluffs_successful")
+_DICT_KEYS = _COUNTER_KEYS[:3] + ("total_profit",) + _COUNTER_KEYS[3:] + ("position_stats",)
+_POSITION_COLUMNS = np.array([[FIELD_INDEX[f"{position}_played"], FIELD_INDEX[f"{position}_won"]]
+                              for position in POSITIONS])
+
+
+class PlayerStatsBlock:
+    """
+    Fixed-layout statistics of a group of players, backed by one float array
+
+    Every hand updates all rows with a few vectorized operations, and two
+    blocks merge with a single array addition, whatever the number of hands.
+
+    Args:
+        - num_rows (int): number of players (or strategies)
+    """
+
+    def __init__(self, num_rows: int):
+        self.data = np.zeros((num_rows, len(STAT_FIELDS)), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def record_hand(self, won: np.ndarray, profits: np.ndarray, positions: np.ndarray,
+                    bluffs_attempted: np.ndarray, bluffs_successful: np.ndarray) -> None:
+        """
+        Add one hand to every row
+
+        Args:
+            - won (np.ndarray): bool per row, credited with the hand
+            - profits (np.ndarray): chips won or lost per row
+            - positions (np.ndarray): index into POSITIONS per row
+            - bluffs_attempted (np.ndarray): bool per row
+            - bluffs_successful (np.ndarray): bool per row
+        """
+        data = self.data
+        data[:, 0:2] += 1
+        data[:, 2] += won
+        data[:, 3] += profits
+        data[:, 4] += bluffs_attempted
+        data[:, 5] += bluffs_successful
+        rows = np.arange(len(data))
+        columns = _POSITION_COLUMNS[positions]
+        data[rows, columns[:, 0]] += 1
+        data[rows, columns[:, 1]] += won
+
+    def record_hands(self, won: np.ndarray, profits: np.ndarray, positions: np.ndarray,
+                     bluffs_attempted: np.ndarray, bluffs_successful: np.ndarray) -> None:
+        """
+        Add many hands to every row at once
+
+        Args:
+            - won (np.ndarray): bool of shape (num_hands, rows)
+            - profits (np.ndarray): chips won or lost, shape (num_hands, rows)
+            - positions (np.ndarray): index into POSITIONS per row (the same for every hand)
+            - bluffs_attempted (np.ndarray): bool of shape (num_hands, rows)
+            - bluffs_successful (np.ndarray): bool of shape (num_hands, rows)
+        """
+        num_hands = len(won)
+        hands_won = np.sum(won, axis=0)
+        data = self.data
+        data[:, 0:2] += num_hands
+        data[:, 2] += hands_won
+        data[:, 3] += np.sum(profits, axis=0)
+        data[:, 4] += np.sum(bluffs_attempted, axis=0)
+        data[:, 5] += np.sum(bluffs_successful, axis=0)
+        rows = np.arange(len(data))
+        columns = _POSITION_COLUMNS[positions]
+        data[rows, columns[:, 0]] += num_hands
+        data[rows, columns[:, 1]] += hands_won
+
+    def merge(self, other: 'PlayerStatsBlock') -> 'PlayerStatsBlock':
+        """
+        Add another block with the same rows into this one
+
+        Args:
+            - other (PlayerStatsBlock): block to add
+
+        Returns:
+            - PlayerStatsBlock: self, for chaining
+        """
+        self.data += other.data
+        return self
+
+    def copy(self) -> 'PlayerStatsBlock':
+        """Independent copy of the block"""
+        block = PlayerStatsBlock(len(self))
+        block.data[:] = self.data
+        return block
+
+    def reset(self) -> None:
+        """Zero every counter in place, keeping existing views valid"""
+        self.data[:] = 0
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get one counter of every row without copying
+
+        Args:
+            - name (str): one of STAT_FIELDS
+
+        Returns:
+            - np.ndarray: view into the block
+        """
+        return self.data[:, FIELD_INDEX[name]]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Every counter of every row, as zero-copy column views"""
+        return {name: self.data[:, index] for index, name in enumerate(STAT_FIELDS)}
+
+    def row_view(self, row: int) -> 'StatsView':
+        """
+        Get the dictionary-shaped view of one row
+
+        Args:
+            - row (int): row index
+
+        Returns:
+            - StatsView: read-only mapping with the legacy stats layout
+        """
+        return StatsView(self, row)
+
+    def as_dicts(self) -> List[Dict]:
+        """Materialize every row in the legacy nested dictionary layout"""
+        return [dict(self.row_view(row)) for row in range(len(self))]
+
+
+class StatsView(Mapping):
+    """
+    Read-only view of one block row in the legacy nested ``stats`` layout
+
+    Values are read from the block when accessed, so the view always reflects
+    the latest counters and nothing is built until someone looks.
+    """
+
+    def __init__(self, block: PlayerStatsBlock, row: int):
+        self._block = block
+        self._row = row
+
+    def __getitem__(self, key: str):
+        values = self._block.data[self._row]
+        if key == "position_stats":
+            return {
+                position: {"played": int(values[FIELD_INDEX[f"{position}_played"]]),
+                           "won": int(values[FIELD_INDEX[f"{position}_won"]])}
+                for position in POSITIONS
+            }
+        if key == "total_profit":
+            return float(values[FIELD_INDEX[key]])
+        if key in _COUNTER_KEYS:
+            return int(values[FIELD_INDEX[key]])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_DICT_KEYS)
+
+    def __len__(self) -> int:
+        return len(_DICT_KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
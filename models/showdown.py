@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class ShowdownRecord:
+    """
+    Outcome of one hand, computed once when the hand is settled
+
+    Attributes:
+        - strengths (List[Optional[int]]): hand strength of each player evaluated
+          at showdown (None for folded players and hands won without a showdown)
+        - categories (List[Optional[int]]): made-hand category of each player who
+          raised (None for the others)
+        - payouts (List[float]): chips paid to each player
+        - winners (List[bool]): whether each player is credited with the hand
+        - raise_streets (List[List[int]]): streets on which each player raised
+        - went_to_showdown (bool): True if more than one player was live at the end
+    """
+    strengths: List[Optional[int]]
+    categories: List[Optional[int]]
+    payouts: List[float]
+    winners: List[bool]
+    raise_streets: List[List[int]]
+    went_to_showdown: bool
+
+    def raised(self, player_idx: int) -> bool:
+        """
+        Check if a player raised during the hand
+
+        Args:
+            - player_idx (int): index of the player
+
+        Returns:
+            - bool: True if the player raised on any street
+        """
+        return bool(self.raise_streets[player_idx])
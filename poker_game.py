@@ -1,41 +1,229 @@
-from typing import List
-from models.Card import Card
-from models.betting_system import BettingSystem, BettingRound
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+from models.Card import Card, FULL_DECK
+from models.betting_system import BettingRound, BettingState, BettingSystem
 from models.player import Player
-from collections import Counter
+from models.player_stats import POSITIONS, PlayerStatsBlock
+from models.showdown import ShowdownRecord
+from engine.hand_evaluator import (
+    HandState, evaluate_batch, evaluate_boards, evaluate_cards, hand_category, HIGH_CARD, PAIR, THREE_OF_KIND
+)
+from engine.executor import (
+    DECK_STREAM, STRATEGY_STREAM, TIE_BREAK_STREAM, ExecutionBackend, calibrate_shard_size, derive_rng,
+    make_shards, new_master_seed, python_random, run_shards
+)
+from engine.cache import EQUITY_CACHE, canonical_key, canonical_seed
+from engine.preflop import preflop_equity
+from engine.monte_carlo import EquityTally, make_stopping_rule, run_equity, DEFAULT_CHUNK_SIZE, DEFAULT_STAKE
+from engine.statistics import RunningStats
 import random
 import numpy as np
 from scipy import stats
-from concurrent.futures import ThreadPoolExecutor
 from strategies.ConservativeStrategy import ConservativeStrategy
 from strategies.AggressiveStrategy import AggressiveStrategy
 from strategies.BluffingStrategy import BluffingStrategy
 from strategies.TightStrategy import TightStrategy
 from strategies.RandomStrategy import RandomStrategy
+from strategies.hand_features import BoardContext
+
+# Strategies seated in turn around the table
+STRATEGY_CLASSES = (ConservativeStrategy, AggressiveStrategy, BluffingStrategy, TightStrategy, RandomStrategy)
+
+# How a hand with no decisions left is finished: "deal" deals the rest of the
+# board at once, "ev" pays every pot by the live hands' equity
+ALL_IN_MODES = ("deal", "ev")
+
+# Run-out budget of an "ev" settlement; fewer remaining boards are enumerated exactly
+ALL_IN_SIMULATIONS = 20000
+
+# Simulations per task of the "deal" Monte Carlo mode when the run is seeded
+DEAL_SHARD_SIZE = 2000
+
+# Simulations timed before picking the task size of the "deal" mode
+DEAL_CALIBRATION_SIZE = 200
 
 
 class Deck:
+    """
+    Deck of cards backed by a reusable array of card ids
+
+    The live cards are the first ``size`` entries of the array and are dealt
+    from the end. After shuffle, every deal swaps a random live card into the
+    last live slot (one step of a partial Fisher-Yates shuffle), so only the
+    cards actually dealt are shuffled. Dealt and removed cards are recorded
+    in a 64-bit mask, and reset restores the full deck in place.
+    """
+
     def __init__(self):
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        values = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        self.cards = [Card(suit, value) for suit in suits for value in values]
+        self._ids = list(range(52))
+        self._positions = list(range(52))
+        self.size = 52
+        self.dead_mask = 0
+        self._rng = None
+        # Private generator for unseeded shuffles, so decks never share the global one
+        self._own_rng = random.Random()
 
-    def shuffle(self):
-        """This method shuffles the deck of cards"""
-        random.shuffle(self.cards)
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def cards(self) -> List[Card]:
+        """Cards still in the deck"""
+        return [FULL_DECK[card_id] for card_id in self._ids[:self.size]]
+
+    def reset(self):
+        """This method puts every card back in order, without reallocating"""
+        self._ids[:] = _ORDERED_IDS
+        self._positions[:] = _ORDERED_IDS
+        self.size = 52
+        self.dead_mask = 0
+        self._rng = None
+
+    def shuffle(self, rng: Optional[random.Random] = None):
+        """
+        This method shuffles the deck of cards
+
+        The shuffle is lazy: each later deal draws a uniformly random live card.
+
+        Args:
+            - rng [random.Random]: random source (the deck's own one if None)
+        """
+        self._rng = rng or self._own_rng
 
     def deal(self, num_cards):
         """This method deals a specified number of cards from the deck"""
-        return [self.cards.pop() for _ in range(num_cards)]
+        return [FULL_DECK[card_id] for card_id in self.deal_ids(num_cards)]
+
+    def deal_ids(self, num_cards: int) -> List[int]:
+        """
+        This method deals a specified number of card ids from the deck
+
+        Args:
+            - num_cards [int]: cards to deal
+
+        Returns:
+            - List{int}: ids of the dealt cards
+        """
+        if num_cards > self.size:
+            raise IndexError("deal from an exhausted deck")
+        ids, positions = self._ids, self._positions
+        dealt = []
+        for _ in range(num_cards):
+            last = self.size - 1
+            if self._rng is not None:
+                pick = self._rng.randrange(self.size)
+                ids[pick], ids[last] = ids[last], ids[pick]
+                positions[ids[pick]] = pick
+                positions[ids[last]] = last
+            card_id = ids[last]
+            self.size = last
+            self.dead_mask |= 1 << card_id
+            dealt.append(card_id)
+        return dealt
 
     def remove_card(self, target_card):
         """
         This method removes a specific card from the deck.
         """
-        for card in self.cards[:]:
-            if card.suit == target_card.suit and card.value == target_card.value:
-                self.cards.remove(card)
-                return
+        self.remove_id(target_card.id)
+
+    def remove_id(self, card_id: int):
+        """
+        This method removes a card from the deck by id in constant time
+
+        Args:
+            - card_id [int]: id of the card (ignored if already out of the deck)
+        """
+        if self.dead_mask >> card_id & 1:
+            return
+        ids, positions = self._ids, self._positions
+        last = self.size - 1
+        position = positions[card_id]
+        ids[position], ids[last] = ids[last], card_id
+        positions[ids[position]] = position
+        positions[card_id] = last
+        self.size = last
+        self.dead_mask |= 1 << card_id
+
+
+_ORDERED_IDS = tuple(range(52))
+
+
+def deal_shard(context, shard) -> EquityTally:
+    """
+    Shard function of the "deal" Monte Carlo mode
+
+    Plays a block of simulations by dealing each one from a Deck and returns
+    only their aggregate. Tied pots go to a random winner, so ``wins`` holds
+    the pots won and ``ties`` the hands where the player shared the best hand.
+
+    Args:
+        - context [Tuple]: (hole_ids, board_ids) known card ids
+        - shard [Shard]: (master_seed, shard_index, num_simulations)
+
+    Returns:
+        - EquityTally: partial aggregate of the shard
+    """
+    hole_ids, board_ids = context
+    master_seed, shard_index, num_simulations = shard
+    shuffler = python_random(derive_rng(master_seed, shard_index, DECK_STREAM))
+    tie_breaker = derive_rng(master_seed, shard_index, TIE_BREAK_STREAM)
+    known_ids = [card_id for hand in hole_ids for card_id in hand] + list(board_ids)
+
+    holes, boards = [], []
+    sim_deck = Deck()
+    for _ in range(num_simulations):
+        # Reuse one deck, without the cards already in players' hands or community
+        sim_deck.reset()
+        for card_id in known_ids:
+            sim_deck.remove_id(card_id)
+        sim_deck.shuffle(shuffler)
+
+        # Complete the hands and community cards if needed
+        holes.append([hand + sim_deck.deal_ids(2 - len(hand)) for hand in hole_ids])
+        boards.append(board_ids + sim_deck.deal_ids(5 - len(board_ids)))
+
+    hand_strengths = evaluate_boards(np.array(holes, dtype=np.int64), np.array(boards, dtype=np.int64))
+
+    # Randomly select a winner among the players tied for the best hand
+    num_players = len(hole_ids)
+    is_best = hand_strengths == hand_strengths.max(axis=1, keepdims=True)
+    is_tied = is_best & (is_best.sum(axis=1, keepdims=True) > 1)
+    winners = np.argmax(np.where(is_best, tie_breaker.random(is_best.shape), -1.0), axis=1)
+    is_winner = winners[:, None] == np.arange(num_players)
+    wins = is_winner.sum(axis=0)
+
+    return EquityTally(
+        num_simulations=num_simulations,
+        wins=wins,
+        ties=is_tied.sum(axis=0),
+        equity=wins.astype(np.float64),
+        profit=RunningStats(num_players).add_batch(
+            np.where(is_winner, DEFAULT_STAKE * (num_players - 1), -DEFAULT_STAKE)
+        )
+    )
+
+
+@dataclass
+class GameSnapshot:
+    """
+    State of a hand in progress, taken by PokerGame.snapshot at a decision point
+
+    Attributes:
+        - players_hands [List{List{Card}}]: hole cards of each player
+        - community_cards [List{Card}]: board dealt so far
+        - board_context [BoardContext]: analysis of that board (immutable, so shared)
+        - current_round [BettingRound]: street being played
+        - to_act [Tuple{int}]: players left to act on the street after the one deciding
+        - betting [BettingState]: chips and betting flags
+    """
+    players_hands: List[List[Card]]
+    community_cards: List[Card]
+    board_context: BoardContext
+    current_round: BettingRound
+    to_act: Tuple[int, ...]
+    betting: BettingState
 
 
 class PokerGame:
@@ -47,242 +235,487 @@ class PokerGame:
     players: List[Player]
     players_hands: List[List[Card]]
 
-    def __init__(self, num_players: int):
+    def __init__(self, num_players: int, seed: Optional[int] = None, all_in_mode: str = "deal"):
+        if all_in_mode not in ALL_IN_MODES:
+            raise ValueError(f"Unknown all-in mode: {all_in_mode} (expected one of {', '.join(ALL_IN_MODES)})")
         self.num_players = num_players
+        self.all_in_mode = all_in_mode
         self.deck = Deck()
         self.community_cards = []
         self.players_hands = [] 
+        self.hand_states: List[HandState] = []
+        self.board_context = BoardContext.from_ids([])
 
-        # Initialize players with strategies
+        # Initialize players with strategies, cycling through the five styles
         self.players = []
-        strategies = {
-            "Conservative": ConservativeStrategy(),
-            "Aggressive": AggressiveStrategy(),
-            "Bluffing": BluffingStrategy(),
-            "Tight": TightStrategy(),
-            "Random": RandomStrategy()
-        }
-        print(strategies.values())
-        
-        # Initialize players and their hands
-        for strategy in strategies.values():
+        for i in range(num_players):
+            strategy = STRATEGY_CLASSES[i % len(STRATEGY_CLASSES)]()
             player = Player(strategy=strategy, player_hands=[], stack=1000)  # Initialize with a default stack of 1000
             self.players.append(player)
             self.players_hands.append([])
+        self.betting_system = BettingSystem(num_players, self.players)
+        self.current_round = BettingRound.PREFLOP
+        # Seat order of the street and players still to act on it
+        self._seats: List[int] = list(range(num_players))
+        self._to_act: Deque[int] = deque()
+
+        # Statistics live in one array block; each player's stats is a view of its row
+        self.stats = PlayerStatsBlock(num_players)
+        for i, player in enumerate(self.players):
+            player.stats = self.stats.row_view(i)
+        self._position_codes = np.array([POSITIONS.index(self._get_position(i)) for i in range(num_players)])
+        self.last_showdown: Optional[ShowdownRecord] = None
+
+        self.reseed(seed if seed is not None else new_master_seed())
+
+    def reseed(self, master_seed: int, *key: int):
+        """
+        Derive every random stream of the game from a seed
+
+        The deck and each player's strategy get independent streams addressed
+        by (master_seed, *key, stream), so a game replayed from the same seed
+        and key makes the same draws on any thread or process.
+
+        Args:
+            - master_seed [int]: seed of the run
+            - key [int]: path below the master seed (e.g. shard index)
+        """
+        self.seed = master_seed
+        self._deck_rng = python_random(derive_rng(master_seed, *key, DECK_STREAM))
+        for index, player in enumerate(self.players):
+            player.strategy.set_rng(derive_rng(master_seed, *key, STRATEGY_STREAM, index))
+
+    def reset_stats(self):
+        """Clear every player's accumulated statistics"""
+        self.stats.reset()
 
     def simulate_game(self):
         """Simulate a complete game of poker"""
         # Reset and reshuffle deck
-        self.deck = Deck()
-        self.deck.shuffle()
+        self.deck.reset()
+        self.deck.shuffle(self._deck_rng)
         self.betting_system.start_new_round()
         
         # Deal cards to players
         self.players_hands = [self.deck.deal(2) for _ in range(self.num_players)]
         for i, player in enumerate(self.players):
             player.player_hands = self.players_hands[i]
-            
-        self.community_cards = []
+        # Evaluator state of each player, grown in place as the board is dealt
+        self.hand_states = [HandState(card.id for card in hand) for hand in self.players_hands]
 
-        # Game rounds
-        for round_name in [BettingRound.PREFLOP, BettingRound.FLOP, 
-                          BettingRound.TURN, BettingRound.RIVER]:
-            self.current_round = round_name
-            if round_name != BettingRound.PREFLOP:
-                cards_to_deal = 3 if round_name == BettingRound.FLOP else 1
-                self.community_cards.extend(self.deck.deal(cards_to_deal))
-            self._handle_betting_round()
+        self.community_cards = []
+        self.board_context = BoardContext.from_ids([])
+        # Let strategies that look at the whole table (e.g. rollouts) find it
+        for i, player in enumerate(self.players):
+            player.strategy.set_table(self, i)
 
-        # Evaluate hands and determine winner
-        hand_strengths = [self.calculate_hand_score(hand + self.community_cards) 
-                          for hand in self.players_hands]
-        winner = int(np.argmax(hand_strengths))
-        pot_size = self.betting_system.get_pot_size()
-        self.betting_system.player_stacks[winner] += pot_size
+        # Game rounds, ending as soon as a single player is left
+        self.current_round = BettingRound.PREFLOP
+        settled_by_equity = self._play_streets()
+        hand_strengths, payouts, winners = self._settle_hand(settled_by_equity)
+        live_players = self.betting_system.get_live_players()
+        winner = int(np.argmax(payouts))
 
-        # Update player stats
+        # Record the outcome once; every stat update reads from it
+        raise_streets = self.betting_system.raise_streets
+        categories = [None] * self.num_players
         for i in range(self.num_players):
-            self._update_player_stats(i, i == winner)
+            if raise_streets[i]:
+                categories[i] = (hand_category(hand_strengths[i]) if hand_strengths[i] is not None
+                                 else self._made_hand_category(i))
+        self.last_showdown = ShowdownRecord(
+            strengths=hand_strengths,
+            categories=categories,
+            payouts=payouts,
+            winners=winners,
+            raise_streets=[list(streets) for streets in raise_streets],
+            went_to_showdown=len(live_players) > 1
+        )
+
+        # Update every player's stats at once
+        self._update_player_stats()
 
         return {
             "winner": winner,
             "profits": [self.betting_system.get_player_stack(i) - 1000 
                        for i in range(self.num_players)],
             "hand_strengths": hand_strengths,
+            "showdown": self.last_showdown,
             "betting_history": self.betting_system.get_betting_history(),
             "player_stats": [player.stats for player in self.players],
             "strategies": [player.strategy_name for player in self.players]
         }
 
-    def _update_player_stats(self, player_idx, is_winner):
-        """Update player statistics"""
-        player = self.players[player_idx]
-        position = self._get_position(player_idx)
-        profit = self.betting_system.get_player_stack(player_idx) - 1000
-
-        # Update basic stats
-        player.stats["hands_dealt"] += 1
-        player.stats["hands_played"] += 1
-        if is_winner:
-            player.stats["hands_won"] += 1
-        player.stats["total_profit"] += profit
-
-        # Update position stats
-        pos_stats = player.stats["position_stats"][position]
-        pos_stats["played"] += 1
-        if is_winner:
-            pos_stats["won"] += 1
-
-        # Update bluff stats if applicable
-        if self._was_bluff_attempted(player_idx):
-            player.stats["bluffs_attempted"] += 1
-            if self._was_bluff_successful(player_idx):
-                player.stats["bluffs_successful"] += 1
+    def snapshot(self) -> GameSnapshot:
+        """
+        Copy the state of the hand in progress
+
+        Meant to be taken by a strategy inside make_decision: the player
+        deciding is then no longer among the players left to act.
 
-    def calculate_hand_score(self, cards):
-        """Calculate poker hand score"""
-        values = [card.value for card in cards]
-        suits = [card.suit for card in cards]
-        value_counts = Counter(values)
-
-        value_map = {'J': '11', 'Q': '12', 'K': '13', 'A': '14'}
-        numeric_values = [int(value_map.get(v, v)) for v in values]
-        numeric_values.sort()
-
-        if len(set(suits)) == 1 and self.is_straight(numeric_values):
-            return (9, numeric_values)
-        # Four of a kind
-        if 4 in value_counts.values():
-            quad = max(int(value_map.get(k, k)) for k, v in value_counts.items() if v == 4)
-            kicker = max(v for v in numeric_values if v != quad)
-            return (8, [quad, kicker])
-        # Full house
-        if 3 in value_counts.values() and 2 in value_counts.values():
-            trips = max(int(value_map.get(k, k)) for k, v in value_counts.items() if v == 3)
-            pair = max(int(value_map.get(k, k)) for k, v in value_counts.items() if v == 2)
-            return (7, [trips, pair])
-        # Flush
-        if len(set(suits)) == 1:
-            return (6, numeric_values)
-        # Straight
-        if self.is_straight(numeric_values):
-            return (5, numeric_values)
-        # Three of a kind
-        if 3 in value_counts.values():
-            trips = max(int(value_map.get(k, k)) for k, v in value_counts.items() if v == 3)
-            kickers = sorted((v for v in numeric_values if v != trips), reverse=True)
-            return (4, [trips] + kickers)
-        # Two pair
-        if list(value_counts.values()).count(2) == 2:
-            pairs = sorted((int(value_map.get(k, k)) for k, v in value_counts.items() if v == 2), reverse=True)
-            kicker = max(v for v in numeric_values if v not in pairs)
-            return (3, pairs + [kicker])
-        # One pair
-        if 2 in value_counts.values():
-            pair = max(int(value_map.get(k, k)) for k, v in value_counts.items() if v == 2)
-            kickers = sorted((v for v in numeric_values if v != pair), reverse=True)
-            return (2, [pair] + kickers)
-        # High card
-        return (1, numeric_values)
-
-    def is_straight(self, values):
-        if len(values) < 5:
-            return False
-        for i in range(len(values) - 4):
-            if values[i+4] - values[i] == 4:
-                return True
+        Returns:
+            - GameSnapshot: independent copy of the cards, chips and turn order
+        """
+        return GameSnapshot(
+            players_hands=[hand[:] for hand in self.players_hands],
+            community_cards=self.community_cards[:],
+            board_context=self.board_context,
+            current_round=self.current_round,
+            to_act=tuple(self._to_act),
+            betting=self.betting_system.snapshot()
+        )
+
+    def play_from_snapshot(self, snapshot: GameSnapshot, player_idx: int, action: str,
+                           amount: int = 0, deal_seed: Optional[int] = None) -> List[int]:
+        """
+        Play a hand to the end from a snapshot, starting with one player's decision
+
+        The cards the player cannot see are dealt again from this game's deck
+        stream (the other players' hole cards and the rest of the board), so
+        each call is a fresh sample of the hand consistent with what the player
+        knows. The action is applied as in a real hand and this game's
+        strategies make every later decision. Statistics and the last showdown
+        record are left untouched.
+
+        Args:
+            - snapshot [GameSnapshot]: state taken when the player was to act,
+              possibly in another game with as many players
+            - player_idx [int]: player whose decision is played
+            - action [str]: 'fold', 'check', 'call' or 'raise'
+            - amount [int]: raise on top of the current bet, for a raise
+            - deal_seed [int]: seed of the cards dealt, so that calls with the same
+              seed see the same cards (the game's deck stream if None)
+
+        Returns:
+            - List{int}: profit of each player over the hand
+        """
+        betting = self.betting_system
+        betting.restore(snapshot.betting)
+        self.current_round = snapshot.current_round
+        self.community_cards = snapshot.community_cards[:]
+        self.board_context = snapshot.board_context
+
+        board_ids = [card.id for card in self.community_cards]
+        own_hand = snapshot.players_hands[player_idx]
+        self.deck.reset()
+        for card_id in [card.id for card in own_hand] + board_ids:
+            self.deck.remove_id(card_id)
+        self.deck.shuffle(random.Random(deal_seed) if deal_seed is not None else self._deck_rng)
+        self.players_hands = [own_hand[:] if i == player_idx else self.deck.deal(2)
+                              for i in range(self.num_players)]
+        self.hand_states = [HandState([card.id for card in hand] + board_ids) for hand in self.players_hands]
+
+        self._seats = self._street_seats()
+        self._to_act = deque(snapshot.to_act)
+        self._apply_action(player_idx, action, amount)
+        self._settle_hand(self._play_streets(self._to_act))
+        return [betting.get_player_stack(i) - betting.initial_stack for i in range(self.num_players)]
+
+    def _play_streets(self, to_act: Optional[Deque[int]] = None) -> bool:
+        """
+        Play the betting from the current street to the end of the hand
+
+        The hand ends as soon as a single player is left, and skips to the
+        showdown when nobody can act any more (e.g. all-in).
+
+        Args:
+            - to_act [Deque{int}]: players left to act, to resume the current
+              street in progress (the whole table if None)
+
+        Returns:
+            - bool: True if the pots must be paid by equity ("ev" all-in mode)
+        """
+        for round_name in list(BettingRound)[self.current_round.value:]:
+            if round_name != self.current_round:
+                self.current_round = round_name
+                cards_to_deal = 3 if round_name == BettingRound.FLOP else 1
+                self._deal_community(cards_to_deal)
+                self.betting_system.start_street(round_name)
+            self._handle_betting_round(to_act)
+            to_act = None
+            if len(self.betting_system.get_live_players()) == 1:
+                return False
+            # Nobody can act any more (e.g. all-in): fast-forward to the showdown
+            if round_name != BettingRound.RIVER and self.betting_system.is_action_closed():
+                if self.all_in_mode == "ev":
+                    return True
+                self._deal_community(5 - len(self.community_cards))
+                return False
         return False
 
-    def monte_carlo_probability(self, community_cards: List[Card], num_simulations: int, num_threads: int):
+    def _settle_hand(self, settled_by_equity: bool) -> Tuple[List[Optional[int]], List, List[bool]]:
+        """
+        Pay the pots at the end of the hand
+
+        Only the live hands are evaluated at showdown (None for folded players,
+        and for everyone when the hand ended without a showdown).
+
+        Args:
+            - settled_by_equity [bool]: pay every pot by the live hands' equity
+              instead of their strength on the dealt board
+
+        Returns:
+            - Tuple: (hand strengths, payouts, winners) of each player
+        """
+        live_players = self.betting_system.get_live_players()
+        hand_strengths = [None] * self.num_players
+        if settled_by_equity:
+            # Pay every pot by the live hands' equity instead of dealing the board
+            payouts = self.betting_system.settle_by_equity(self._all_in_equities)
+            best = max(payouts)
+            winners = [payout == best for payout in payouts]
+        else:
+            if len(live_players) > 1:
+                for i in live_players:
+                    hand_strengths[i] = self.hand_states[i].strength()
+
+            # Split the pot (and side pots) between the best live hands
+            payouts = self.betting_system.settle(hand_strengths)
+            winners = [payout > 0 for payout in payouts]
+        return hand_strengths, payouts, winners
+
+    def _deal_community(self, num_cards: int):
+        """Deal community cards, adding them to every player's evaluator state and to the board analysis"""
+        cards = self.deck.deal(num_cards)
+        card_ids = [card.id for card in cards]
+        self.community_cards.extend(cards)
+        for state in self.hand_states:
+            state.add_all(card_ids)
+        self.board_context = self.board_context.extend(card_ids)
+
+    def _all_in_equities(self, players: List[int]) -> List[float]:
+        """
+        Get the pot share each player can expect from the current board
+
+        The equity is exact when the remaining boards are few enough (always
+        from the flop on) and sampled otherwise. Each result is memoized in
+        EQUITY_CACHE, and the canonical deal is what gets sampled, with a seed
+        derived from it, so a cached value equals a fresh one in any process.
+
+        Args:
+            - players [List{int}]: live players sharing a pot
+
+        Returns:
+            - List{float}: expected share of the pot of each player, in order
+        """
+        hole_ids = [[card.id for card in self.players_hands[i]] for i in players]
+        board_ids = [card.id for card in self.community_cards]
+        canonical = canonical_key(hole_ids, board_ids)
+        key = ("all_in_equity", canonical)
+
+        def compute() -> EquityTally:
+            *canonical_holes, canonical_board = canonical
+            return run_equity([list(hand) for hand in canonical_holes], list(canonical_board),
+                              ALL_IN_SIMULATIONS, seed=canonical_seed(canonical))
+
+        tally = EQUITY_CACHE.get_or_compute(key, compute)
+        return (tally.equity / tally.num_simulations).tolist()
+
+    def _update_player_stats(self):
+        """Update player statistics from the last showdown record"""
+        bluffs_attempted = np.array([self._was_bluff_attempted(i) for i in range(self.num_players)])
+        self.stats.record_hand(
+            won=np.array(self.last_showdown.winners),
+            profits=np.array([self.betting_system.get_player_stack(i) - 1000 for i in range(self.num_players)]),
+            positions=self._position_codes,
+            bluffs_attempted=bluffs_attempted,
+            bluffs_successful=bluffs_attempted & np.array(self.last_showdown.winners)
+        )
+
+    def calculate_hand_score(self, cards):
+        """
+        Calculate poker hand score
+
+        Args:
+            - cards [List{Card}]: 5, 6 or 7 cards
+
+        Returns:
+            - score [int]: hand strength between 1 and 7462, higher is better
+        """
+        return evaluate_cards(cards)
+
+    def calculate_hand_scores(self, cards: np.ndarray) -> np.ndarray:
+        """
+        Calculate poker hand scores for a batch of hands without a Python loop
+
+        Args:
+            - cards [np.ndarray]: integer card ids of shape (N, 7); 5 or 6 columns also work
+
+        Returns:
+            - scores [np.ndarray]: hand strengths of shape (N,), higher is better
+        """
+        return evaluate_batch(cards)
+
+    def preflop_equities(self) -> List[Optional[float]]:
+        """
+        Look up each player's preflop equity against random opponents
+
+        Reads the precomputed 169-class table (see engine.preflop), so no
+        simulation is run.
+
+        Returns:
+            - List{Optional{float}}: equity per player, None when the hand is
+              unknown or the table was never built
+        """
+        num_players = len(self.players_hands)
+        return [preflop_equity([card.id for card in hand], num_players) if len(hand) == 2 else None
+                for hand in self.players_hands]
+
+    def monte_carlo_probability(self, community_cards: List[Card], num_simulations: int, num_threads: int,
+                                mode: str = "vectorized", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                backend: Optional[str] = None, seed: Optional[int] = None,
+                                shard_size: Optional[int] = None, target_half_width: Optional[float] = None,
+                                time_budget: Optional[float] = None, exhaustive: Optional[bool] = None,
+                                use_cache: bool = True):
         """
         Run Monte Carlo simulations to calculate win probabilities for each player
+
+        Players without known hole cards get random ones in every simulation.
+        Simulations run in shards of many hands; each shard returns only win,
+        tie and profit totals, which are merged here.
+
+        With target_half_width or time_budget set, num_simulations is only an
+        upper bound: shards run in growing batches and the run stops as soon as
+        every win interval is tight enough or the time is up. The
+        "num_simulations" entry of the result holds the simulations actually run.
+
+        When every hole card is known and the remaining boards fit in
+        num_simulations (on any street, preflop included), the vectorized mode
+        enumerates them all and returns exact probabilities with zero-width
+        intervals. With target_half_width or time_budget set, it only does so
+        when the boards fit in one adaptive shard (always from the flop on).
+
+        Exact tallies and seeded runs without a time_budget are memoized in
+        EQUITY_CACHE under the suit-canonical deal, so repeating such a query
+        (or asking an equivalent one) skips the simulation.
         
         Args:
             community_cards: List of community cards already dealt
             num_simulations: Number of simulations to run
-            num_threads: Number of threads to use for parallel processing
+            num_threads: Number of threads or processes to use for parallel processing
+            mode: "vectorized" draws and scores whole chunks of run-outs with NumPy
+                  and splits tied pots; "deal" deals every simulation from a Deck
+                  and gives tied pots to a random winner
+            chunk_size: Maximum number of run-outs held in memory at once
+            backend: "serial", "thread" or "process"
+                     (threads if num_threads > 1 and serial otherwise when None)
+            seed: Master seed of the run (random if None)
+            shard_size: Simulations per task (tuned by a calibration run if None)
+            target_half_width: Stop once every 95% win-probability interval is at most this wide on each side
+            time_budget: Stop after this many seconds
+            exhaustive: Force (True) or forbid (False) exact enumeration in the
+                        vectorized mode (automatic if None)
+            use_cache: Reuse and store the tally in the shared equity cache
             
         Returns:
-            Dictionary with probabilities, confidence intervals, and player stats
+            Dictionary with probabilities, confidence intervals, and player stats;
+            preflop, also "preflop_equities" (see preflop_equities)
         """
-        import random
-        import numpy as np
-        from scipy import stats
-        from concurrent.futures import ThreadPoolExecutor
-        
-        num_players = self.num_players
-        win_counts = [0] * num_players
-        player_profits = [[] for _ in range(num_players)]
-        
-        # Create a copy of the current deck to avoid modifying the original
-        original_deck = self.deck
-        
-        # Function to run a single simulation
-        def run_single_simulation(sim_index):
-            # Create a new deck for this simulation
-            sim_deck = Deck()
-            
-            # Remove cards that are already in players' hands or community
-            for player_hand in self.players_hands:
-                for card in player_hand:
-                    sim_deck.remove_card(card)
-            
-            for card in community_cards:
-                sim_deck.remove_card(card)
-            
-            sim_deck.shuffle()
-            
-            # Complete the community cards if needed
-            remaining_community = 5 - len(community_cards)
-            sim_community_cards = community_cards.copy()
-            if remaining_community > 0:
-                sim_community_cards.extend(sim_deck.deal(remaining_community))
-            
-            # Calculate hand strengths for each player
-            hand_strengths = [self.calculate_hand_score(hand + sim_community_cards) 
-                             for hand in self.players_hands]
-            
-            # Find all players with the maximum hand strength (to handle ties)
-            max_strength = max(hand_strengths)
-            max_indices = [i for i, strength in enumerate(hand_strengths) if strength == max_strength]
-            
-            # Randomly select a winner from players with the highest hand strength
-            winner = random.choice(max_indices)
-            
-            # Calculate profits (simplified)
-            profits = [-10 if i != winner else 10 * (num_players - 1) for i in range(num_players)]
-            
-            return winner, profits, hand_strengths
-        
-        # Run simulations in parallel if num_threads > 1
-        if num_threads > 1 and num_simulations > 1:
-            with ThreadPoolExecutor(max_workers=num_threads) as executor:
-                results = list(executor.map(run_single_simulation, range(num_simulations)))
-                
-                for winner, profits, _ in results:
-                    win_counts[winner] += 1
-                    for i, profit in enumerate(profits):
-                        player_profits[i].append(profit)
+        hole_ids = [[card.id for card in hand] for hand in self.players_hands]
+        board_ids = [card.id for card in community_cards]
+        if backend is None:
+            backend = "thread" if num_threads > 1 else "serial"
+        executor = ExecutionBackend(backend, num_threads)
+
+        if mode not in ("vectorized", "deal"):
+            raise ValueError(f"Unknown Monte Carlo mode: {mode}")
+
+        def simulate() -> EquityTally:
+            if mode == "vectorized":
+                return run_equity(hole_ids, board_ids, num_simulations, executor,
+                                  seed=seed, chunk_size=chunk_size, shard_size=shard_size,
+                                  target_half_width=target_half_width, time_budget=time_budget,
+                                  exhaustive=exhaustive)
+            return self._run_deal_mode(hole_ids, board_ids, num_simulations, executor, seed,
+                                       chunk_size, shard_size, target_half_width, time_budget)
+
+        key = ("monte_carlo", mode, canonical_key(hole_ids, board_ids), num_simulations, seed,
+               chunk_size, shard_size, target_half_width, exhaustive)
+        tally = EQUITY_CACHE.get(key) if use_cache else None
+        if tally is None:
+            tally = simulate()
+            # Only reproducible tallies are stored: unseeded or timed runs differ on every call
+            if use_cache and (tally.exact or (seed is not None and time_budget is None)):
+                EQUITY_CACHE.put(key, tally)
+
+        if mode == "vectorized":
+            results = self._build_probability_results(tally, (tally.wins + tally.ties).tolist())
         else:
-            # Run simulations sequentially
-            for _ in range(num_simulations):
-                winner, profits, _ = run_single_simulation(0)
-                win_counts[winner] += 1
-                for i, profit in enumerate(profits):
-                    player_profits[i].append(profit)
-        
+            results = self._build_probability_results(tally, tally.wins.tolist())
+        if not community_cards:
+            # Reference equity of each known starting hand against random hands, from the preflop table
+            results["preflop_equities"] = self.preflop_equities()
+        return results
+
+    def _run_deal_mode(self, hole_ids: List[List[int]], board_ids: List[int], num_simulations: int,
+                       executor: ExecutionBackend, seed: Optional[int], chunk_size: int,
+                       shard_size: Optional[int], target_half_width: Optional[float],
+                       time_budget: Optional[float]) -> EquityTally:
+        """
+        Run the "deal" Monte Carlo mode, dealing every simulation from a Deck
+
+        Returns:
+            - EquityTally: merged outcome of every simulation
+        """
+        # The clock of the time budget starts before any work, shard sizing included
+        tally = EquityTally.empty(len(hole_ids))
+        should_stop = make_stopping_rule(tally, target_half_width, time_budget)
+
+        context = (hole_ids, board_ids)
+        adaptive = target_half_width is not None or time_budget is not None
+        if shard_size is None:
+            if seed is None and not adaptive:
+                shard_size = calibrate_shard_size(
+                    lambda size: deal_shard(context, (new_master_seed(), 0, size)),
+                    num_simulations, executor.max_workers,
+                    probe_size=DEAL_CALIBRATION_SIZE, max_size=chunk_size
+                )
+            else:
+                # Fixed size for seeded runs; small enough for adaptive ones to check their limits often
+                shard_size = min(DEAL_SHARD_SIZE, chunk_size)
+        seed = seed if seed is not None else new_master_seed()
+
+        run_shards(executor, deal_shard, context, make_shards(seed, num_simulations, shard_size), tally.merge,
+                   should_stop)
+        return tally
+
+    def _build_probability_results(self, tally: EquityTally, hands_won: List[int]) -> Dict:
+        """
+        Build the Monte Carlo result dictionary from an aggregated tally
+
+        Args:
+            - tally [EquityTally]: merged outcome of every simulation
+            - hands_won [List{int}]: hands each player is credited with winning
+
+        Returns:
+            - Dict: probabilities, confidence intervals, player stats and strategies
+        """
+        num_simulations = tally.num_simulations
+
         # Calculate win probabilities
-        win_probabilities = [count / num_simulations for count in win_counts]
+        win_probabilities = [float(equity) / num_simulations if num_simulations > 0 else 0.0
+                             for equity in tally.equity]
         
         # Calculate confidence intervals (95%)
         confidence_intervals = []
-        for i in range(num_players):
+        for i in range(len(win_probabilities)):
+            # Enumerated results are exact
+            if tally.exact:
+                confidence_intervals.append((win_probabilities[i], win_probabilities[i]))
             # Use binomial proportion confidence interval
-            if num_simulations > 0:
+            elif num_simulations > 0:
                 interval = stats.binom.interval(0.95, num_simulations, win_probabilities[i])
                 confidence_intervals.append((interval[0] / num_simulations, interval[1] / num_simulations))
             else:
                 confidence_intervals.append((0, 0))
+
+        # Profit per hand statistics from the streaming accumulator
+        profit_totals = tally.profit.total.tolist()
+        profit_std = tally.profit.std().tolist()
+        if tally.exact:
+            profit_intervals = [(float(mean), float(mean)) for mean in tally.profit.mean]
+        else:
+            profit_intervals = tally.profit.confidence_intervals(0.95)
         
         # Calculate player statistics based on simulation results
         player_stats = []
@@ -290,11 +723,6 @@ class PokerGame:
             # Use actual simulation data for statistics
             hands_dealt = num_simulations
             hands_played = num_simulations  # Assuming all hands are played
-            hands_won = win_counts[i]
-            
-            # Calculate profit statistics
-            profits = player_profits[i]
-            total_profit = sum(profits) if profits else 0
             
             # Generate position-based statistics
             position = self._get_position(i)
@@ -306,71 +734,88 @@ class PokerGame:
             
             # Set the actual position stats
             position_stats[position]["played"] = num_simulations
-            position_stats[position]["won"] = win_counts[i]
+            position_stats[position]["won"] = hands_won[i]
             
             # Get bluff statistics from player object if available
             bluffs_attempted = getattr(player, "stats", {}).get("bluffs_attempted", 0)
             bluffs_successful = getattr(player, "stats", {}).get("bluffs_successful", 0)
             
-            stats = {
+            player_stats.append({
                 "hands_played": hands_played,
-                "hands_won": hands_won,
+                "hands_won": hands_won[i],
+                "hands_tied": int(tally.ties[i]),
                 "hands_dealt": hands_dealt,
-                "total_profit": total_profit,
+                "total_profit": profit_totals[i],
+                "profit_std": profit_std[i],
+                "profit_ci": profit_intervals[i],
                 "bluffs_attempted": bluffs_attempted,
                 "bluffs_successful": bluffs_successful,
                 "position_stats": position_stats
-            }
-            player_stats.append(stats)
+            })
         
         return {
             "probabilities": win_probabilities,
             "confidence_intervals": confidence_intervals,
+            "profit_confidence_intervals": profit_intervals,
+            "num_simulations": num_simulations,
+            "exact": tally.exact,
             "player_stats": player_stats,
             "strategies": [player.strategy_name for player in self.players]
         }
         
-    def _handle_betting_round(self):
-        """Handle a betting round in the poker game"""
-        # Get current player positions
-        positions = [self._get_position(i) for i in range(self.num_players)]
-        
-        # For each player, make a decision based on their strategy
-        for i, player in enumerate(self.players):
-            # Skip players who have folded
-            if self.betting_system.has_folded(i):
+    def _handle_betting_round(self, to_act: Optional[Deque[int]] = None):
+        """
+        Handle a betting round in the poker game
+
+        Players act in turn (after the big blind preflop, from the first seat
+        afterwards) until everyone still able to act has matched the last
+        raise. Folding is turned into a check when there is nothing to call,
+        and a raise that is not allowed becomes a call. The board analysis of
+        the street is shared with every player's strategy.
+
+        Args:
+            - to_act [Deque{int}]: players left to act, to resume a street in
+              progress (every active player in seat order if None)
+        """
+        betting = self.betting_system
+        for player in self.players:
+            player.strategy.set_board_context(self.board_context)
+        self._seats = self._street_seats()
+        self._to_act = to_act if to_act is not None else deque(i for i in self._seats if betting.is_active(i))
+
+        while self._to_act and len(betting.get_live_players()) > 1:
+            i = self._to_act.popleft()
+            if not betting.is_active(i):
                 continue
-                
-            # Get player's hand and current community cards
-            hand = self.players_hands[i]
-            
-            # Get betting context
-            context = {
-                "position": positions[i],
-                "round": self.current_round,
-                "pot_size": self.betting_system.get_pot_size(),
-                "current_bet": self.betting_system.get_current_bet(),
-                "player_stack": self.betting_system.get_player_stack(i),
-                "betting_history": self.betting_system.get_betting_history()
-            }
-            
-            # Get decision from player's strategy
-            pot_size = context["pot_size"]
-            current_bet = context["current_bet"]
-            player_stack = context["player_stack"]
-            
-            # Call make_decision with the correct parameters
-            action, amount = player.strategy.make_decision(hand, self.community_cards, pot_size, current_bet, player_stack)
-            
-            # Apply decision to betting system
-            if action == "fold":
-                self.betting_system.fold(i)
-            elif action == "check":
-                self.betting_system.check(i)
-            elif action == "call":
-                self.betting_system.call(i)
-            elif action == "raise":
-                self.betting_system.raise_bet(i, amount)
+
+            # Get decision from player's strategy, which sizes its call and pot
+            # odds from the chips it still has to put in, not the street's bet level
+            action, amount = self.players[i].strategy.make_decision(
+                self.players_hands[i], self.community_cards, betting.get_pot_size(),
+                betting.get_amount_to_call(i), betting.get_player_stack(i)
+            )
+            self._apply_action(i, action, amount)
+
+    def _apply_action(self, player_idx: int, action: str, amount: int):
+        """Apply a player's decision to the betting system and the turn order"""
+        betting = self.betting_system
+        to_call = betting.get_amount_to_call(player_idx)
+        if action == "raise" and betting.raise_bet(player_idx, max(int(amount), betting.get_min_raise())):
+            # Everyone else who can still act must answer the raise
+            seats = self._seats
+            position = seats.index(player_idx)
+            self._to_act = deque(j for j in seats[position + 1:] + seats[:position] if betting.is_active(j))
+        elif action == "fold" and to_call > 0:
+            betting.fold(player_idx)
+        elif to_call > 0:
+            betting.call(player_idx)
+        else:
+            betting.check(player_idx)
+
+    def _street_seats(self) -> List[int]:
+        """Seats in the order they act on the current street"""
+        first = 2 % self.num_players if self.current_round == BettingRound.PREFLOP else 0
+        return [(first + offset) % self.num_players for offset in range(self.num_players)]
     
     def _get_position(self, player_idx):
         """Get the position of a player (early, middle, late)"""
@@ -381,25 +826,18 @@ class PokerGame:
         else:
             return "late"
     
+    def _made_hand_category(self, player_idx):
+        """Category of the hand a player holds with the cards dealt so far"""
+        if self.community_cards:
+            return hand_category(self.hand_states[player_idx].strength())
+        # Hand ended preflop: only the hole cards are known
+        hand = self.players_hands[player_idx]
+        return PAIR if hand[0].rank == hand[1].rank else HIGH_CARD
+
     def _was_bluff_attempted(self, player_idx):
         """Check if a player attempted to bluff"""
         # Simple implementation - consider it a bluff if player raised with a weak hand
-        hand_score = self.calculate_hand_score(self.players_hands[player_idx] + self.community_cards)
-        betting_history = self.betting_system.get_betting_history()
-        
-        # Check if player raised in any round
-        for round_history in betting_history.values():
-            if player_idx in round_history and round_history[player_idx]["action"] == "raise" and hand_score < 4:
-                return True
-        return False
+        record = self.last_showdown
+        return record.raised(player_idx) and record.categories[player_idx] < THREE_OF_KIND
     
-    def _was_bluff_successful(self, player_idx):
-        """Check if a player's bluff was successful"""
-        # Consider bluff successful if player won with a weak hand
-        hand_score = self.calculate_hand_score(self.players_hands[player_idx] + self.community_cards)
-        hand_strengths = [self.calculate_hand_score(hand + self.community_cards) for hand in self.players_hands]
-        winner = int(np.argmax(hand_strengths))
-        
-        return winner == player_idx and hand_score < 4
-
     # Other necessary methods...
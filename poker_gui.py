@@ -4,7 +4,7 @@ from gui.poker_visualizer import PokerVisualizer
 #from main import PokerSimulator
 # Run simulation in a separate thread to avoid GUI freezing
 import threading
-from poker_simulate import PokerSimulator
+from poker_simulate import PokerSimulator, SimulationConfig
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import ttkbootstrap as ttk
@@ -18,18 +18,9 @@ import plotly.graph_objects as go
 import plotly.io as pio
 import webbrowser
 from typing import Dict
-from dataclasses import dataclass
 import json
 import os
 
-
-@dataclass
-class SimulationConfig:
-    num_players: int = 5
-    num_games: int = 1000
-    num_threads: int = 4
-    sample_games: int = 100
-
 class PokerGUI:
     def __init__(self, root):
         self.root = root
@@ -113,13 +104,25 @@ class PokerGUI:
         threads_frame = ttk.Frame(input_frame)
         threads_frame.pack(side=LEFT, padx=20)
 
-        ttk.Label(threads_frame, text="Number of Threads",
+        ttk.Label(threads_frame, text="Number of Workers",
                   font=("Helvetica", 10, "bold")).pack(anchor=W)
         self.num_threads = ttk.Entry(threads_frame, width=5,
                                      bootstyle="default")
-        self.num_threads.insert(0, "4")
+        self.num_threads.insert(0, str(os.cpu_count() or 4))
         self.num_threads.pack(pady=5)
 
+        # Execution backend selection
+        backend_frame = ttk.Frame(input_frame)
+        backend_frame.pack(side=LEFT, padx=20)
+
+        ttk.Label(backend_frame, text="Backend",
+                  font=("Helvetica", 10, "bold")).pack(anchor=W)
+        self.backend_var = tk.StringVar(value="process")
+        self.backend = ttk.Combobox(backend_frame, textvariable=self.backend_var,
+                                    values=["serial", "thread", "process"],
+                                    width=8, state="readonly")
+        self.backend.pack(pady=5)
+
         # Right side - Action buttons
         button_frame = ttk.Frame(controls)
         button_frame.pack(side=RIGHT, padx=20)
@@ -309,8 +312,9 @@ class PokerGUI:
             self.progress["value"] = 0
             self.status_label.configure(text="Initializing simulation...")
             
-            print(f"{num_games} games will be simulated using {num_threads} threads...")
-            config = SimulationConfig(num_games=num_games, num_threads=num_threads)
+            print(f"{num_games} games will be simulated using {num_threads} {self.backend_var.get()} workers...")
+            config = SimulationConfig(num_players=5, num_games=num_games, num_threads=num_threads,
+                                      backend=self.backend_var.get())
             
             # Update progress periodically during simulation
             def update_progress(step, total_steps):
@@ -1069,7 +1073,7 @@ class PokerGUI:
                     row['Hands Won'],
                     f"{row['Win Rate']:.1%}",
                     f"${row['Avg Profit']:.2f}",
-                    f"${row['Total Profit']:.2f}"
+                    f"${row['Std Dev']:.2f}"
                 )
             )
 
@@ -1188,7 +1192,9 @@ class PokerGUI:
             with open(file_path, 'w') as f:
                 # Add simulation parameters to the results
                 save_data = {
-                    "results": self.current_results,
+                    # The array-backed stats block is already mirrored by player_stats
+                    "results": {key: value for key, value in self.current_results.items()
+                                if key != "stats_block"},
                     "parameters": {
                         "num_games": self.num_games.get(),
                         "num_threads": self.num_threads.get()
@@ -1247,7 +1253,11 @@ class PokerGUI:
                 bootstyle="info-inverse")
 
         ToolTip(self.num_threads,
-                text="Number of parallel processing threads",
+                text="Number of parallel threads or processes",
+                bootstyle="info-inverse")
+
+        ToolTip(self.backend,
+                text="Run simulations serially, on threads or on processes (uses every core)",
                 bootstyle="info-inverse")
 
         ToolTip(self.start_btn,
@@ -1,7 +1,32 @@
-from typing import Dict
+import threading
+import time
+from typing import Dict, Optional
 from poker_game import PokerGame
+from table_batch import TableBatch
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+from engine.executor import ExecutionBackend, calibrate_shard_size, make_shards, new_master_seed, run_shards
+from engine.statistics import RunningStats
+from models.player_stats import PlayerStatsBlock
+
+# Hands per task of the full-game engine when the run is seeded
+GAME_SHARD_SIZE = 500
+
+# Hands played to time the full-game engine before picking the task size
+GAME_CALIBRATION_SIZE = 50
+
+# Hands per task of the lockstep multi-table engine when the run is seeded
+BATCH_SHARD_SIZE = 4096
+
+# Hands played to time the lockstep engine before picking the task size
+BATCH_CALIBRATION_SIZE = 512
+
+# How hands are played: 'game' plays them one at a time with PokerGame,
+# 'batch' plays a whole shard of tables in lockstep with TableBatch
+GAME_ENGINES = ("game", "batch")
+
+# One PokerGame (or TableBatch) per worker thread or process, reused across shards
+_WORKER_GAMES = threading.local()
 
 @dataclass
 class SimulationConfig:
@@ -9,6 +34,123 @@ class SimulationConfig:
     num_games: int = 1000
     num_threads: int = 4
     sample_games: int = 100
+    backend: str = "process"  # 'serial', 'thread' or 'process'
+    seed: Optional[int] = None
+    target_half_width: Optional[float] = None  # stop early once every 95% win CI is this tight
+    time_budget: Optional[float] = None  # stop early after this many seconds
+    all_in_mode: str = "deal"  # 'deal' runs out the board, 'ev' pays all-in pots by equity
+    engine: str = "game"  # 'game' plays hands one by one, 'batch' plays many tables in lockstep
+
+
+@dataclass
+class GameTally:
+    """
+    Aggregated outcome of a number of fully played hands
+
+    Attributes:
+        - num_games [int]: hands played
+        - stats [PlayerStatsBlock]: merged counters of each seat
+        - profit [RunningStats]: streaming statistics of each seat's profit per hand
+        - elapsed [float]: wall time spent playing, in seconds
+    """
+    num_games: int
+    stats: PlayerStatsBlock
+    profit: RunningStats
+    elapsed: float = 0.0
+
+    @classmethod
+    def empty(cls, num_players: int) -> 'GameTally':
+        """Create a tally with no hands"""
+        return cls(0, PlayerStatsBlock(num_players), RunningStats(num_players))
+
+    def merge(self, other: 'GameTally') -> 'GameTally':
+        """
+        Add another tally into this one
+
+        Args:
+            - other [GameTally]: tally over the same seats
+
+        Returns:
+            - GameTally: self, for chaining
+        """
+        self.num_games += other.num_games
+        self.stats.merge(other.stats)
+        self.profit.merge(other.profit)
+        return self
+
+    @property
+    def hands_per_second(self) -> float:
+        """Hands played per second of wall time"""
+        return self.num_games / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _worker_game(num_players: int, all_in_mode: str) -> PokerGame:
+    """Get the PokerGame of the current worker, creating it on first use"""
+    game = getattr(_WORKER_GAMES, "game", None)
+    if game is None or game.num_players != num_players or game.all_in_mode != all_in_mode:
+        game = PokerGame(num_players, all_in_mode=all_in_mode)
+        _WORKER_GAMES.game = game
+    return game
+
+
+def play_games_shard(context, shard) -> GameTally:
+    """
+    Shard function playing one seed-addressed block of full hands
+
+    The worker's PokerGame is reseeded from the shard, so the block plays
+    the same hands whichever worker runs it.
+
+    Args:
+        - context [Tuple]: (num_players, all_in_mode)
+        - shard [Shard]: (master_seed, shard_index, num_games)
+
+    Returns:
+        - GameTally: partial aggregate of the shard
+    """
+    num_players, all_in_mode = context
+    master_seed, shard_index, num_games = shard
+    game = _worker_game(num_players, all_in_mode)
+    game.reseed(master_seed, shard_index)
+    game.reset_stats()
+
+    profits = np.empty((num_games, num_players))
+    for hand in range(num_games):
+        profits[hand] = game.simulate_game()["profits"]
+
+    return GameTally(num_games, game.stats.copy(),
+                     RunningStats(num_players).add_batch(profits))
+
+
+def _worker_batch(num_players: int) -> TableBatch:
+    """Get the TableBatch of the current worker, creating it on first use"""
+    batch = getattr(_WORKER_GAMES, "batch", None)
+    if batch is None or batch.num_players != num_players:
+        batch = TableBatch(num_players)
+        _WORKER_GAMES.batch = batch
+    return batch
+
+
+def play_batch_shard(context, shard) -> GameTally:
+    """
+    Shard function playing one seed-addressed block of hands in lockstep
+
+    Every hand of the block is played at its own table of one TableBatch.
+
+    Args:
+        - context [Tuple]: (num_players, all_in_mode)
+        - shard [Shard]: (master_seed, shard_index, num_games)
+
+    Returns:
+        - GameTally: partial aggregate of the shard
+    """
+    num_players, _ = context
+    master_seed, shard_index, num_games = shard
+    batch = _worker_batch(num_players)
+    batch.reseed(master_seed, shard_index)
+    batch.reset_stats()
+    outcome = batch.play(num_games)
+    return GameTally(num_games, batch.stats.copy(),
+                     RunningStats(num_players).add_batch(outcome.profits))
 
 
 class PokerSimulator:
@@ -20,19 +162,53 @@ class PokerSimulator:
         self.game = PokerGame(self.config.num_players)
         [self.game.deck.deal(2) for _ in range(self.config.num_players)]
 
-    def run_games_batch(self, num_games: int) -> list:
-       """Run a batch of games in a single thread and return the results list."""
-       game = PokerGame(self.config.num_players)
-       batch_results = []
-       for _ in range(num_games):
-           result = game.simulate_game()
-           batch_results.append(result)
-       return batch_results
+    def run_games_batch(self, num_games: int) -> GameTally:
+        """
+        Play full hands, with betting, sharded across the configured workers
+
+        Args:
+            - num_games (int): hands to play
+
+        Returns:
+            - GameTally: merged statistics and the hands per second reached
+        """
+        engine = self.config.engine
+        if engine not in GAME_ENGINES:
+            raise ValueError(f"Unknown game engine: {engine} (expected one of {', '.join(GAME_ENGINES)})")
+        if engine == "batch" and self.config.all_in_mode != "deal":
+            raise ValueError("The batch engine only supports the 'deal' all-in mode")
+        if engine == "batch":
+            shard_fn, default_size, probe_size = play_batch_shard, BATCH_SHARD_SIZE, BATCH_CALIBRATION_SIZE
+        else:
+            shard_fn, default_size, probe_size = play_games_shard, GAME_SHARD_SIZE, GAME_CALIBRATION_SIZE
+
+        backend = ExecutionBackend(self.config.backend, self.config.num_threads)
+        context = (self.config.num_players, self.config.all_in_mode)
+        seed = self.config.seed
+        if seed is None:
+            shard_size = calibrate_shard_size(
+                lambda size: shard_fn(context, (new_master_seed(), 0, size)),
+                num_games, backend.max_workers, probe_size=probe_size
+            )
+            seed = new_master_seed()
+        else:
+            shard_size = default_size
+
+        tally = GameTally.empty(self.config.num_players)
+        start = time.perf_counter()
+        run_shards(backend, shard_fn, context, make_shards(seed, num_games, shard_size), tally.merge)
+        tally.elapsed = time.perf_counter() - start
+        return tally
 
     def simulate(self) -> Dict:
         """
         Run full simulation with Monte Carlo analysis
 
+        Player statistics come from hands played with betting. With the
+        built-in strategies, preflop strengths stay below every calling
+        threshold, so on 2 to 4 seats each hand is folded to the big blind;
+        from 5 seats, the random strategy sees flops in about 30% of hands.
+
         Returns:
             - Dict: Simulation results
         """
@@ -44,13 +220,28 @@ class PokerSimulator:
             results = self.game.monte_carlo_probability(
                 community_cards=[],  # Start with no community cards
                 num_simulations=self.config.num_games,
-                num_threads=self.config.num_threads
+                num_threads=self.config.num_threads,
+                backend=self.config.backend,
+                seed=self.config.seed,
+                target_half_width=self.config.target_half_width,
+                time_budget=self.config.time_budget
             )
             
-            # Gather betting statistics from sample games
-            # TODO: Implement sample games functionality
-            # self.run_sample_games()
-            
+            # Player statistics come from hands actually played, with betting
+            games = self.run_games_batch(self.config.num_games)
+            profit_std = games.profit.std().tolist()
+            profit_intervals = games.profit.confidence_intervals(0.95)
+            player_stats = games.stats.as_dicts()
+            for i, stats in enumerate(player_stats):
+                stats["profit_std"] = profit_std[i]
+                stats["profit_ci"] = profit_intervals[i]
+            results["player_stats"] = player_stats
+            results["stats_block"] = games.stats
+            results["strategies"] = [player.strategy_name for player in self.game.players]
+            results["profit_confidence_intervals"] = profit_intervals
+            results["num_games"] = games.num_games
+            results["hands_per_second"] = games.hands_per_second
+
             return results
 
         except Exception as e:
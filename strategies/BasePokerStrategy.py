@@ -1,28 +1,102 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, List, Dict
-from enum import Enum
+from dataclasses import dataclass
+from typing import Tuple, List, Optional, Sequence
+import numpy as np
 from models.Card import Card
+from models.actions import ACTION_CODES, CALL
+from engine.cache import BOARD_CACHE, FEATURES_CACHE, STRENGTH_CACHE
+from engine.preflop import preflop_rank
+from .hand_features import BoardContext, HandFeatures, HandRank, extract_features
+
+
+@dataclass
+class DecisionBatch:
+    """
+    Many decision points of one strategy, as parallel arrays
+
+    Attributes:
+        - hands [Sequence{List{Card}}]: hole cards of each decision point
+        - community_cards [Sequence{List{Card}}]: board of each decision point
+        - hand_strengths [np.ndarray]: evaluate_hand_strength of each point, between 0 and 1
+        - pot_sizes [np.ndarray]: chips in the pot
+        - current_bets [np.ndarray]: chips the player must add to call
+        - stacks [np.ndarray]: chips left to the player
+        - positions [np.ndarray]: index into models.player_stats.POSITIONS
+    """
+    hands: Sequence[List['Card']]
+    community_cards: Sequence[List['Card']]
+    hand_strengths: np.ndarray
+    pot_sizes: np.ndarray
+    current_bets: np.ndarray
+    stacks: np.ndarray
+    positions: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.hand_strengths)
+
+    @property
+    def pot_odds(self) -> np.ndarray:
+        """Vectorized BasePokerStrategy._calculate_pot_odds"""
+        bets = self.current_bets.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(bets == 0, 0.0, bets / (self.pot_sizes + bets))
+
+
+# Bounds of the heuristic's preflop strengths (a bare high card up to pocket
+# aces), the range the preflop table is rescaled to
+PREFLOP_STRENGTH_RANGE = (HandRank.HIGH_CARD.value / len(HandRank), HandRank.PAIR.value / len(HandRank) + 0.1)
 
 
-class HandRank(Enum):
-    HIGH_CARD = 1
-    PAIR = 2
-    TWO_PAIR = 3
-    THREE_OF_KIND = 4
-    STRAIGHT = 5
-    FLUSH = 6
-    FULL_HOUSE = 7
-    FOUR_OF_KIND = 8
-    STRAIGHT_FLUSH = 9
-    ROYAL_FLUSH = 10
+class BasePokerStrategy(ABC):
+    # Rank starting hands by the precomputed equity table (engine.preflop)
+    # instead of the high-card heuristic; the table is an optional build
+    # artefact, so this is opt-in
+    use_preflop_table: bool = False
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        """
+        Args:
+            rng [np.random.Generator]: private random stream (a fresh one if None)
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.board_context: Optional[BoardContext] = None
+        # Players at the table, set by the engine seating the strategy
+        self.num_players = 2
+
+    def set_board_context(self, context: Optional[BoardContext]) -> None:
+        """
+        Share the street's board analysis with the strategy
 
+        The engine builds one BoardContext per street and hands it to every
+        player; hand evaluations on that board then only add the hole cards.
 
-class BasePokerStrategy(ABC):
-    def __init__(self):
-        self.card_values = {
-            '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
-            '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-        }
+        Args:
+            context [BoardContext]: analysis of the current community cards (None to drop it)
+        """
+        self.board_context = context
+
+    def set_table(self, game, seat: int) -> None:
+        """
+        Tell the strategy which game it plays in, at the start of every hand
+
+        The base class only records the table size; strategies that look at
+        the whole hand (e.g. rollouts) also keep the game to take snapshots
+        of it.
+
+        Args:
+            game [PokerGame]: game being played
+            seat [int]: index of the player using the strategy
+        """
+        self.num_players = game.num_players
+
+    def set_rng(self, rng: np.random.Generator) -> None:
+        """
+        Replace the strategy's random stream
+
+        Args:
+            rng [np.random.Generator]: stream derived from the game's seed
+        """
+        self.rng = rng
 
     @abstractmethod
     def make_decision(self,
@@ -38,7 +112,7 @@ class BasePokerStrategy(ABC):
             hand [List{Card}]: cards that are being played
             community_cards [List{Card}]:
             pot_size [int]:
-            current_bet [int]:
+            current_bet [int]: chips the player must add to call (0 when checking is possible)
             player_stack [int]:
         Returns:
             Tuple [str, int]: (action, amount)
@@ -47,28 +121,144 @@ class BasePokerStrategy(ABC):
         """
         pass
 
-    def evaluate_hand_strength(self, hand: List['Card'], community_cards: List['Card']) -> float:
+    def make_decisions(self, batch: DecisionBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decide at many decision points at once
+
+        This default loops make_decision, so any strategy works with the batch
+        engines; subclasses override it with array operations. Random draws
+        may then be consumed in a different order than by the scalar method,
+        so the decisions match make_decision in distribution, not draw by draw.
+
+        Args:
+            batch [DecisionBatch]: decision points
+
+        Returns:
+            Tuple [np.ndarray, np.ndarray]: (actions, amounts)
+            actions: FOLD, CALL or RAISE codes of models.actions
+            amounts: bet amount if raising
+        """
+        actions = np.empty(len(batch), dtype=np.int64)
+        amounts = np.zeros(len(batch), dtype=np.int64)
+        pot_sizes, current_bets, stacks = (batch.pot_sizes.tolist(), batch.current_bets.tolist(),
+                                           batch.stacks.tolist())
+        for i in range(len(batch)):
+            action, amount = self.make_decision(batch.hands[i], batch.community_cards[i],
+                                                pot_sizes[i], current_bets[i], stacks[i])
+            actions[i] = ACTION_CODES.get(action, CALL)
+            amounts[i] = int(amount)
+        return actions, amounts
+
+    def evaluate_hand_strengths(self, hands: Sequence[List['Card']],
+                                community_cards: Sequence[List['Card']]) -> np.ndarray:
+        """
+        evaluate_hand_strength of many (hand, board) pairs
+
+        Args:
+            hands [Sequence{List{Card}}]:
+            community_cards [Sequence{List{Card}}]: board of each hand
+
+        Returns:
+            strengths [np.ndarray]: float array, between 0 (weakest) and 1 (strongest)
+        """
+        return np.array([self.evaluate_hand_strength(hand, board)
+                         for hand, board in zip(hands, community_cards)], dtype=np.float64)
+
+    def evaluate_hand_strength(self, hand: List['Card'], community_cards: List['Card'],
+                               num_players: Optional[int] = None,
+                               board_context: Optional[BoardContext] = None) -> float:
         """
         Evaluates hand strength on a scale of 0 to 1
 
+        Preflop, with use_preflop_table set and the starting-hand table built,
+        hands are ranked by their table equity, rescaled to the heuristic's
+        preflop range (PREFLOP_STRENGTH_RANGE) so the strategies' thresholds
+        keep their meaning. Results are memoized in STRENGTH_CACHE under the
+        sorted card ids: canonicalizing suits would cost more than the
+        evaluation it saves.
+
         Args:
             hand [List{Card}]:
             community_cards [List{Card}]:
+            num_players [int]: players at the table, for the preflop table
+                               (the strategy's num_players if None)
+            board_context [BoardContext]: analysis of community_cards (the
+                                          strategy's current one if None)
 
         Returns:
             strength [float]: between 0 (weakest) and 1 (strongest)
         """
-        all_cards = hand + community_cards
-        hand_rank = self._get_hand_rank(all_cards)
+        hand_ids = [card.id for card in hand]
+        board_ids = [card.id for card in community_cards]
+        num_players = num_players if num_players is not None else self.num_players
+        # Only preflop table strengths depend on the table size
+        table_size = num_players if self.use_preflop_table and not board_ids else None
+        key = (tuple(sorted(hand_ids)), tuple(sorted(board_ids)), table_size)
+        return STRENGTH_CACHE.get_or_compute(
+            key, lambda: self._compute_hand_strength(hand_ids, board_ids, num_players, board_context)
+        )
+
+    def _compute_hand_strength(self, hand_ids: List[int], board_ids: List[int], num_players: int,
+                               board_context: Optional[BoardContext] = None) -> float:
+        """
+        Uncached body of evaluate_hand_strength
+
+        Args:
+            hand_ids [List{int}]: hole card ids
+            board_ids [List{int}]: community card ids
+            num_players [int]: players at the table (used by the preflop table)
+            board_context [BoardContext]: analysis of the board, if already built
+
+        Returns:
+            strength [float]: between 0 (weakest) and 1 (strongest)
+        """
+        # Already memoized under the strength's own key, so extract directly
+        features = self._extract_features(hand_ids, board_ids, board_context)
+        if features.preflop_class is not None and self.use_preflop_table:
+            rank = preflop_rank(hand_ids, num_players)
+            if rank is not None:
+                low, high = PREFLOP_STRENGTH_RANGE
+                return low + rank * (high - low)
 
         # Base score from hand rank
-        base_score = hand_rank.value / len(HandRank)
+        base_score = features.category.value / len(HandRank)
 
         # Adjust for high cards
-        high_card_bonus = self._calculate_high_card_bonus(hand)
+        high_card_bonus = features.high_card / 12 * 0.1  # 0.1 is the maximum bonus
 
         return min(base_score + high_card_bonus, 1.0)
 
+    def hand_features(self, hand: List['Card'], community_cards: List['Card']) -> HandFeatures:
+        """
+        Extract the features of a hand on a board in a single pass
+
+        Results are memoized in FEATURES_CACHE under the sorted card ids,
+        like evaluate_hand_strength.
+
+        Args:
+            hand [List{Card}]:
+            community_cards [List{Card}]:
+
+        Returns:
+            features [HandFeatures]: made hand, kickers, draws, outs and overcards
+        """
+        hand_ids = [card.id for card in hand]
+        board_ids = [card.id for card in community_cards]
+        return FEATURES_CACHE.get_or_compute(
+            (tuple(sorted(hand_ids)), tuple(sorted(board_ids))), lambda: self._extract_features(hand_ids, board_ids)
+        )
+
+    def _extract_features(self, hand_ids: List[int], board_ids: List[int],
+                          board_context: Optional[BoardContext] = None) -> HandFeatures:
+        """Features of a hand, merged into the analysis of its board"""
+        context = board_context if board_context is not None else self.board_context
+        if context is None or not context.matches(board_ids):
+            if not board_ids:
+                return extract_features(hand_ids, board_ids)
+            # Share the analysis with every other hand seen on this board
+            context = BOARD_CACHE.get_or_compute(tuple(board_ids), lambda: BoardContext.from_ids(board_ids))
+        return context.features(hand_ids)
+
     def _get_hand_rank(self, cards: List['Card']) -> HandRank:
         """
         Method to calculate points of hand 
@@ -79,25 +269,7 @@ class BasePokerStrategy(ABC):
         Returns:
             handRank [HandRank]: points of hand according to its cards
         """
-        if self._is_royal_flush(cards):
-            return HandRank.ROYAL_FLUSH
-        if self._is_straight_flush(cards):
-            return HandRank.STRAIGHT_FLUSH
-        if self._has_four_of_kind(cards):
-            return HandRank.FOUR_OF_KIND
-        if self._is_full_house(cards):
-            return HandRank.FULL_HOUSE
-        if self._is_flush(cards):
-            return HandRank.FLUSH
-        if self._is_straight(cards):
-            return HandRank.STRAIGHT
-        if self._has_three_of_kind(cards):
-            return HandRank.THREE_OF_KIND
-        if self._is_two_pair(cards):
-            return HandRank.TWO_PAIR
-        if self._is_pair(cards):
-            return HandRank.PAIR
-        return HandRank.HIGH_CARD
+        return extract_features([card.id for card in cards], []).category
 
     def _calculate_pot_odds(self, pot_size: int, current_bet: int) -> float:
         """
@@ -137,149 +309,5 @@ class BasePokerStrategy(ABC):
         Returns:
             - high_card_bonus [float]: bonus based on the highest card in hand
         """
-        max_value = max(self.card_values[card.value] for card in hand)
-        return (max_value - 2) / (14 - 2) * 0.1  # 0.1 is the maximum bonus
-
-    # Helper methods for hand evaluation
-    def _is_royal_flush(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand is a Royal Flush
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - is_royal_flush [bool]: True if the hand is a Royal Flush, False otherwise
-        """
-        if len(cards) < 5:
-            return False
-        if not self._is_straight_flush(cards):
-            return False
-        values = [self.card_values[card.value] for card in cards]
-        return max(values) == 14  # Ace high
-
-    def _is_straight_flush(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand is a Straight Flush
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - is_straight_flush [bool]: True if the hand is a Straight Flush, False otherwise
-        """
-        return self._is_straight(cards) and self._is_flush(cards)
-
-    def _has_four_of_kind(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand has Four of a Kind
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - has_four_of_kind [bool]: True if the hand has Four of a Kind, False otherwise
-        """
-        value_counts = self._get_value_counts(cards)
-        return 4 in value_counts.values()
-
-    def _is_full_house(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand is a Full House
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - is_full_house [bool]: True if the hand is a Full House, False otherwise
-        """
-        value_counts = self._get_value_counts(cards)
-        return 3 in value_counts.values() and 2 in value_counts.values()
-
-    def _is_flush(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand is a Flush
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - is_flush [bool]: True if the hand is a Flush, False otherwise
-        """
-        if len(cards) < 5:
-            return False
-        suits = [card.suit for card in cards]
-        return any(suits.count(suit) >= 5 for suit in set(suits))
-
-    def _is_straight(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand is a Straight
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - is_straight [bool]: True if the hand is a Straight, False otherwise
-        """
-        if len(cards) < 5:
-            return False
-        values = sorted(set(self.card_values[card.value] for card in cards))
-        for i in range(len(values) - 4):
-            if values[i+4] - values[i] == 4:
-                return True
-        return False
-
-    def _has_three_of_kind(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand has Three of a Kind
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - has_three_of_kind [bool]: True if the hand has Three of a Kind, False otherwise
-        """
-        value_counts = self._get_value_counts(cards)
-        return 3 in value_counts.values()
-
-    def _is_two_pair(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand has Two Pair
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - is_two_pair [bool]: True if the hand has Two Pair, False otherwise
-        """
-        value_counts = self._get_value_counts(cards)
-        pairs = sum(1 for count in value_counts.values() if count >= 2)
-        return pairs >= 2
-
-    def _is_pair(self, cards: List['Card']) -> bool:
-        """
-        This function checks if the hand has a Pair
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - is_pair [bool]: True if the hand has a Pair, False otherwise
-        """
-        value_counts = self._get_value_counts(cards)
-        return 2 in value_counts.values()
-
-    def _get_value_counts(self, cards: List['Card']) -> Dict[str, int]:
-        """
-        Helper method to count occurrences of each card value
-
-        Args:
-            - cards [List{Card}]: list of cards in hand
-
-        Returns:
-            - value_counts [Dict[str, int]]: dictionary with card values as keys and their counts as values
-        """
-        value_counts = {}
-        for card in cards:
-            value_counts[card.value] = value_counts.get(card.value, 0) + 1
-        return value_counts
+        max_rank = max(card.rank for card in hand)
+        return max_rank / 12 * 0.1  # 0.1 is the maximum bonus
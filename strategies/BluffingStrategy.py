@@ -1,10 +1,12 @@
+import numpy as np
+
+from models.actions import CALL, FOLD, RAISE
 from .BasePokerStrategy import BasePokerStrategy
-import random
 
 
 class BluffingStrategy(BasePokerStrategy):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=None):
+        super().__init__(rng)
 
     def make_decision(self, hand, community_cards, pot_size, current_bet, player_stack):
         """
@@ -21,7 +23,6 @@ class BluffingStrategy(BasePokerStrategy):
             - desicion [String]: raise, call or fold
             - percentage_bet? [float]: ???
         """
-        import random
         hand_strength = self.evaluate_hand_strength(hand, community_cards)
         pot_odds = self._calculate_pot_odds(pot_size, current_bet)
 
@@ -30,7 +31,28 @@ class BluffingStrategy(BasePokerStrategy):
             return 'raise', min(current_bet * 3, player_stack)
         elif hand_strength > 0.5 and pot_odds < 0.4:
             return 'call', current_bet
-        elif random.random() < 0.25 and pot_odds < 0.3:
+        elif self.rng.random() < 0.25 and pot_odds < 0.3:
             return 'raise', min(current_bet * 2, player_stack)  # Bluff more often
         else:
             return 'fold', 0
+
+    def make_decisions(self, batch):
+        """
+        Vectorized make_decision
+
+        Args:
+            - batch: DecisionBatch of decision points
+
+        Returns:
+            - actions [np.ndarray]: FOLD, CALL or RAISE codes
+            - amounts [np.ndarray]: amount to bet or call
+        """
+        strengths, pot_odds = batch.hand_strengths, batch.pot_odds
+        bets, stacks = batch.current_bets, batch.stacks
+        raises = strengths > 0.7
+        calls = (strengths > 0.5) & (pot_odds < 0.4)
+        bluffs = (self.rng.random(len(batch)) < 0.25) & (pot_odds < 0.3)
+        actions = np.select([raises, calls, bluffs], [RAISE, CALL, RAISE], FOLD)
+        amounts = np.select([raises, calls, bluffs],
+                            [np.minimum(bets * 3, stacks), bets, np.minimum(bets * 2, stacks)], 0)
+        return actions, amounts
@@ -1,3 +1,6 @@
+import numpy as np
+
+from models.actions import CALL, FOLD, RAISE
 from .BasePokerStrategy import BasePokerStrategy
 
 
@@ -27,5 +30,24 @@ class ConservativeStrategy(BasePokerStrategy):
         else:  # Fold everything else
             return 'fold', 0
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=None):
+        super().__init__(rng)
+
+    def make_decisions(self, batch):
+        """
+        Vectorized make_decision
+
+        Args:
+            - batch: DecisionBatch of decision points
+
+        Returns:
+            - actions [np.ndarray]: FOLD, CALL or RAISE codes
+            - amounts [np.ndarray]: amount to bet or call
+        """
+        strengths, pot_odds = batch.hand_strengths, batch.pot_odds
+        bets, stacks = batch.current_bets, batch.stacks
+        raises = strengths > 0.85
+        calls = (strengths > 0.7) & (pot_odds < 0.25)
+        actions = np.select([raises, calls], [RAISE, CALL], FOLD)
+        amounts = np.select([raises, calls], [np.minimum(bets * 2, stacks), bets], 0)
+        return actions, amounts
@@ -0,0 +1,128 @@
+import time
+
+from engine.oracle import DEFAULT_LATENCY_BUDGET, DEFAULT_MAX_SAMPLES, ORACLE_TIERS, EquityOracle
+from .BasePokerStrategy import BasePokerStrategy
+from .hand_features import HandRank
+
+# What the strategy uses when the oracle cannot answer within the budget:
+# 'heuristic' takes evaluate_hand_strength as the equity, or the chance of
+# completing a draw if higher, 'fold' gives up unless checking is free
+FALLBACKS = ("heuristic", "fold")
+
+# Outs credited to each overcard of a hand that has not paired yet
+OVERCARD_OUTS = 3
+
+
+class EquityStrategy(BasePokerStrategy):
+    """
+    Strategy comparing the hand's equity with the pot odds
+
+    Equity comes from an EquityOracle (preflop table, exact heads-up
+    enumeration or a short Monte Carlo run) limited to latency_budget
+    seconds per decision.
+
+    Args:
+        - rng: private random stream
+        - num_opponents (int): random hands the equity is computed against
+          (every other seat of the table if None)
+        - latency_budget (float): seconds allowed to each equity query (no
+          limit if None, which makes the strategy's decisions reproducible
+          from its seed)
+        - max_samples (int): Monte Carlo run-outs per query at most
+        - tiers: oracle sources to try, in order
+        - fallback (str): one of FALLBACKS
+        - raise_margin (float): equity above the pot odds (or the fair share
+          of the pot, if higher) needed to raise
+    """
+
+    def __init__(self, rng=None, num_opponents=None, latency_budget=DEFAULT_LATENCY_BUDGET,
+                 max_samples=DEFAULT_MAX_SAMPLES, tiers=ORACLE_TIERS, fallback="heuristic", raise_margin=0.15):
+        super().__init__(rng)
+        if fallback not in FALLBACKS:
+            raise ValueError(f"Unknown fallback: {fallback} (expected one of {', '.join(FALLBACKS)})")
+        self.num_opponents = num_opponents
+        self.oracle = EquityOracle(1, latency_budget, max_samples, tiers, self.rng)
+        self.fallback = fallback
+        self.raise_margin = raise_margin
+        # Where each decision's equity came from, and the time spent deciding
+        self.source_counts = {}
+        self.decisions = 0
+        self.total_latency = 0.0
+        self.last_equity = None
+        self.last_source = None
+        self.last_latency = 0.0
+
+    def set_rng(self, rng):
+        super().set_rng(rng)
+        self.oracle.rng = rng
+
+    def make_decision(self, hand, community_cards, pot_size, current_bet, player_stack):
+        """
+        This function implements the decisions according to the hand's equity and the pot odds
+
+        Args:
+            - hand: list of Cards
+            - community_cards: list of Cards
+            - pot_size: float
+            - current_bet: float
+            - player_stack: float
+
+        Returns:
+            - decision [String]: raise, call or fold
+            - amount [float]: amount to bet or call
+        """
+        start = time.perf_counter()
+        num_opponents = self.num_opponents if self.num_opponents is not None else self.num_players - 1
+        answer = self.oracle.query([card.id for card in hand], [card.id for card in community_cards], num_opponents)
+        if answer is not None:
+            equity, source = answer
+        elif self.fallback == "heuristic":
+            equity, source = self._heuristic_equity(hand, community_cards), "heuristic"
+        else:
+            equity, source = 0.0, "fold"
+
+        pot_odds = self._calculate_pot_odds(pot_size, current_bet)
+        fair_share = 1 / (num_opponents + 1)
+        if equity >= max(pot_odds, fair_share) + self.raise_margin:
+            decision = 'raise', min(max(current_bet * 2, pot_size // 2), player_stack)
+        elif equity >= pot_odds:
+            decision = 'call', current_bet
+        else:
+            decision = 'fold', 0
+
+        self.last_latency = time.perf_counter() - start
+        self.last_equity, self.last_source = equity, source
+        self.source_counts[source] = self.source_counts.get(source, 0) + 1
+        self.decisions += 1
+        self.total_latency += self.last_latency
+        return decision
+
+    def _heuristic_equity(self, hand, community_cards):
+        """
+        Equity estimate used when the oracle cannot answer
+
+        Args:
+            - hand: list of Cards
+            - community_cards: list of Cards
+
+        Returns:
+            - equity [float]: the made hand's strength, or the probability
+              of hitting one of the draw's outs by the river if higher
+        """
+        strength = self.evaluate_hand_strength(hand, community_cards)
+        features = self.hand_features(hand, community_cards)
+        outs = features.outs
+        if features.category is HandRank.HIGH_CARD:
+            outs += OVERCARD_OUTS * features.overcards
+        if not outs:
+            return strength
+        unseen = 52 - len(hand) - len(community_cards)
+        misses = 1.0
+        for dealt in range(5 - len(community_cards)):
+            misses *= (unseen - outs - dealt) / (unseen - dealt)
+        return max(strength, 1.0 - misses)
+
+    @property
+    def mean_latency(self) -> float:
+        """Average seconds spent per decision"""
+        return self.total_latency / self.decisions if self.decisions else 0.0
@@ -1,10 +1,15 @@
+import numpy as np
+
+from models.actions import ACTION_CODES, CALL, RAISE
 from .BasePokerStrategy import BasePokerStrategy
-import random
+
+ACTIONS = ('fold', 'call', 'raise')
+_ACTION_CODES = np.array([ACTION_CODES[action] for action in ACTIONS])
 
 
 class RandomStrategy(BasePokerStrategy):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=None):
+        super().__init__(rng)
 
     def make_decision(self, hand, community_cards, pot_size, current_bet, player_stack):
         """
@@ -21,10 +26,28 @@ class RandomStrategy(BasePokerStrategy):
             - decision [String]: raise, call or fold
             - percentage_bet? [float]: amount to bet or call
         """
-        action = random.choice(['fold', 'call', 'raise'])
+        action = ACTIONS[self.rng.integers(len(ACTIONS))]
         if action == 'fold':
             return 'fold', 0
         elif action == 'call':
             return 'call', current_bet
         elif action == 'raise':
-            return 'raise', min(current_bet * random.randint(2, 5), player_stack)
+            return 'raise', min(current_bet * int(self.rng.integers(2, 6)), player_stack)
+
+    def make_decisions(self, batch):
+        """
+        Vectorized make_decision
+
+        Args:
+            - batch: DecisionBatch of decision points
+
+        Returns:
+            - actions [np.ndarray]: FOLD, CALL or RAISE codes
+            - amounts [np.ndarray]: amount to bet or call
+        """
+        size = len(batch)
+        actions = _ACTION_CODES[self.rng.integers(len(ACTIONS), size=size)]
+        multipliers = self.rng.integers(2, 6, size=size)
+        amounts = np.select([actions == CALL, actions == RAISE],
+                            [batch.current_bets, np.minimum(batch.current_bets * multipliers, batch.stacks)], 0)
+        return actions, amounts
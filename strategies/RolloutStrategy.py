@@ -0,0 +1,151 @@
+import copy
+import time
+
+from .BasePokerStrategy import BasePokerStrategy
+from .ConservativeStrategy import ConservativeStrategy
+
+# Default time allowed to the rollouts of one decision, in seconds
+DEFAULT_TIME_BUDGET = 0.01
+
+# Default cap on the deals played out per decision
+DEFAULT_MAX_ROLLOUTS = 200
+
+
+class RolloutStrategy(BasePokerStrategy):
+    """
+    Strategy playing the hand out many times from each decision
+
+    At every decision the game is snapshotted and played to the end in a
+    private PokerGame: the cards the player cannot see are dealt again and
+    the other seats are played by copies of the table's strategies. Calling
+    and raising are played on the same deals until the time or rollout
+    budget is spent, and the action with the best average profit is taken
+    (folding loses exactly the chips already in the pot).
+
+    Outside a PokerGame (no table set) the rollout policy decides instead.
+
+    Args:
+        - rng: private random stream
+        - time_budget (float): seconds allowed to the rollouts of one decision
+          (no limit if None). Seeded games are then reproducible only if
+          every seat decides from its seed alone: strategies with their own
+          time budget, such as an EquityStrategy with a latency_budget,
+          still vary from run to run
+        - max_rollouts (int): deals played out per decision at most, each
+          once per candidate action
+        - rollout_policy: strategy playing this seat (and any other rollout
+          seat) inside the rollouts
+    """
+
+    def __init__(self, rng=None, time_budget=DEFAULT_TIME_BUDGET, max_rollouts=DEFAULT_MAX_ROLLOUTS,
+                 rollout_policy=None):
+        super().__init__(rng)
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.rollout_policy = rollout_policy if rollout_policy is not None else ConservativeStrategy(self.rng)
+        self.table = None
+        self.seat = None
+        self._rollout_game = None
+        self._table_strategies = ()
+        # Rollouts and time of the last decision, and running totals
+        self.last_rollouts = 0
+        self.last_ev = {}
+        self.last_latency = 0.0
+        self.decisions = 0
+        self.total_rollouts = 0
+        self.total_latency = 0.0
+
+    def set_rng(self, rng):
+        super().set_rng(rng)
+        self.rollout_policy.set_rng(rng)
+
+    def set_table(self, game, seat):
+        super().set_table(game, seat)
+        # The private game copies the table's strategies, so rebuild it when they change
+        strategies = tuple(id(player.strategy) for player in game.players)
+        if game is not self.table or strategies != self._table_strategies:
+            self._rollout_game = None
+            self._table_strategies = strategies
+        self.table, self.seat = game, seat
+
+    def make_decision(self, hand, community_cards, pot_size, current_bet, player_stack):
+        """
+        This function implements the decisions according to the average profit of rollouts
+
+        Args:
+            - hand: list of Cards
+            - community_cards: list of Cards
+            - pot_size: float
+            - current_bet: float
+            - player_stack: float
+
+        Returns:
+            - decision [String]: raise, call or fold
+            - amount [float]: amount to bet or call
+        """
+        if self.table is None:
+            return self.rollout_policy.make_decision(hand, community_cards, pot_size, current_bet, player_stack)
+
+        start = time.perf_counter()
+        snapshot = self.table.snapshot()
+        betting = snapshot.betting
+        seat = self.seat
+        to_call = betting.current_bet - betting.player_bets[seat]
+        raise_amount = int(min(max(current_bet * 2, pot_size // 2), player_stack))
+
+        # Only the actions the betting system would accept are played out
+        candidates = {'call': current_bet}
+        if self.table.betting_system.can_raise(seat, max(raise_amount, betting.min_raise)):
+            candidates['raise'] = raise_amount
+        totals = dict.fromkeys(candidates, 0)
+
+        game = self._get_rollout_game()
+        rollouts = 0
+        while rollouts < self.max_rollouts and (
+                rollouts == 0 or self.time_budget is None or time.perf_counter() - start < self.time_budget):
+            # Every action is played on the same cards
+            deal_seed = int(self.rng.integers(2 ** 63))
+            for action, amount in candidates.items():
+                totals[action] += game.play_from_snapshot(snapshot, seat, action, amount, deal_seed)[seat]
+            rollouts += 1
+
+        ev = {}
+        if to_call > 0:
+            ev['fold'] = betting.stacks[seat] - self.table.betting_system.initial_stack
+        ev.update((action, total / rollouts) for action, total in totals.items())
+        # Ties go to the cheapest action
+        action = max(ev, key=ev.get)
+        decision = (action, candidates[action]) if action != 'fold' else ('fold', 0)
+
+        self.last_latency = time.perf_counter() - start
+        self.last_rollouts = rollouts * len(candidates)
+        self.last_ev = ev
+        self.decisions += 1
+        self.total_rollouts += self.last_rollouts
+        self.total_latency += self.last_latency
+        return decision
+
+    def _get_rollout_game(self):
+        """Private game of the rollouts, with a copy of every table strategy"""
+        if self._rollout_game is None:
+            game = type(self.table)(self.table.num_players, all_in_mode="deal")
+            for rollout_player, player in zip(game.players, self.table.players):
+                strategy = player.strategy
+                if isinstance(strategy, RolloutStrategy):
+                    strategy = strategy.rollout_policy
+                rollout_player.strategy = copy.deepcopy(strategy)
+                rollout_player.strategy.num_players = game.num_players
+            # Seeded from this strategy's stream, so seeded games stay reproducible
+            game.reseed(int(self.rng.integers(2 ** 63)))
+            self._rollout_game = game
+        return self._rollout_game
+
+    @property
+    def mean_latency(self) -> float:
+        """Average seconds spent per decision"""
+        return self.total_latency / self.decisions if self.decisions else 0.0
+
+    @property
+    def mean_rollouts(self) -> float:
+        """Average rollouts played per decision"""
+        return self.total_rollouts / self.decisions if self.decisions else 0.0
@@ -1,9 +1,12 @@
+import numpy as np
+
+from models.actions import CALL, FOLD, RAISE
 from .BasePokerStrategy import BasePokerStrategy
 
 
 class TightStrategy(BasePokerStrategy):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=None):
+        super().__init__(rng)
 
     def make_decision(self, hand, community_cards, pot_size, current_bet, player_stack):
         """
@@ -35,3 +38,24 @@ class TightStrategy(BasePokerStrategy):
             return 'raise', min(current_bet * 2, player_stack)
         else:
             return 'fold', 0
+
+    def make_decisions(self, batch):
+        """
+        Vectorized make_decision
+
+        Args:
+            - batch: DecisionBatch of decision points
+
+        Returns:
+            - actions [np.ndarray]: FOLD, CALL or RAISE codes
+            - amounts [np.ndarray]: amount to bet or call
+        """
+        strengths, pot_odds = batch.hand_strengths, batch.pot_odds
+        bets, stacks = batch.current_bets, batch.stacks
+        raises = strengths > 0.75
+        calls = ((strengths > 0.55) & (pot_odds < 0.4)) | ((strengths > 0.4) & (pot_odds < 0.2))
+        semi_bluffs = (strengths > 0.3) & (pot_odds < 0.15)
+        actions = np.select([raises, calls, semi_bluffs], [RAISE, CALL, RAISE], FOLD)
+        amounts = np.select([raises, calls, semi_bluffs],
+                            [np.minimum(bets * 2, stacks), bets, np.minimum(bets * 2, stacks)], 0)
+        return actions, amounts
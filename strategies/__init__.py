@@ -3,11 +3,23 @@ from .AggressiveStrategy import AggressiveStrategy
 from .BluffingStrategy import BluffingStrategy
 from .TightStrategy import TightStrategy
 from .RandomStrategy import RandomStrategy
+from .EquityStrategy import EquityStrategy
+from .RolloutStrategy import RolloutStrategy
+from .BasePokerStrategy import BasePokerStrategy, DecisionBatch
+from .hand_features import BoardContext, HandFeatures, HandRank, extract_features
 
 __all__ = [
     'ConservativeStrategy',
     'AggressiveStrategy',
     'BluffingStrategy',
     'TightStrategy',
-    'RandomStrategy'
+    'RandomStrategy',
+    'EquityStrategy',
+    'RolloutStrategy',
+    'BasePokerStrategy',
+    'DecisionBatch',
+    'BoardContext',
+    'HandFeatures',
+    'HandRank',
+    'extract_features'
 ]
\ No newline at end of file
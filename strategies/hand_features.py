@@ -0,0 +1,270 @@
+"""
+Single-pass feature extraction of a (hand, board) pair for the strategies.
+
+One loop over the card ids fills rank counts, suit counts and a rank
+bitmask; the made-hand category, kickers, draws, outs and overcards are
+all read from those, instead of each predicate rebuilding its own counts.
+
+Every player at a table sees the same board, so a BoardContext analyses it
+once per street; the features of each hand are then obtained by adding
+its two hole cards to the board's counts.
+"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional, Sequence, Tuple
+
+from engine.preflop import hand_class
+
+
+class HandRank(Enum):
+    HIGH_CARD = 1
+    PAIR = 2
+    TWO_PAIR = 3
+    THREE_OF_KIND = 4
+    STRAIGHT = 5
+    FLUSH = 6
+    FULL_HOUSE = 7
+    FOUR_OF_KIND = 8
+    STRAIGHT_FLUSH = 9
+    ROYAL_FLUSH = 10
+
+
+# Five consecutive ranks, lowest first (the strategies' straights are ace high only)
+_STRAIGHT_MASKS = tuple(0b11111 << low for low in range(9))
+
+# Board textures, from no board to boards where two hole cards can already
+# make a straight or a flush
+BOARD_TEXTURES = ("none", "dry", "drawing", "wet")
+
+
+@dataclass
+class HandFeatures:
+    """
+    Everything the strategies read from a hand and board
+
+    Features only depend on ranks and on how many cards share a suit, so
+    they are the same for every suit relabelling of the cards.
+
+    Attributes:
+        - category [HandRank]: made hand, with the strategies' historical rules
+        - kickers [Tuple{int}]: ranks held once, highest first (at most five)
+        - high_card [int]: highest hole card rank
+        - flush_draw [bool]: four cards of a suit with cards to come
+        - open_ended [bool]: at least two ranks complete a straight
+        - gutshot [bool]: exactly one rank completes a straight
+        - outs [int]: unseen cards completing a straight or a flush
+        - overcards [int]: hole cards ranked above every board card
+        - preflop_class [int]: starting-hand class when there is no board, else None
+    """
+    category: HandRank
+    kickers: Tuple[int, ...]
+    high_card: int
+    flush_draw: bool
+    open_ended: bool
+    gutshot: bool
+    outs: int
+    overcards: int
+    preflop_class: Optional[int]
+
+    @property
+    def has_draw(self) -> bool:
+        """True if a flush or straight draw is open"""
+        return self.flush_draw or self.open_ended or self.gutshot
+
+
+def _has_straight(rank_mask: int) -> bool:
+    for mask in _STRAIGHT_MASKS:
+        if rank_mask & mask == mask:
+            return True
+    return False
+
+
+@dataclass
+class BoardContext:
+    """
+    Analysis of the community cards shared by every player on a street
+
+    Attributes:
+        - board_ids [Tuple{int}]: community card ids
+        - rank_counts [Tuple{int}]: board cards of each rank
+        - suit_counts [Tuple{int}]: board cards of each suit
+        - rank_mask [int]: bit r set when the board holds rank r
+        - paired [bool]: two board cards share a rank
+        - flush_possible [bool]: three board cards share a suit
+        - straight_possible [bool]: three board ranks fit in a straight
+        - texture [str]: one of BOARD_TEXTURES; 'wet' when a straight or flush
+          is possible, 'drawing' when two board cards share a suit
+    """
+    board_ids: Tuple[int, ...]
+    rank_counts: Tuple[int, ...]
+    suit_counts: Tuple[int, ...]
+    rank_mask: int
+    paired: bool
+    flush_possible: bool
+    straight_possible: bool
+    texture: str
+
+    @classmethod
+    def from_ids(cls, board_ids: Sequence[int]) -> 'BoardContext':
+        """
+        Analyse a board
+
+        Args:
+            - board_ids [Sequence{int}]: community card ids
+
+        Returns:
+            - BoardContext: shared state of the street
+        """
+        return _EMPTY_BOARD.extend(board_ids)
+
+    def extend(self, card_ids: Sequence[int]) -> 'BoardContext':
+        """
+        Analyse the board of the next street, updating only for the new cards
+
+        Args:
+            - card_ids [Sequence{int}]: community cards dealt since this context
+
+        Returns:
+            - BoardContext: analysis of the whole new board (self is unchanged)
+        """
+        rank_counts = list(self.rank_counts)
+        suit_counts = list(self.suit_counts)
+        rank_mask = self.rank_mask
+        for card_id in card_ids:
+            rank_counts[card_id >> 2] += 1
+            suit_counts[card_id & 3] += 1
+            rank_mask |= 1 << (card_id >> 2)
+        board_ids = self.board_ids + tuple(card_ids)
+        flush_possible = max(suit_counts) >= 3
+        straight_possible = any(bin(rank_mask & mask).count("1") >= 3 for mask in _STRAIGHT_MASKS)
+        if not board_ids:
+            texture = "none"
+        elif flush_possible or straight_possible:
+            texture = "wet"
+        elif max(suit_counts) == 2:
+            texture = "drawing"
+        else:
+            texture = "dry"
+        return BoardContext(
+            board_ids=board_ids,
+            rank_counts=tuple(rank_counts),
+            suit_counts=tuple(suit_counts),
+            rank_mask=rank_mask,
+            paired=max(rank_counts) >= 2,
+            flush_possible=flush_possible,
+            straight_possible=straight_possible,
+            texture=texture
+        )
+
+    def matches(self, board_ids: Sequence[int]) -> bool:
+        """True if the context was built from these community cards"""
+        return self.board_ids == tuple(board_ids)
+
+    def features(self, hole_ids: Sequence[int]) -> HandFeatures:
+        """
+        Features of hole cards on this board, adding only the hole cards to its counts
+
+        Args:
+            - hole_ids [Sequence{int}]: hole card ids
+
+        Returns:
+            - HandFeatures: same record as extract_features(hole_ids, board_ids)
+        """
+        rank_counts = list(self.rank_counts)
+        suit_counts = list(self.suit_counts)
+        rank_mask = self.rank_mask
+        for card_id in hole_ids:
+            rank_counts[card_id >> 2] += 1
+            suit_counts[card_id & 3] += 1
+            rank_mask |= 1 << (card_id >> 2)
+        return _features_from_counts(hole_ids, self.board_ids, rank_counts, suit_counts, rank_mask)
+
+
+_EMPTY_BOARD = BoardContext((), (0,) * 13, (0,) * 4, 0, False, False, False, "none")
+
+
+def extract_features(hole_ids: Sequence[int], board_ids: Sequence[int]) -> HandFeatures:
+    """
+    Compute the features of hole cards on a board in one pass over the cards
+
+    Args:
+        - hole_ids [Sequence{int}]: hole card ids
+        - board_ids [Sequence{int}]: community card ids
+
+    Returns:
+        - HandFeatures: record of the hand
+    """
+    rank_counts = [0] * 13
+    suit_counts = [0] * 4
+    rank_mask = 0
+    for card_id in (*hole_ids, *board_ids):
+        rank = card_id >> 2
+        rank_counts[rank] += 1
+        suit_counts[card_id & 3] += 1
+        rank_mask |= 1 << rank
+    return _features_from_counts(hole_ids, board_ids, rank_counts, suit_counts, rank_mask)
+
+
+def _features_from_counts(hole_ids: Sequence[int], board_ids: Sequence[int], rank_counts: List[int],
+                          suit_counts: List[int], rank_mask: int) -> HandFeatures:
+    """Build the HandFeatures record from the counts of every card"""
+    num_cards = len(hole_ids) + len(board_ids)
+
+    flush = num_cards >= 5 and max(suit_counts) >= 5
+    straight = num_cards >= 5 and _has_straight(rank_mask)
+    pairs = sum(1 for count in rank_counts if count >= 2)
+    if straight and flush:
+        category = HandRank.ROYAL_FLUSH if rank_mask >> 12 else HandRank.STRAIGHT_FLUSH
+    elif 4 in rank_counts:
+        category = HandRank.FOUR_OF_KIND
+    elif 3 in rank_counts and 2 in rank_counts:
+        category = HandRank.FULL_HOUSE
+    elif flush:
+        category = HandRank.FLUSH
+    elif straight:
+        category = HandRank.STRAIGHT
+    elif 3 in rank_counts:
+        category = HandRank.THREE_OF_KIND
+    elif pairs >= 2:
+        category = HandRank.TWO_PAIR
+    elif 2 in rank_counts:
+        category = HandRank.PAIR
+    else:
+        category = HandRank.HIGH_CARD
+
+    # Draws only exist while cards are still to come on a dealt board
+    flush_draw = open_ended = gutshot = False
+    outs = 0
+    if board_ids and num_cards < 7:
+        flush_suit = suit_counts.index(4) if not flush and 4 in suit_counts else None
+        flush_draw = flush_suit is not None
+        # A straight window missing a single rank is completed by that rank
+        completing_mask = 0
+        if not straight:
+            for mask in _STRAIGHT_MASKS:
+                missing = mask & ~rank_mask
+                if missing & (missing - 1) == 0:
+                    completing_mask |= missing
+        if completing_mask:
+            completing = [rank for rank in range(13) if completing_mask >> rank & 1]
+            open_ended = len(completing) >= 2
+            gutshot = not open_ended
+            # Completing ranks are unseen, so each has its card of the flush suit left
+            outs = sum(4 - rank_counts[rank] for rank in completing)
+        if flush_draw:
+            outs += 13 - suit_counts[flush_suit] - bin(completing_mask).count("1")
+
+    hole_ranks = [card_id >> 2 for card_id in hole_ids]
+    top_board = max(board_ids) >> 2 if board_ids else None
+    return HandFeatures(
+        category=category,
+        kickers=tuple(sorted((card_id >> 2 for card_id in (*hole_ids, *board_ids)
+                              if rank_counts[card_id >> 2] == 1), reverse=True)[:5]),
+        high_card=max(hole_ranks, default=0),
+        flush_draw=flush_draw,
+        open_ended=open_ended,
+        gutshot=gutshot,
+        outs=outs,
+        overcards=0 if top_board is None else sum(1 for rank in hole_ranks if rank > top_board),
+        preflop_class=hand_class(hole_ids) if not board_ids and len(hole_ids) == 2 else None
+    )
@@ -0,0 +1,347 @@
+"""
+Lockstep engine playing one hand at each of many independent tables.
+
+A PokerGame plays a single table with Python objects. TableBatch keeps the
+state of N tables in (N, num_players) arrays instead: stacks, bets,
+contributions, fold and all-in flags. Every card of every table is drawn
+up front with one vectorized deal, all tables go through each street
+together, each seat decides at every table waiting on it with one call to
+its strategy's make_decisions, those actions are applied with array
+operations, and every showdown is scored by one evaluator call
+before the side pots are split for all tables at once.
+
+Betting follows the rules of BettingSystem and PokerGame: blinds of 5 and
+10, at most MAX_RAISES_PER_STREET raises per street, a raise that is not
+allowed becomes a call, a fold with nothing to call becomes a check, and a
+hand with no decisions left runs the board out.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from engine.executor import DECK_STREAM, STRATEGY_STREAM, derive_rng, new_master_seed
+from engine.hand_evaluator import THREE_OF_KIND, evaluate_boards, hand_categories
+from engine.monte_carlo import deal_runouts
+from models.Card import FULL_DECK
+from models.actions import FOLD, RAISE
+from models.betting_system import MAX_RAISES_PER_STREET
+from models.player_stats import POSITIONS, PlayerStatsBlock
+from poker_game import STRATEGY_CLASSES
+from strategies.BasePokerStrategy import DecisionBatch
+
+# Community cards visible on each street
+STREET_BOARD_SIZES = (0, 3, 4, 5)
+
+_ALL_CARDS = np.arange(52, dtype=np.int8)
+
+
+@dataclass
+class BatchOutcome:
+    """
+    Result of one hand played at every table of a batch
+
+    Attributes:
+        - profits [np.ndarray]: chips won or lost, shape (num_tables, num_players)
+        - payouts [np.ndarray]: chips paid from the pots, same shape
+        - winners [np.ndarray]: bool, players paid from a pot
+        - strengths [np.ndarray]: showdown strength (0 when not shown down)
+        - went_to_showdown [np.ndarray]: bool per table
+        - bluffs_attempted [np.ndarray]: bool, raised with less than three of a kind
+    """
+    profits: np.ndarray
+    payouts: np.ndarray
+    winners: np.ndarray
+    strengths: np.ndarray
+    went_to_showdown: np.ndarray
+    bluffs_attempted: np.ndarray
+
+    @property
+    def num_tables(self) -> int:
+        """Number of tables (hands) in the batch"""
+        return len(self.profits)
+
+
+class TableBatch:
+    """
+    Many independent tables of the same size, advanced street by street in lockstep
+
+    Seat i plays the i-th strategy of STRATEGY_CLASSES (cycling) at every
+    table, and one strategy object serves the seat at all tables. Any
+    strategy can be seated: those without a vectorized make_decisions fall
+    back to looping make_decision.
+
+    Args:
+        - num_players [int]: players at each table
+        - seed [int]: master seed (a random one if None)
+        - initial_stack [int]: stack of every player at the start of a hand
+    """
+
+    def __init__(self, num_players: int, seed: Optional[int] = None, initial_stack: int = 1000):
+        self.num_players = num_players
+        self.initial_stack = initial_stack
+        self.small_blind = 5
+        self.big_blind = 10
+        self.strategies = [STRATEGY_CLASSES[i % len(STRATEGY_CLASSES)]() for i in range(num_players)]
+        self.stats = PlayerStatsBlock(num_players)
+        self._position_codes = np.array([POSITIONS.index(_seat_position(i, num_players))
+                                         for i in range(num_players)])
+        self.reseed(seed if seed is not None else new_master_seed())
+
+    @property
+    def strategy_names(self) -> List[str]:
+        """Strategy class name of each seat"""
+        return [type(strategy).__name__ for strategy in self.strategies]
+
+    def reseed(self, master_seed: int, *key: int):
+        """
+        Derive every random stream of the batch from a seed
+
+        Uses the same (master_seed, *key, stream) layout as PokerGame.reseed.
+
+        Args:
+            - master_seed [int]: seed of the run
+            - key [int]: path below the master seed (e.g. shard index)
+        """
+        self.seed = master_seed
+        self._deck_rng = derive_rng(master_seed, *key, DECK_STREAM)
+        for index, strategy in enumerate(self.strategies):
+            strategy.set_rng(derive_rng(master_seed, *key, STRATEGY_STREAM, index))
+
+    def reset_stats(self):
+        """Clear every seat's accumulated statistics"""
+        self.stats.reset()
+
+    def play(self, num_tables: int) -> BatchOutcome:
+        """
+        Play one hand at each of num_tables tables and record it in self.stats
+
+        Args:
+            - num_tables [int]: tables in the batch
+
+        Returns:
+            - BatchOutcome: per-table, per-seat result of the hand
+        """
+        n, p = num_tables, self.num_players
+        cards = deal_runouts(_ALL_CARDS, 2 * p + 5, n, self._deck_rng)
+        self.holes = cards[:, :2 * p].reshape(n, p, 2)
+        self.boards = cards[:, 2 * p:]
+        self._hole_lists = self.holes.tolist()
+        self._board_lists = self.boards.tolist()
+        for strategy in self.strategies:
+            strategy.num_players = p
+
+        self.stacks = np.full((n, p), self.initial_stack, dtype=np.int64)
+        self.bets = np.zeros((n, p), dtype=np.int64)
+        self.contributions = np.zeros((n, p), dtype=np.int64)
+        self.folded = np.zeros((n, p), dtype=bool)
+        self.all_in = np.zeros((n, p), dtype=bool)
+        self.raised = np.zeros((n, p), dtype=bool)
+        self.current_bet = np.zeros(n, dtype=np.int64)
+        self.min_raise = np.full(n, self.big_blind, dtype=np.int64)
+        self.raises_this_street = np.zeros(n, dtype=np.int64)
+
+        everyone = np.arange(n)
+        self._commit(everyone, 0, self.small_blind)
+        self._commit(everyone, 1 % p, self.big_blind)
+        self.current_bet[:] = self.big_blind
+
+        # Community cards each table had seen when its hand ended
+        seen = np.full(n, 5)
+        ended = np.zeros(n, dtype=bool)
+        for street, board_size in enumerate(STREET_BOARD_SIZES):
+            self.board_size = board_size
+            if street > 0:
+                self.bets[:] = 0
+                self.current_bet[:] = 0
+                self.min_raise[:] = self.big_blind
+                self.raises_this_street[:] = 0
+            self._betting_round(2 % p if street == 0 else 0)
+            single = (~self.folded).sum(axis=1) == 1
+            seen[single & ~ended] = board_size
+            ended |= single
+
+        return self._showdown(seen)
+
+    def _commit(self, tables: np.ndarray, seat: int, amounts) -> np.ndarray:
+        """Move chips from one seat's stacks to the pots, going all-in if short"""
+        amounts = np.minimum(amounts, self.stacks[tables, seat])
+        self.stacks[tables, seat] -= amounts
+        self.bets[tables, seat] += amounts
+        self.contributions[tables, seat] += amounts
+        self.all_in[tables, seat] |= self.stacks[tables, seat] == 0
+        return amounts
+
+    def _active(self) -> np.ndarray:
+        """Players neither folded nor all-in"""
+        return ~self.folded & ~self.all_in
+
+    def _betting_round(self, first: int):
+        """
+        Run one street at every table
+
+        Seats are visited in turn from ``first``; at each seat, every table
+        where that player still has to act decides at once. A raise puts
+        everyone else able to act back in line at that table, which gives
+        each table the action order of PokerGame._handle_betting_round.
+        """
+        p = self.num_players
+        # Tables where at most one player can act have no decision left on a new street
+        active = self._active()
+        open_tables = ((~self.folded).sum(axis=1) > 1) & (active.sum(axis=1) > 1)
+        pending = active & open_tables[:, None]
+        seat = first
+        while pending.any():
+            tables = np.flatnonzero(pending[:, seat])
+            if tables.size:
+                self._act(seat, tables, pending)
+            seat = (seat + 1) % p
+
+    def _act(self, seat: int, tables: np.ndarray, pending: np.ndarray):
+        """Ask one seat for a decision at several tables and apply them all"""
+        actions, amounts = self._decide(seat, tables)
+        to_call = self.current_bet[tables] - self.bets[tables, seat]
+        raise_by = np.maximum(amounts, self.min_raise[tables])
+        raised = ((actions == RAISE) & (self.raises_this_street[tables] < MAX_RAISES_PER_STREET)
+                  & (to_call + raise_by <= self.stacks[tables, seat]))
+        folds = ~raised & (actions == FOLD) & (to_call > 0)
+        commits = np.where(raised, to_call + raise_by, np.where(folds, 0, to_call))
+        self._commit(tables, seat, commits)
+        self.folded[tables[folds], seat] = True
+        pending[tables, seat] = False
+
+        raising_tables = tables[raised]
+        if raising_tables.size:
+            self.current_bet[raising_tables] = self.bets[raising_tables, seat]
+            self.min_raise[raising_tables] = raise_by[raised]
+            self.raises_this_street[raising_tables] += 1
+            self.raised[raising_tables, seat] = True
+            # Everyone else who can still act must answer the raise
+            pending[raising_tables] = self._active()[raising_tables]
+            pending[raising_tables, seat] = False
+
+        # The hand is over at tables where a fold left a single player
+        folding_tables = tables[folds]
+        if folding_tables.size:
+            pending[folding_tables] &= ((~self.folded[folding_tables]).sum(axis=1) > 1)[:, None]
+
+    def _decide(self, seat: int, tables: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the seat's strategy decisions at the given tables in one batch call
+
+        Returns:
+            - Tuple{np.ndarray, np.ndarray}: action codes (FOLD, CALL, RAISE) and
+              raise amounts on top of the current bet
+        """
+        strategy = self.strategies[seat]
+        board_size = self.board_size
+        hands = [[FULL_DECK[card_id] for card_id in self._hole_lists[table][seat]] for table in tables.tolist()]
+        community_cards = [[FULL_DECK[card_id] for card_id in self._board_lists[table][:board_size]]
+                           for table in tables.tolist()]
+        batch = DecisionBatch(
+            hands=hands,
+            community_cards=community_cards,
+            hand_strengths=strategy.evaluate_hand_strengths(hands, community_cards),
+            pot_sizes=self.contributions[tables].sum(axis=1),
+            current_bets=self.current_bet[tables] - self.bets[tables, seat],
+            stacks=self.stacks[tables, seat],
+            positions=np.full(len(tables), self._position_codes[seat])
+        )
+        actions, amounts = strategy.make_decisions(batch)
+        return np.asarray(actions), np.asarray(amounts).astype(np.int64)
+
+    def _showdown(self, seen: np.ndarray) -> BatchOutcome:
+        """Score every showdown at once, split the pots and record the statistics"""
+        n, p = self.folded.shape
+        live = ~self.folded
+        went_to_showdown = live.sum(axis=1) > 1
+        strengths = np.zeros((n, p), dtype=np.int64)
+        showdown_tables = np.flatnonzero(went_to_showdown)
+        if showdown_tables.size:
+            strengths[showdown_tables] = evaluate_boards(self.holes[showdown_tables], self.boards[showdown_tables])
+        payouts = self._settle(np.where(self.folded, -1, strengths))
+
+        profits = self.stacks + payouts - self.initial_stack
+        winners = payouts > 0
+
+        # Category of the hand each player held with the cards seen so far;
+        # preflop, a pair or less is all there is
+        categories = np.ones((n, p), dtype=np.int64)
+        categories[showdown_tables] = hand_categories(strengths[showdown_tables])
+        for board_size in (3, 4, 5):
+            ended_tables = np.flatnonzero(~went_to_showdown & (seen == board_size))
+            if ended_tables.size:
+                categories[ended_tables] = hand_categories(
+                    evaluate_boards(self.holes[ended_tables], self.boards[ended_tables, :board_size])
+                )
+        bluffs_attempted = self.raised & (categories < THREE_OF_KIND)
+
+        self.stats.record_hands(
+            won=winners,
+            profits=profits,
+            positions=self._position_codes,
+            bluffs_attempted=bluffs_attempted,
+            bluffs_successful=bluffs_attempted & winners
+        )
+        # Folded hands are not shown down, as in PokerGame
+        return BatchOutcome(profits, payouts, winners, np.where(live, strengths, 0), went_to_showdown,
+                            bluffs_attempted)
+
+    def _settle(self, strengths: np.ndarray) -> np.ndarray:
+        """
+        Award every table's pot, side pot by side pot, to its best live hands
+
+        Follows BettingSystem.side_pots and settle: each contribution level
+        is a pot for the live players who reached it, chips only folded
+        players put in at a level join the pot below, and ties split a pot
+        with the odd chips going to the earliest seats.
+
+        Args:
+            - strengths [np.ndarray]: shape (num_tables, num_players), -1 for folded players
+
+        Returns:
+            - payouts [np.ndarray]: chips paid to each player
+        """
+        contributions = self.contributions
+        n = len(contributions)
+        live = ~self.folded
+        payouts = np.zeros_like(contributions)
+        pot_amounts = np.zeros(n, dtype=np.int64)
+        pot_winners = _best_hands(strengths, live)
+        previous_levels = np.zeros(n, dtype=np.int64)
+        for level in np.sort(contributions, axis=1).T:
+            steps = level - previous_levels
+            previous_levels = level
+            contributors = contributions >= level[:, None]
+            amounts = steps * contributors.sum(axis=1)
+            eligible = contributors & live
+            new_pot = (steps > 0) & eligible.any(axis=1)
+            # Pay the pot below before opening a new one; otherwise the chips join it
+            _split_pots(payouts, np.where(new_pot, pot_amounts, 0), pot_winners)
+            pot_amounts = np.where(new_pot, amounts, pot_amounts + amounts)
+            pot_winners = np.where(new_pot[:, None], _best_hands(strengths, eligible), pot_winners)
+        _split_pots(payouts, pot_amounts, pot_winners)
+        return payouts
+
+
+def _best_hands(strengths: np.ndarray, eligible: np.ndarray) -> np.ndarray:
+    """Eligible players holding the best eligible hand of each table"""
+    masked = np.where(eligible, strengths, -2)
+    return eligible & (masked == masked.max(axis=1, keepdims=True))
+
+
+def _split_pots(payouts: np.ndarray, amounts: np.ndarray, winners: np.ndarray):
+    """Share each table's pot between its winners, odd chips to the earliest seats"""
+    counts = np.maximum(winners.sum(axis=1), 1)
+    shares, odd_chips = np.divmod(amounts, counts)
+    ranks = np.cumsum(winners, axis=1) - 1
+    payouts += winners * (shares[:, None] + (ranks < odd_chips[:, None]))
+
+
+def _seat_position(seat: int, num_players: int) -> str:
+    """Position of a seat (early, middle, late), as in PokerGame._get_position"""
+    if seat < num_players // 3:
+        return "early"
+    elif seat < 2 * num_players // 3:
+        return "middle"
+    return "late"
@@ -0,0 +1,29 @@
+import pytest
+
+from models.Card import FULL_DECK
+
+
+class RiggedDeck:
+    """Deck dealing a fixed list of cards in order"""
+
+    def __init__(self, card_ids):
+        self.card_ids = list(card_ids)
+
+    def reset(self):
+        pass
+
+    def shuffle(self, rng=None):
+        pass
+
+    def deal(self, num_cards):
+        dealt, self.card_ids = self.card_ids[:num_cards], self.card_ids[num_cards:]
+        return [FULL_DECK[card_id] for card_id in dealt]
+
+
+@pytest.fixture
+def rig_deck():
+    """Make a PokerGame deal the given card ids: every player's hole cards in seat order, then the board"""
+    def rig(game, card_ids):
+        game.deck = RiggedDeck(card_ids)
+        return game.deck
+    return rig
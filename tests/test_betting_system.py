@@ -0,0 +1,91 @@
+import pytest
+
+from models.betting_system import BettingSystem
+from models.player import Player
+
+
+def make_betting(num_players, initial_stack=1000):
+    players = [Player(None, [], initial_stack) for _ in range(num_players)]
+    betting = BettingSystem(num_players, players, initial_stack)
+    betting.start_new_round()
+    return betting
+
+
+def set_pot(betting, contributions, folded):
+    """Put the hand in a given state: chips each player put in and who folded"""
+    betting.contributions = list(contributions)
+    betting.folded_players = list(folded)
+    betting.current_pot = sum(contributions)
+    for player, contribution in zip(betting.players, contributions):
+        player.stack = betting.initial_stack - contribution
+
+
+def test_all_ins_at_three_levels():
+    betting = make_betting(4)
+    # Short stacks behind the blinds: 100 and 300 chips in total
+    betting.players[0].stack = 95
+    betting.players[1].stack = 290
+    assert betting.handle_action(2, 'raise', 990)
+    assert betting.handle_action(3, 'call')
+    assert betting.handle_action(0, 'call')
+    assert betting.handle_action(1, 'call')
+    assert betting.contributions == [100, 300, 1000, 1000]
+    assert all(betting.all_in_players)
+    assert betting.is_action_closed()
+
+    assert betting.side_pots() == [(400, [0, 1, 2, 3]), (600, [1, 2, 3]), (1400, [2, 3])]
+    # Every player holds a better hand than the next one
+    assert betting.settle([4000, 3000, 2000, 1000]) == [400, 600, 1400, 0]
+    assert [player.stack for player in betting.players] == [400, 600, 1400, 0]
+    assert betting.current_pot == 0
+
+
+def test_worse_hand_wins_the_pots_it_covers_alone():
+    betting = make_betting(3)
+    set_pot(betting, [100, 300, 300], [False, False, False])
+    # The short stack has the best hand; the side pot goes to the better of the others
+    payouts = betting.settle([7000, 10, 20])
+    assert payouts == [300, 0, 400]
+    assert sum(payouts) == 700
+
+
+def test_folded_chips_stay_in_the_pots():
+    betting = make_betting(4)
+    set_pot(betting, [100, 300, 300, 50], [False, False, True, True])
+    assert betting.side_pots() == [(200, [0, 1]), (150, [0, 1]), (400, [1])]
+    # Folded strengths are ignored
+    assert betting.settle([1, 2, None, None]) == [0, 750, 0, 0]
+
+
+def test_level_without_live_player_joins_the_pot_below():
+    betting = make_betting(3)
+    set_pot(betting, [100, 300, 500], [False, False, True])
+    assert betting.side_pots() == [(300, [0, 1]), (600, [1])]
+
+
+def test_split_pot_gives_odd_chips_to_earliest_seats():
+    betting = make_betting(3)
+    set_pot(betting, [7, 7, 7], [False, False, False])
+    assert betting.settle([50, 10, 50]) == [11, 0, 10]
+
+
+def test_settle_by_equity_pays_the_expected_value():
+    betting = make_betting(3)
+    set_pot(betting, [100, 300, 300], [False, False, False])
+
+    # Seat 0 is a favourite over everyone; the others are even
+    shares = {(0, 1, 2): [0.5, 0.25, 0.25], (1, 2): [0.5, 0.5]}
+    payouts = betting.settle_by_equity(lambda eligible: shares[tuple(eligible)])
+    assert payouts == pytest.approx([150, 275, 275])
+    assert sum(player.stack for player in betting.players) == pytest.approx(3000)
+
+
+def test_snapshot_restore_round_trip():
+    betting = make_betting(3)
+    assert betting.handle_action(2, 'raise', 20)
+    state = betting.snapshot()
+    assert betting.handle_action(0, 'fold')
+    assert betting.handle_action(1, 'call')
+    betting.restore(state)
+    assert betting.snapshot() == state
+    assert [player.stack for player in betting.players] == state.stacks
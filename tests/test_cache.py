@@ -0,0 +1,127 @@
+import itertools
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from engine.cache import ResultCache, canonical_key, canonical_seed
+from engine.monte_carlo import enumerate_equity
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def relabel(card_ids, permutation):
+    return [(card & ~3) | permutation[card & 3] for card in card_ids]
+
+
+def random_deal(rng, num_players, board_size):
+    cards = rng.sample(range(52), 2 * num_players + board_size)
+    return [cards[2 * i:2 * i + 2] for i in range(num_players)], cards[2 * num_players:]
+
+
+@pytest.mark.parametrize("num_players, board_size", [(1, 0), (1, 3), (2, 4), (3, 5)])
+def test_canonical_key_is_invariant_under_suit_permutations(num_players, board_size):
+    rng = random.Random(num_players * 10 + board_size)
+    for _ in range(50):
+        hole_ids, board_ids = random_deal(rng, num_players, board_size)
+        key = canonical_key(hole_ids, board_ids)
+        for permutation in itertools.permutations(range(4)):
+            shuffled_board = relabel(board_ids, permutation)
+            rng.shuffle(shuffled_board)
+            assert canonical_key([relabel(hand, permutation) for hand in hole_ids], shuffled_board) == key
+
+
+def test_canonical_key_separates_different_deals():
+    ace_king_suited = canonical_key([[48, 44]], [])
+    ace_king_offsuit = canonical_key([[48, 45]], [])
+    assert ace_king_suited != ace_king_offsuit
+    # Same ranks, but the flush is made by the other player
+    assert canonical_key([[0, 4], [9, 13]], [16, 20, 24]) != canonical_key([[1, 5], [8, 12]], [16, 20, 24])
+    # Players keep their seats
+    assert canonical_key([[48, 49], [44, 45]], []) != canonical_key([[44, 45], [48, 49]], [])
+
+
+def test_canonical_deal_has_the_same_equity():
+    rng = random.Random(5)
+    for _ in range(5):
+        hole_ids, board_ids = random_deal(rng, 2, 4)
+        *canonical_holes, canonical_board = canonical_key(hole_ids, board_ids)
+        original = enumerate_equity(hole_ids, board_ids)
+        canonical = enumerate_equity([list(hand) for hand in canonical_holes], list(canonical_board))
+        assert canonical.equity.tolist() == original.equity.tolist()
+
+
+def test_canonical_seed_is_stable_across_processes():
+    key = canonical_key([[48, 44], [3, 7]], [10, 20, 30])
+    script = (
+        "from engine.cache import canonical_key, canonical_seed;"
+        "print(canonical_seed(canonical_key([[48, 44], [3, 7]], [10, 20, 30])))"
+    )
+    for hash_seed in ("1", "2"):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                                cwd=ROOT, env={**os.environ, "PYTHONHASHSEED": hash_seed}).stdout
+        assert int(output) == canonical_seed(key)
+    assert 0 <= canonical_seed(key) < 2 ** 63
+
+
+def test_lfu_evicts_least_frequently_used_then_oldest():
+    cache = ResultCache(maxsize=3, policy="lfu")
+    for key in "abc":
+        cache.put(key, key.upper())
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.put("d", "D")
+    assert "c" not in cache
+    # d is now the only entry used once
+    cache.put("e", "E")
+    assert "d" not in cache
+    assert all(key in cache for key in "abe")
+    # b and e are both used twice: the older one goes first
+    cache.get("e")
+    cache.put("f", "F")
+    assert "b" not in cache and all(key in cache for key in "aef")
+    assert cache.cache_info() == {"hits": 4, "misses": 0, "evictions": 3, "size": 3, "maxsize": 3}
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2, policy="lru")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+
+
+def test_get_or_compute_computes_once():
+    cache = ResultCache(maxsize=4)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("key", lambda: calls.append(1) or 42) == 42
+    assert calls == [1]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_lfu_counts_survive_save_and_load(tmp_path):
+    path = tmp_path / "cache.pkl"
+    cache = ResultCache(maxsize=3, policy="lfu", path=str(path))
+    for key in "abc":
+        cache.put(key, key)
+    for _ in range(3):
+        cache.get("a")
+    cache.get("c")
+    cache.save()
+
+    reloaded = ResultCache(maxsize=3, policy="lfu", path=str(path))
+    assert reloaded.get("c") == "c"
+    reloaded.put("d", "d")
+    assert "b" not in reloaded
+    reloaded.put("e", "e")
+    assert "d" not in reloaded and "a" in reloaded and "c" in reloaded
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        ResultCache(policy="fifo")
@@ -0,0 +1,113 @@
+import itertools
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from engine.hand_evaluator import (
+    FLUSH, FOUR_OF_KIND, FULL_HOUSE, HIGH_CARD, NUM_STRENGTHS, PAIR, STRAIGHT, STRAIGHT_FLUSH, THREE_OF_KIND,
+    TWO_PAIR, HandState, evaluate, evaluate_batch, evaluate_boards, hand_categories, hand_category
+)
+
+
+def reference_five(card_ids):
+    """Textbook ranking of five cards: (category, tie-break ranks), higher is better"""
+    ranks = sorted((card_id >> 2 for card_id in card_ids), reverse=True)
+    flush = len({card_id & 3 for card_id in card_ids}) == 1
+    distinct = sorted(set(ranks), reverse=True)
+    straight_high = None
+    if len(distinct) == 5:
+        if distinct[0] - distinct[4] == 4:
+            straight_high = distinct[0]
+        elif distinct == [12, 3, 2, 1, 0]:
+            straight_high = 3
+    if straight_high is not None:
+        return (STRAIGHT_FLUSH if flush else STRAIGHT, straight_high)
+    # Ranks grouped by count, then by rank
+    groups = sorted(Counter(ranks).items(), key=lambda item: (item[1], item[0]), reverse=True)
+    counts = [count for _, count in groups]
+    ordered = tuple(rank for rank, _ in groups)
+    if counts[0] == 4:
+        category = FOUR_OF_KIND
+    elif counts[:2] == [3, 2]:
+        category = FULL_HOUSE
+    elif flush:
+        return (FLUSH,) + tuple(ranks)
+    elif counts[0] == 3:
+        category = THREE_OF_KIND
+    elif counts[:2] == [2, 2]:
+        category = TWO_PAIR
+    elif counts[0] == 2:
+        category = PAIR
+    else:
+        category = HIGH_CARD
+    return (category,) + ordered
+
+
+def reference(card_ids):
+    """Best five-card ranking among 5 to 7 cards"""
+    return max(reference_five(five) for five in itertools.combinations(card_ids, 5))
+
+
+def random_hands(num_hands, num_cards, seed):
+    rng = random.Random(seed)
+    return [rng.sample(range(52), num_cards) for _ in range(num_hands)]
+
+
+@pytest.mark.parametrize("num_cards", [5, 6, 7])
+def test_evaluate_orders_hands_like_reference(num_cards):
+    hands = random_hands(3000, num_cards, seed=num_cards)
+    # Rig the sample so that every category shows up
+    hands += [[48, 44, 40, 36, 32, 1, 6][:num_cards], [12, 8, 4, 0, 48, 21, 30][:num_cards],
+              [20, 21, 22, 23, 5, 9, 13][:num_cards], [20, 21, 22, 5, 6, 9, 13][:num_cards],
+              [0, 8, 16, 24, 40, 45, 49][:num_cards], [0, 5, 10, 15, 16, 45, 49][:num_cards]]
+    scored = sorted((reference(hand), evaluate(hand)) for hand in hands)
+    for (key_a, strength_a), (key_b, strength_b) in zip(scored, scored[1:]):
+        if key_a == key_b:
+            assert strength_a == strength_b
+        else:
+            assert strength_a < strength_b
+    for key, strength in scored:
+        assert hand_category(strength) == key[0]
+    assert {key[0] for key, _ in scored} == set(range(HIGH_CARD, STRAIGHT_FLUSH + 1))
+
+
+def test_strength_bounds():
+    # 7-5-4-3-2 offsuit is the weakest hand and the royal flush the strongest
+    assert evaluate([20, 12, 9, 6, 3]) == 1
+    assert evaluate([48, 44, 40, 36, 32]) == NUM_STRENGTHS
+    # The wheel is the lowest straight
+    wheel = evaluate([48, 1, 6, 11, 12])
+    assert hand_category(wheel) == STRAIGHT
+    assert wheel < evaluate([0, 5, 10, 15, 17])
+
+
+@pytest.mark.parametrize("num_cards", [5, 6, 7])
+def test_evaluate_batch_matches_evaluate(num_cards):
+    hands = np.array(random_hands(2000, num_cards, seed=10 + num_cards), dtype=np.int64)
+    strengths = evaluate_batch(hands)
+    assert strengths.tolist() == [evaluate(hand) for hand in hands.tolist()]
+    assert hand_categories(strengths).tolist() == [hand_category(strength) for strength in strengths.tolist()]
+
+
+def test_evaluate_boards_matches_evaluate():
+    deals = np.array(random_hands(500, 11, seed=3), dtype=np.int64)
+    holes = deals[:, :6].reshape(-1, 3, 2)
+    boards = deals[:, 6:]
+    strengths = evaluate_boards(holes, boards)
+    for deal in range(len(deals)):
+        for player in range(3):
+            assert strengths[deal, player] == evaluate(holes[deal, player].tolist() + boards[deal].tolist())
+
+
+def test_hand_state_matches_evaluate():
+    for hand in random_hands(500, 7, seed=4):
+        state = HandState(hand[:2])
+        state.add_all(hand[2:5])
+        assert state.strength() == evaluate(hand[:5])
+        for count in (6, 7):
+            state.add(hand[count - 1])
+            assert state.strength() == evaluate(hand[:count])
+    with pytest.raises(ValueError):
+        HandState([0, 1, 2, 3]).strength()
@@ -0,0 +1,98 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from engine.executor import ExecutionBackend
+from engine.hand_evaluator import evaluate
+from engine.monte_carlo import (
+    ADAPTIVE_SHARD_SIZE, combinations_from, count_runouts, enumerate_equity, run_equity, unrank_combination,
+    win_half_widths
+)
+
+# Card ids are rank * 4 + suit, with deuce = 0 and hearts = 0
+HEARTS_DRAW = [[0, 4], [51, 47]]          # 2h 3h against As Ks
+HEARTS_DRAW_TURN = [48, 44, 30, 21]       # Ah Kh 9c 7d
+
+
+def reference_equity(hole_ids, board_ids):
+    """Pot share of each player over every completion of the board, one board at a time"""
+    dead = {card for hand in hole_ids for card in hand} | set(board_ids)
+    live = [card for card in range(52) if card not in dead]
+    equity = np.zeros(len(hole_ids))
+    num_boards = 0
+    for runout in itertools.combinations(live, 5 - len(board_ids)):
+        strengths = [evaluate(hand + board_ids + list(runout)) for hand in hole_ids]
+        best = max(strengths)
+        winners = [player for player, strength in enumerate(strengths) if strength == best]
+        equity[winners] += 1 / len(winners)
+        num_boards += 1
+    return equity, num_boards
+
+
+def test_unrank_combination_follows_itertools_order():
+    for index, combination in enumerate(itertools.combinations(range(9), 4)):
+        assert tuple(unrank_combination(9, 4, index)) == combination
+
+
+def test_combinations_from_resumes_anywhere():
+    items = [3, 8, 11, 20, 25, 31, 40]
+    expected = list(itertools.combinations(items, 3))
+    for start in (0, 1, 17, len(expected) - 1):
+        assert list(combinations_from(items, 3, start)) == expected[start:]
+
+
+def test_known_turn_equity():
+    # Nine hearts complete the flush and the two pair has no redraw
+    tally = enumerate_equity(HEARTS_DRAW, HEARTS_DRAW_TURN)
+    assert tally.exact
+    assert tally.num_simulations == 44
+    assert tally.equity.tolist() == [9, 35]
+    assert tally.ties.tolist() == [0, 0]
+
+
+@pytest.mark.parametrize("hole_ids, board_ids", [
+    ([[48, 49], [44, 45]], [0, 21, 34]),
+    ([[48, 44], [20, 24], [1, 5]], [8, 13, 30]),
+    ([[12, 16], [13, 17]], [2, 6, 40, 51]),
+])
+def test_enumeration_matches_reference(hole_ids, board_ids):
+    expected, num_boards = reference_equity(hole_ids, board_ids)
+    # Small blocks, so boards are split over several shards and threads
+    tally = enumerate_equity(hole_ids, board_ids, ExecutionBackend("thread", 3), chunk_size=97)
+    assert tally.num_simulations == num_boards == count_runouts(hole_ids, board_ids)
+    np.testing.assert_allclose(tally.equity, expected)
+    assert tally.equity.sum() == pytest.approx(num_boards)
+    np.testing.assert_array_equal(win_half_widths(tally), 0.0)
+
+
+def test_run_equity_enumerates_when_boards_fit():
+    hole_ids, board_ids = [[48, 49], [44, 45]], [0, 21, 34]
+    num_boards = count_runouts(hole_ids, board_ids)
+    assert run_equity(hole_ids, board_ids, num_boards).exact
+    assert not run_equity(hole_ids, board_ids, num_boards - 1, seed=1).exact
+    assert not run_equity(hole_ids, board_ids, num_boards, seed=1, exhaustive=False).exact
+
+
+def test_adaptive_run_does_not_enumerate_large_deals():
+    hole_ids = [[48, 49], [44, 45]]
+    assert count_runouts(hole_ids, []) > ADAPTIVE_SHARD_SIZE
+    tally = run_equity(hole_ids, [], 10 ** 7, seed=3, target_half_width=0.01)
+    assert not tally.exact
+    assert tally.num_simulations < 10 ** 7
+    assert win_half_widths(tally).max() <= 0.01
+    # Flop deals fit in one adaptive shard and are still solved exactly
+    assert run_equity(hole_ids, [0, 21, 34], 10 ** 7, target_half_width=0.01).exact
+
+
+def test_seeded_sampling_is_reproducible_and_close_to_exact():
+    hole_ids, board_ids = [[48, 44], [20, 24], [1, 5]], [8, 13, 30]
+    exact = enumerate_equity(hole_ids, board_ids)
+    serial = run_equity(hole_ids, board_ids, 20000, seed=11, shard_size=2500, exhaustive=False)
+    threaded = run_equity(hole_ids, board_ids, 20000, ExecutionBackend("thread", 4), seed=11, shard_size=2500,
+                          exhaustive=False)
+    np.testing.assert_array_equal(serial.equity, threaded.equity)
+    error = np.abs(serial.equity / serial.num_simulations - exact.equity / exact.num_simulations)
+    # Five standard errors of a proportion at worst
+    assert error.max() < 5 * math.sqrt(0.25 / serial.num_simulations)
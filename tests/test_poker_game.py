@@ -0,0 +1,86 @@
+from models.betting_system import BettingRound
+from models.player_stats import FIELD_INDEX
+from poker_game import PokerGame
+from strategies.BasePokerStrategy import BasePokerStrategy
+
+# Card ids are rank * 4 + suit, with deuce = 0 and hearts = 0
+SEVEN_DEUCE = [20, 1]                     # 7h 2d
+ACES = [48, 49]                           # Ah Ad
+KINGS = [44, 45]                          # Kh Kd
+BOARD = [46, 31, 8, 6, 37]                # Kc 9s 4h 3c Jd
+
+
+class ActionScript(BasePokerStrategy):
+    """Plays a fixed list of actions, then calls (or checks) every bet"""
+
+    def __init__(self, *actions):
+        super().__init__()
+        self.actions = list(actions)
+
+    def make_decision(self, hand, community_cards, pot_size, current_bet, player_stack):
+        if self.actions:
+            return self.actions.pop(0)
+        return 'call', current_bet
+
+
+def scripted_game(*strategies):
+    game = PokerGame(len(strategies), seed=1)
+    for player, strategy in zip(game.players, strategies):
+        player.strategy = strategy
+    return game
+
+
+def test_hand_ends_when_everyone_folds_preflop(rig_deck):
+    # Under the gun and the small blind fold to the big blind
+    game = scripted_game(ActionScript(('fold', 0)), ActionScript(), ActionScript(('fold', 0)))
+    deck = rig_deck(game, SEVEN_DEUCE + ACES + KINGS + BOARD)
+    result = game.simulate_game()
+
+    assert game.community_cards == []
+    assert deck.card_ids == BOARD
+    showdown = result["showdown"]
+    assert not showdown.went_to_showdown
+    assert showdown.strengths == [None, None, None]
+    assert showdown.winners == [False, True, False]
+    assert result["profits"] == [-5, 5, 0]
+
+
+def test_hand_ends_on_the_street_everyone_else_folds(rig_deck):
+    # The small blind checks the flop, the big blind bets and the small blind folds:
+    # turn and river are never dealt
+    game = scripted_game(ActionScript(('call', 5), ('call', 0), ('fold', 0)),
+                         ActionScript(('call', 0), ('raise', 20)))
+    deck = rig_deck(game, SEVEN_DEUCE + ACES + BOARD)
+    result = game.simulate_game()
+
+    assert [card.id for card in game.community_cards] == BOARD[:3]
+    assert deck.card_ids == BOARD[3:]
+    assert result["profits"] == [-10, 10]
+    assert result["showdown"].raise_streets == [[], [BettingRound.FLOP.value]]
+
+
+def test_raise_followed_by_a_call_is_recorded(rig_deck):
+    # The seven-deuce raises preflop, is called and loses at showdown
+    game = scripted_game(ActionScript(('raise', 20)), ActionScript())
+    rig_deck(game, SEVEN_DEUCE + ACES + BOARD)
+    showdown = game.simulate_game()["showdown"]
+
+    assert showdown.went_to_showdown
+    assert showdown.raise_streets == [[BettingRound.PREFLOP.value], []]
+    assert showdown.categories[1] is None and showdown.categories[0] is not None
+    assert all(strength is not None for strength in showdown.strengths)
+    assert showdown.winners == [False, True]
+    stats = game.stats.data
+    assert stats[:, FIELD_INDEX["bluffs_attempted"]].tolist() == [1, 0]
+    assert stats[:, FIELD_INDEX["bluffs_successful"]].tolist() == [0, 0]
+
+
+def test_bluff_that_wins_without_showdown_is_successful(rig_deck):
+    game = scripted_game(ActionScript(('raise', 20)), ActionScript(('fold', 0)))
+    rig_deck(game, SEVEN_DEUCE + ACES + BOARD)
+    result = game.simulate_game()
+
+    assert result["profits"] == [10, -10]
+    stats = game.stats.data
+    assert stats[:, FIELD_INDEX["bluffs_attempted"]].tolist() == [1, 0]
+    assert stats[:, FIELD_INDEX["bluffs_successful"]].tolist() == [1, 0]
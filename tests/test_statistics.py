@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from engine.statistics import RunningStats
+
+
+def assert_matches(running, values):
+    np.testing.assert_allclose(running.mean, values.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(running.variance(), values.var(axis=0, ddof=1), rtol=1e-10)
+    np.testing.assert_allclose(running.variance(ddof=0), values.var(axis=0), rtol=1e-10)
+    np.testing.assert_allclose(running.total, values.sum(axis=0), rtol=1e-12)
+    np.testing.assert_array_equal(running.min, values.min(axis=0))
+    np.testing.assert_array_equal(running.max, values.max(axis=0))
+    assert running.count == len(values)
+
+
+@pytest.fixture
+def values():
+    # Large offset, so a naive sum-of-squares variance would lose precision
+    return np.random.default_rng(0).normal(1e6, 3.0, size=(10000, 3))
+
+
+def test_one_pass_matches_numpy(values):
+    assert_matches(RunningStats(3).add_batch(values), values)
+
+
+def test_merged_blocks_match_one_pass(values):
+    bounds = [0, 1, 2, 500, 4321, 4322, 9000, 10000]
+    blocks = [RunningStats(3).add_batch(values[start:end]) for start, end in zip(bounds, bounds[1:])]
+    merged = RunningStats(3)
+    for block in blocks:
+        merged.merge(block)
+    one_pass = RunningStats(3).add_batch(values)
+    np.testing.assert_allclose(merged.mean, one_pass.mean, rtol=1e-12)
+    np.testing.assert_allclose(merged.m2, one_pass.m2, rtol=1e-9)
+    assert_matches(merged, values)
+
+
+def test_merge_order_does_not_matter(values):
+    halves = np.array_split(values, 2)
+    forward = RunningStats(3).merge(RunningStats(3).add_batch(halves[0])).merge(RunningStats(3).add_batch(halves[1]))
+    backward = RunningStats(3).merge(RunningStats(3).add_batch(halves[1])).merge(RunningStats(3).add_batch(halves[0]))
+    np.testing.assert_allclose(forward.mean, backward.mean, rtol=1e-12)
+    np.testing.assert_allclose(forward.m2, backward.m2, rtol=1e-9)
+
+
+def test_empty_and_single_value():
+    running = RunningStats(2)
+    running.add_batch(np.empty((0, 2)))
+    assert running.count == 0
+    np.testing.assert_array_equal(running.variance(), 0.0)
+    running.add_batch(np.array([[1.0, -2.0]]))
+    np.testing.assert_array_equal(running.variance(), 0.0)
+    assert running.confidence_intervals() == [(1.0, 1.0), (-2.0, -2.0)]
+
+
+def test_confidence_intervals_match_student_t(values):
+    running = RunningStats(3).add_batch(values[:50])
+    for column, (low, high) in enumerate(running.confidence_intervals(0.9)):
+        expected = stats.t.interval(0.9, 49, loc=values[:50, column].mean(), scale=stats.sem(values[:50, column]))
+        assert (low, high) == pytest.approx(expected)
@@ -0,0 +1,69 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from poker_game import PokerGame
+from strategies.BasePokerStrategy import BasePokerStrategy
+from strategies.ConservativeStrategy import ConservativeStrategy
+from strategies.TightStrategy import TightStrategy
+from table_batch import TableBatch
+
+
+class ScriptedStrategy(BasePokerStrategy):
+    """Decisions hashed from everything the strategy sees, so both engines make the same ones"""
+
+    def __init__(self, seat):
+        super().__init__()
+        self.seat = seat
+
+    def make_decision(self, hand, community_cards, pot_size, current_bet, player_stack):
+        seen = (self.seat, [card.id for card in hand], [card.id for card in community_cards],
+                pot_size, current_bet, player_stack)
+        digest = int(hashlib.md5(repr(seen).encode()).hexdigest(), 16)
+        if digest % 10 < 2:
+            return 'fold', 0
+        if digest % 10 < 6:
+            return 'call', current_bet
+        return 'raise', digest // 10 % 400
+
+
+def replay(rig_deck, num_players, strategies, num_tables=400, seed=7):
+    """Play a batch, then every one of its deals again in a PokerGame"""
+    batch = TableBatch(num_players, seed=seed)
+    batch.strategies = strategies()
+    outcome = batch.play(num_tables)
+
+    game = PokerGame(num_players, seed=1)
+    for player, strategy in zip(game.players, strategies()):
+        player.strategy = strategy
+    results = []
+    for table in range(num_tables):
+        rig_deck(game, batch.holes[table].reshape(-1).tolist() + batch.boards[table].tolist())
+        results.append(game.simulate_game())
+    return batch, outcome, game, results
+
+
+@pytest.mark.parametrize("num_players", [2, 3, 6])
+def test_table_batch_matches_poker_game(rig_deck, num_players):
+    batch, outcome, game, results = replay(
+        rig_deck, num_players, lambda: [ScriptedStrategy(seat) for seat in range(num_players)]
+    )
+    assert (outcome.profits.sum(axis=1) == 0).all()
+    assert outcome.went_to_showdown.any() and not outcome.went_to_showdown.all()
+    for table, result in enumerate(results):
+        showdown = result["showdown"]
+        assert result["profits"] == outcome.profits[table].tolist()
+        assert showdown.payouts == outcome.payouts[table].tolist()
+        assert showdown.went_to_showdown == outcome.went_to_showdown[table]
+        assert [strength or 0 for strength in showdown.strengths] == outcome.strengths[table].tolist()
+        assert [bool(streets) for streets in showdown.raise_streets] == batch.raised[table].tolist()
+    np.testing.assert_array_equal(game.stats.data, batch.stats.data)
+
+
+def test_vectorized_decisions_match_scalar_ones(rig_deck):
+    # Deterministic built-in strategies: TableBatch calls make_decisions, PokerGame make_decision
+    batch, outcome, game, results = replay(rig_deck, 4, lambda: [ConservativeStrategy(), TightStrategy(),
+                                                                 ConservativeStrategy(), TightStrategy()])
+    assert [result["profits"] for result in results] == outcome.profits.tolist()
+    np.testing.assert_array_equal(game.stats.data, batch.stats.data)